@@ -0,0 +1,175 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import weakref
+from collections import defaultdict
+from collections.abc import Mapping
+
+DEFAULT_POOL_SIZE = 4
+
+
+def definition_hash(agent_def):
+    """Returns a stable digest of an agent definition."""
+    payload = json.dumps(agent_def, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AgentPool:
+    """
+    Keeps built agent instances so they are reused across workflow runs.
+
+    Instances are keyed by their class and the hash of their definition. A
+    run checks instances out with `acquire` and returns them with `release`,
+    so an instance is only ever used by one run at a time. Released
+    instances are `reset` first, so no state such as a conversation memory
+    carries over to the next run. When the definition of an agent name
+    changes, the instances built from the old definition are evicted.
+
+    Attributes:
+        size (int): Idle instances kept per definition. 0 disables pooling.
+    """
+
+    def __init__(self, size=None):
+        if size is None:
+            size = int(os.getenv("MAESTRO_AGENT_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.size = size
+        self._idle = defaultdict(list)
+        self._current = {}
+        self._leased = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, cls, agent_def):
+        """
+        Checks out an instance of `cls` built from `agent_def`.
+
+        Args:
+            cls (type): The agent class.
+            agent_def (dict): The agent definition.
+        Returns:
+            An idle pooled instance, or a new one.
+        """
+        key = (cls, definition_hash(agent_def))
+        name = agent_def["metadata"]["name"]
+        with self._lock:
+            stale = self._current.get(name)
+            if stale is not None and stale != key:
+                self._idle.pop(stale, None)
+            self._current[name] = key
+            idle = self._idle.get(key)
+            instance = idle.pop() if idle else None
+        if instance is None:
+            instance = cls(agent_def)
+        with self._lock:
+            self._leased[id(instance)] = (key, name)
+        return instance
+
+    def release(self, instance):
+        """Returns an instance checked out with `acquire` to the pool."""
+        with self._lock:
+            lease = self._leased.pop(id(instance), None)
+            if lease is None:
+                return
+            key, name = lease
+            if self._current.get(name) != key:
+                return
+        try:
+            instance.reset()
+        except Exception:
+            # an instance that cannot be reset is not reused
+            return
+        with self._lock:
+            if self._current.get(name) != key:
+                return
+            idle = self._idle[key]
+            if len(idle) < self.size:
+                idle.append(instance)
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+            self._current.clear()
+
+    def __len__(self):
+        return sum(len(idle) for idle in self._idle.values())
+
+
+class LazyAgents(Mapping):
+    """
+    The agents of a workflow run, created on first use.
+
+    Every name is known up front, but an agent is only created when a step
+    looks it up, so agents on branches a run never takes are never built.
+    Agents that are likely to be needed soon can be created ahead of time in
+    worker threads with `prewarm`.
+
+    Args:
+        factories (dict): Agent name -> callable creating the agent.
+    """
+
+    def __init__(self, factories):
+        self._factories = dict(factories)
+        self._built = {}
+        self._locks = {name: threading.Lock() for name in self._factories}
+        self._warming = {}
+
+    def __getitem__(self, name):
+        agent = self._built.get(name)
+        if agent is not None:
+            return agent
+        if name not in self._factories:
+            raise KeyError(name)
+        with self._locks[name]:
+            agent = self._built.get(name)
+            if agent is None:
+                agent = self._built[name] = self._factories[name]()
+        return agent
+
+    def __contains__(self, name):
+        return name in self._factories
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self):
+        return len(self._factories)
+
+    def built(self):
+        """Returns the agents created so far, keyed by name."""
+        return dict(self._built)
+
+    def prewarm(self, names):
+        """Starts creating the given agents in worker threads."""
+        for name in names:
+            if name in self._factories and name not in self._built:
+                if name not in self._warming:
+                    self._warming[name] = asyncio.create_task(
+                        asyncio.to_thread(self.__getitem__, name)
+                    )
+
+    async def settle(self):
+        """
+        Waits for the agents still being prewarmed. Errors are ignored here,
+        they surface again when the agent is actually used.
+        """
+        if self._warming:
+            await asyncio.gather(*self._warming.values(), return_exceptions=True)
+
+
+# one pool per event loop, since agents may hold clients bound to their loop
+_pools = weakref.WeakKeyDictionary()
+_pools_lock = threading.Lock()
+
+
+def agent_pool():
+    """Returns the process wide AgentPool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.get(loop)
+        if pool is None:
+            pool = _pools[loop] = AgentPool()
+        return pool
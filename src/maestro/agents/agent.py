@@ -2,17 +2,28 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from abc import abstractmethod
-import os
+import copy
 import pickle
 import json
+import threading
 from typing import Dict, Final
 
+from maestro.agent_pool import definition_hash
+from maestro.agents.registry import DEFINITION, PICKLED, agent_registry
+
 
 class Agent:
     """
     Abstract base class for running agents.
+
+    Attributes:
+        accepts_values (bool): Whether `run` takes the native values passed
+            between steps, such as lists and dicts. Other agents get them
+            converted to prompt text.
     """
 
+    accepts_values = False
+
     def __init__(self, agent: dict) -> None:
         """
         Initializes the AgentRunner with the given agent configuration.
@@ -21,6 +32,7 @@ class Agent:
         """
         # TODO: Review which attributes belong in base class vs subclasses
         self.agent_name = agent["metadata"]["name"]
+        self.agent_spec = agent["spec"]
         self.agent_framework = agent["spec"]["framework"]
         self.agent_model = agent["spec"].get("model")
         self.agent_url = agent["spec"].get("url")
@@ -34,6 +46,11 @@ class Agent:
         self.agent_output = agent["spec"].get("output")
 
         self.agent_code = agent["spec"].get("code")
+        self.agent_timeout = agent["spec"].get("timeout")
+        self.agent_retry = agent["spec"].get("retry")
+        self.agent_circuit_breaker = agent["spec"].get("circuit_breaker")
+        self.agent_max_concurrency = agent["spec"].get("max_concurrency")
+        self.agent_rate_limit = agent["spec"].get("rate_limit")
 
         self.instructions = (
             f"{self.agent_instr} Input is expected in format: {self.agent_input}"
@@ -64,6 +81,12 @@ class Agent:
     def print(self, message) -> str:
         print(f"{self.emoji()} {message}")
 
+    def reset(self) -> None:
+        """
+        Clears the state kept from a run, such as a conversation memory,
+        before a pooled agent is reused by another run.
+        """
+
     @abstractmethod
     async def run(self, prompt: str) -> str:
         """
@@ -81,69 +104,79 @@ class Agent:
         """
 
 
-def _load_agent_db():
-    """
-    Load agents from database.
-
-    Parameters:
-    None
-
-    Returns:
-    agents (dict): A dictionary containing the loaded agents.
-    """
-    agents = {}
-    if os.path.exists("agents.db"):
-        with open("agents.db", "rb") as f:
-            agents = pickle.load(f)
-    return agents
+def _serialize(agent, agent_def):
+    try:
+        return PICKLED, pickle.dumps(agent)
+    except Exception:
+        return DEFINITION, json.dumps(agent_def)
 
 
-def _save_agent_db(db):
+def save_agents(agents):
     """
-    Save the agent database to a file.
+    Save agents in storage, all in one transaction.
 
     Args:
-        db (dict): The agent database to be saved.
-
-    Returns:
-        None
+        agents: Iterable of `(agent, agent_def)` pairs.
     """
-    with open("agents.db", "wb") as f:
-        pickle.dump(db, f)
+    entries = []
+    for agent, agent_def in agents:
+        kind, data = _serialize(agent, agent_def)
+        entries.append((agent.agent_name, kind, data, definition_hash(agent_def)))
+    agent_registry().put_many(entries)
 
 
 def save_agent(agent, agent_def):
     """
     Save agent in storage.
     """
-    agents = _load_agent_db()
-    try:
-        agent_data = pickle.dumps(agent)
-    except Exception:
-        agent_data = json.dumps(agent_def)
-    agents[agent.agent_name] = agent_data
-    _save_agent_db(agents)
+    save_agents([(agent, agent_def)])
+
+
+# restored agents, keyed by registry path and name, with the stamp they had
+_restored = {}
+_restored_lock = threading.Lock()
 
 
 def restore_agent(agent_name: str):
     """
     Restore agent from storage.
+
+    Restored agents are kept in memory until the agent is saved again, so
+    repeated restores skip the unpickling and return a deep copy of the
+    cached instance, so no mutable state is shared between callers.
+
+    Returns:
+        tuple: The agent instance and True, or the agent definition and False
+            for an agent that could not be pickled.
     """
-    agents = _load_agent_db()
-    agent_data = agents[agent_name]
-    try:
-        if "maestro/v1alpha1" in agent_data:
-            return json.loads(agent_data), False
+    registry = agent_registry()
+    key = (registry.path, agent_name)
+    stamp = registry.stamp(agent_name)
+    if stamp is None:
+        with _restored_lock:
+            _restored.pop(key, None)
+        raise KeyError(agent_name)
+    with _restored_lock:
+        cached = _restored.get(key)
+    if cached is None or cached[0] != stamp:
+        record = registry.get(agent_name)
+        if record is None:
+            raise KeyError(agent_name)
+        if record.kind == DEFINITION:
+            value = json.loads(record.data), False
         else:
-            return pickle.loads(agent_data), True
-    except Exception:
-        return pickle.loads(agent_data), True
+            value = pickle.loads(record.data), True
+        cached = (record.stamp, value)
+        with _restored_lock:
+            _restored[key] = cached
+    agent, restored = cached[1]
+    # callers set per run attributes and mutate what they get back
+    return copy.deepcopy(agent), restored
 
 
 def remove_agent(agent_name: str):
     """
     Remove agent from storage.
     """
-    agents = _load_agent_db()
-    agents.pop(agent_name)
-    _save_agent_db(agents)
+    if not agent_registry().delete(agent_name):
+        raise KeyError(agent_name)
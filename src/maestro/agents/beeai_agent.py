@@ -1,6 +1,7 @@
 #! /usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import os
 import dotenv
 import tempfile
@@ -10,9 +11,10 @@ import json
 from beeai_framework.adapters.ollama import OllamaChatModel
 from beeai_framework.agents.tool_calling import ToolCallingAgent
 from beeai_framework.backend import ChatModel
+from beeai_framework.backend.events import ChatModelSuccessEvent
 from beeai_framework.backend.utils import find_provider_def
 from beeai_framework.tools.code import PythonTool, LocalPythonStorage, SandboxTool
-from openai import AssistantEventHandler, OpenAI
+from openai import DEFAULT_TIMEOUT, AssistantEventHandler, OpenAI
 from openai.types.beta import AssistantStreamEvent
 from openai.types.beta.threads.runs import RunStep, RunStepDelta, ToolCall
 
@@ -30,6 +32,7 @@ from beeai_framework.tools.weather import OpenMeteoTool
 from beeai_framework.utils import AbortSignal
 
 from maestro.agents.agent import Agent
+from maestro.usage import record_usage
 
 dotenv.load_dotenv()
 
@@ -81,6 +84,15 @@ class BeeAIAgent(Agent):
         response = requests.request("POST", url, headers=headers, data=payload).json()
         self.agent_id = response["id"]
 
+    def _client(self) -> OpenAI:
+        return OpenAI(
+            base_url=self.base_url,
+            api_key=os.getenv("BEE_API_KEY", "sk-proj-testkey"),
+            timeout=DEFAULT_TIMEOUT
+            if self.agent_timeout is None
+            else self.agent_timeout,
+        )
+
     async def run(self, prompt: str) -> str:
         """
         Runs the BeeAI agent with the given prompt.
@@ -88,19 +100,24 @@ class BeeAIAgent(Agent):
             prompt (str): The prompt to run the agent with.
         """
         self.print(f"Running {self.agent_name}...\n")
-        client = OpenAI(
-            base_url=self.base_url,
-            api_key=os.getenv("BEE_API_KEY", "sk-proj-testkey"),
-        )
+        client = self._client()
         # TODO: Unused currently
         # assistant = client.beta.assistants.retrieve(self.agent_id)
-        thread = client.beta.threads.create(
-            messages=[{"role": "user", "content": str(prompt)}]
+        # the client is synchronous, so its calls run in a worker thread where
+        # they cannot block the event loop and the agent timeout can expire
+        thread = await asyncio.to_thread(
+            client.beta.threads.create,
+            messages=[{"role": "user", "content": str(prompt)}],
         )
-        client.beta.threads.runs.create_and_poll(
-            thread_id=thread.id, assistant_id=self.agent_id
+        run = await asyncio.to_thread(
+            client.beta.threads.runs.create_and_poll,
+            thread_id=thread.id,
+            assistant_id=self.agent_id,
+        )
+        record_usage(run.usage, self.agent_model)
+        messages = await asyncio.to_thread(
+            client.beta.threads.messages.list, thread_id=thread.id
         )
-        messages = client.beta.threads.messages.list(thread_id=thread.id)
         answer = messages.data[0].content[0].text.value
         self.print(f"Response from {self.agent_name}: {answer}\n")
         return answer
@@ -112,10 +129,7 @@ class BeeAIAgent(Agent):
             prompt (str): The prompt to run the agent with.
         """
         self.print(f"Running {self.agent_name}...\n")
-        client = OpenAI(
-            base_url=self.base_url,
-            api_key=os.getenv("BEE_API_KEY", "sk-proj-testkey"),
-        )
+        client = self._client()
         # TODO: Unused currently
         # assistant = client.beta.assistants.retrieve(self.agent_id)
         thread = client.beta.threads.create(
@@ -307,6 +321,11 @@ class BeeAILocalAgent(Agent):
             ),
         )
 
+    def reset(self) -> None:
+        """Forgets the messages the agent keeps from its previous runs"""
+        if self.agent is not None:
+            self.agent.memory.reset()
+
     def _process_agent_events(self, data: Any, event: EventMeta) -> None:
         """Process agent events and log appropriately"""
 
@@ -321,9 +340,15 @@ class BeeAILocalAgent(Agent):
         elif event.name == "success":
             self.print("Agent 🤖 : success")
 
+    def _record_model_usage(self, data: Any, event: EventMeta) -> None:
+        """Records the token usage of every chat model call of the agent"""
+        if event.name == "success" and isinstance(data, ChatModelSuccessEvent):
+            record_usage(data.value.usage, self.agent_model)
+
     def _observer(self, emitter: Emitter) -> None:
         """Observer"""
         emitter.on("*", self._process_agent_events, EmitterOptions(match_nested=False))
+        emitter.on("*.*", self._record_model_usage, EmitterOptions(match_nested=True))
 
     async def run(self, prompt: str) -> str:
         """
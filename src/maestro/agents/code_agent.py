@@ -13,6 +13,8 @@ class CodeAgent(Agent):
     CodeAgent extends the Agent class that executes an arbitrary python code specifed in the code section of the agent definition.
     """
 
+    accepts_values = True
+
     def __init__(self, agent: dict) -> None:
         """
         Initializes the agent with agent definitions.
@@ -25,6 +25,9 @@ from agents.extensions.models.litellm_model import LitellmModel
 
 from maestro.agents.agent import Agent as MaestroAgent
 from maestro.agents.openai_mcp import setup_mcp_servers, MCPServerInstance
+from maestro.events import emit_token
+from maestro.usage import record_usage
+from maestro.utils import ThinkTagFilter
 
 from dotenv import load_dotenv
 
@@ -211,6 +214,11 @@ class OpenAIAgent(MaestroAgent):
                 )
         return None
 
+    def _record_usage(self, result: Optional[Any]) -> None:
+        # the run context accumulates the usage of every model request of the run
+        context_wrapper = getattr(result, "context_wrapper", None)
+        record_usage(getattr(context_wrapper, "usage", None), self.model_name)
+
     def _process_agent_result(self, result: Optional[Any]) -> str:
         if result is None:
             self.print(
@@ -290,6 +298,7 @@ class OpenAIAgent(MaestroAgent):
 
                 self.print(f"Running {self.agent_name} with prompt...")
                 result = await UnderlyingRunner.run(underlying_agent, prompt)
+                self._record_usage(result)
                 self.print(
                     f"DEBUG [OpenAIAgent {self.agent_name}]: Agent run completed."
                 )
@@ -298,7 +307,9 @@ class OpenAIAgent(MaestroAgent):
             error_msg = f"ERROR [OpenAIAgent {self.agent_name}]: Agent run failed: {e}"
             self.print(error_msg)
             self.print(traceback.format_exc())
-            return f"Error during agent execution: {e}"
+            # a failure is not an answer: retries, circuit breakers and the
+            # workflow exception step handle it
+            raise
 
         # Process result and print final output once
         final_str = self._process_agent_result(result)
@@ -309,6 +320,8 @@ class OpenAIAgent(MaestroAgent):
     async def _run_streaming_internal(self, prompt: str) -> str:
         final_output_chunks: List[str] = []
         last_event_was_delta = False
+        # reasoning inside think tags is kept out of the streamed tokens
+        think_filter = ThinkTagFilter()
 
         self.print(f"Running {self.agent_name} with prompt (streaming)...")
         try:
@@ -363,9 +376,12 @@ class OpenAIAgent(MaestroAgent):
                     if event.type == "raw_response_event":
                         if isinstance(event.data, ResponseTextDeltaEvent):
                             delta_value = event.data.delta
-                            print(delta_value, end="", flush=True)
                             final_output_chunks.append(delta_value)
-                            last_event_was_delta = True
+                            visible = think_filter.feed(delta_value)
+                            if visible:
+                                print(visible, end="", flush=True)
+                                emit_token(self.agent_name, visible)
+                                last_event_was_delta = True
                     elif event.type == "run_item_stream_event":
                         if last_event_was_delta:
                             print("")
@@ -416,8 +432,14 @@ class OpenAIAgent(MaestroAgent):
                             f"DEBUG [OpenAIAgent {self.agent_name}]: Received unknown event type: {event.type}"
                         )
 
+                visible = think_filter.flush()
+                if visible:
+                    print(visible, end="", flush=True)
+                    emit_token(self.agent_name, visible)
+                    last_event_was_delta = True
                 if last_event_was_delta:
                     print("")
+                self._record_usage(run_result_streaming)
 
         except Exception as e:
             if last_event_was_delta:
@@ -427,7 +449,7 @@ class OpenAIAgent(MaestroAgent):
             )
             self.print(error_msg)
             self.print(traceback.format_exc())
-            return f"Error during agent streaming execution: {e}"
+            raise
 
         # Create the final output from all the bits we've received
         final_output_str = "".join(final_output_chunks)
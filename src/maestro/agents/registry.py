@@ -0,0 +1,203 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import atexit
+import os
+import pickle
+import sqlite3
+import threading
+from datetime import datetime, UTC
+from pathlib import Path
+
+DEFAULT_AGENT_DB = "agents.db"
+
+PICKLED = "pickle"
+DEFINITION = "definition"
+
+_SQLITE_HEADER = b"SQLite format 3\x00"
+
+
+class AgentRecord:
+    """
+    A saved agent.
+
+    Attributes:
+        name (str): The agent name.
+        kind (str): `pickle` for a pickled agent instance, `definition` for
+            the JSON agent definition of an agent that cannot be pickled.
+        data: The pickled instance (bytes) or the JSON definition (str).
+        definition_hash (str): Digest of the definition the agent was saved
+            from, if known.
+        version (int): Incremented whenever the definition of the name changes.
+        updated_at (str): When the agent was last saved.
+    """
+
+    __slots__ = ("name", "kind", "data", "definition_hash", "version", "updated_at")
+
+    def __init__(self, name, kind, data, definition_hash, version, updated_at=None):
+        self.name = name
+        self.kind = kind
+        self.data = data
+        self.definition_hash = definition_hash
+        self.version = version
+        self.updated_at = updated_at
+
+    @property
+    def stamp(self):
+        """The `(version, updated_at)` stamp of the record, see `stamp`."""
+        return (self.version, self.updated_at)
+
+
+class AgentRegistry:
+    """
+    Keyed store of the agents saved by `maestro create`, backed by SQLite.
+
+    Every agent is its own row, so saving or restoring one agent does not
+    read or rewrite the others. The database runs in WAL mode, so any number
+    of processes can read it while one writes. A `agents.db` written by
+    earlier versions as a single pickled dict is migrated on first use and
+    kept as `agents.db.pickle`.
+
+    Args:
+        path (str): The database file, defaults to `MAESTRO_AGENT_DB` or
+            `agents.db` in the working directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.getenv("MAESTRO_AGENT_DB", DEFAULT_AGENT_DB))
+        legacy = self._take_legacy_db()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS agents ("
+                "name TEXT PRIMARY KEY, kind TEXT, data BLOB, "
+                "definition_hash TEXT, version INTEGER, updated_at TEXT)"
+            )
+        if legacy:
+            self.put_many(
+                (
+                    name,
+                    PICKLED if isinstance(data, bytes) else DEFINITION,
+                    data,
+                    None,
+                )
+                for name, data in legacy.items()
+            )
+
+    def _take_legacy_db(self):
+        # returns the agents of a pickled agents.db, moving the file aside
+        try:
+            with open(self.path, "rb") as file:
+                if file.read(len(_SQLITE_HEADER)) in (_SQLITE_HEADER, b""):
+                    return None
+                file.seek(0)
+                agents = pickle.load(file)
+            os.replace(self.path, f"{self.path}.pickle")
+        except FileNotFoundError:
+            # not created yet, or migrated by another process meanwhile
+            return None
+        return agents
+
+    def put_many(self, entries):
+        """
+        Saves agents in a single transaction.
+
+        The version of a name is incremented when its definition hash
+        changes, or when no hash is known.
+
+        Args:
+            entries: Iterable of `(name, kind, data, definition_hash)`.
+        """
+        now = datetime.now(UTC).isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO agents VALUES (?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT(name) DO UPDATE SET "
+                "kind = excluded.kind, data = excluded.data, "
+                "version = CASE WHEN agents.definition_hash = excluded.definition_hash "
+                "THEN agents.version ELSE agents.version + 1 END, "
+                "definition_hash = excluded.definition_hash, "
+                "updated_at = excluded.updated_at",
+                (
+                    (name, kind, data, definition_hash, now)
+                    for name, kind, data, definition_hash in entries
+                ),
+            )
+
+    def put(self, name, kind, data, definition_hash=None):
+        """Saves one agent, see `put_many`."""
+        self.put_many([(name, kind, data, definition_hash)])
+
+    def get(self, name):
+        """Returns the AgentRecord of a name, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, kind, data, definition_hash, version, updated_at "
+                "FROM agents WHERE name = ?",
+                (name,),
+            ).fetchone()
+        return AgentRecord(*row) if row is not None else None
+
+    def version(self, name):
+        """Returns the version of a name, or None when it is not saved."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM agents WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def stamp(self, name):
+        """
+        Returns `(version, updated_at)` of a name, which changes whenever the
+        agent is saved again, or None when it is not saved.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, updated_at FROM agents WHERE name = ?", (name,)
+            ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def delete(self, name):
+        """Removes an agent, returning whether it was saved."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM agents WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def names(self):
+        """Returns the names of the saved agents."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM agents ORDER BY name")
+            return [row[0] for row in rows]
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def agent_registry(path=None):
+    """Returns the process wide AgentRegistry of a database file."""
+    path = Path(path or os.getenv("MAESTRO_AGENT_DB", DEFAULT_AGENT_DB)).absolute()
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None or not registry.path.exists():
+            if registry is not None:
+                # the file was removed, start over with a new database
+                registry.close()
+            registry = _registries[path] = AgentRegistry(path)
+        return registry
+
+
+@atexit.register
+def _close_registries():
+    # a clean close folds the write-ahead log back into the database file
+    with _registries_lock:
+        for registry in _registries.values():
+            registry.close()
+        _registries.clear()
@@ -1,5 +1,6 @@
 #! /usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0
+import asyncio
 import json
 from string import Template
 
@@ -45,7 +46,9 @@ class RemoteAgent(Agent):
             else:
                 data = {"prompt": prompt}
             print("❓ ", prompt)
-            response = requests.post(self.url, json=data)
+            response = await asyncio.to_thread(
+                requests.post, self.url, json=data, timeout=self.agent_timeout
+            )
             response.raise_for_status()
             result = Template(self.response_template).safe_substitute(
                 response="response.json()"
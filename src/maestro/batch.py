@@ -0,0 +1,227 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import csv
+import json
+import os
+import sys
+from collections import deque
+
+from maestro.workflow import DEFAULT_PIPELINE_QUEUE_SIZE
+
+DEFAULT_CONCURRENCY = 4
+
+
+def read_inputs(path):
+    """
+    Streams the prompts of a batch input file.
+
+    JSONL lines are either a JSON string or an object with a `prompt` key.
+    CSV files use their `prompt` column, or the first column without one.
+
+    Args:
+        path (str): The `.jsonl` or `.csv` input file.
+    Yields:
+        tuple: `(index, prompt)` for every input, counting from 0.
+    """
+    with open(path, "r", newline="") as file:
+        if path.endswith(".csv"):
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            column = header.index("prompt") if "prompt" in header else 0
+            for index, row in enumerate(reader):
+                yield index, row[column]
+            return
+        index = 0
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                if "prompt" not in record:
+                    raise ValueError(f"Input {index} of {path} has no prompt")
+                record = record["prompt"]
+            yield index, record
+            index += 1
+
+
+async def stream_inputs(path):
+    """
+    Streams the prompts of a batch input file, or of stdin for `-`.
+
+    Lines of stdin are read as they arrive, so the stream may be unbounded.
+    Each line is a JSON string, an object with a `prompt` key, or plain text.
+
+    Args:
+        path (str): The `.jsonl` or `.csv` input file, or `-`.
+    Yields:
+        The prompts in input order.
+    """
+    if path != "-":
+        for _, prompt in read_inputs(path):
+            yield prompt
+        return
+    while line := await asyncio.to_thread(sys.stdin.readline):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = line
+        if isinstance(record, dict):
+            record = record.get("prompt", line)
+        yield record
+
+
+def completed_indices(path):
+    """Returns the indices of the inputs already recorded in an output file."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r") as file:
+        for line in file:
+            try:
+                done.add(json.loads(line)["index"])
+            except (ValueError, KeyError, TypeError):
+                # a line cut short by an interrupted run is redone
+                continue
+    return done
+
+
+async def run_batch(
+    workflow,
+    inputs,
+    output,
+    concurrency=DEFAULT_CONCURRENCY,
+    ordered=True,
+    resume=False,
+):
+    """
+    Runs a workflow once per input with bounded concurrency.
+
+    All runs share one event loop and one Workflow. Every result is appended
+    to the output file as a JSON line with `index`, `prompt` and either
+    `result` or `error`. Inputs already recorded in the output file are
+    skipped, so an interrupted batch can be resumed by running it again.
+
+    With a checkpoint store every input is checkpointed under its own run id,
+    `<workflow_id>:<index>`, so concurrent runs never share a checkpoint.
+
+    Args:
+        workflow (Workflow): The workflow to run.
+        inputs (str): Path of the `.jsonl` or `.csv` input file.
+        output (str): Path of the JSONL output file.
+        concurrency (int): Maximum number of workflow runs at a time.
+        ordered (bool): Write results in input order instead of as they
+            complete.
+        resume (bool): Continue the unfinished checkpointed run of every
+            input instead of starting it over.
+    Returns:
+        dict: The number of `succeeded`, `failed` and `skipped` inputs.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    done = completed_indices(output)
+    counts = {"succeeded": 0, "failed": 0, "skipped": 0}
+    # bounds the runs in flight plus the results waiting for their turn
+    window = asyncio.Semaphore(concurrency * 2 if ordered else concurrency)
+    running = asyncio.Semaphore(concurrency)
+    pending = deque()
+    finished = {}
+    tasks = set()
+
+    with open(output, "a+") as out:
+        out.seek(0, os.SEEK_END)
+        if out.tell():
+            out.seek(out.tell() - 1)
+            if out.read(1) != "\n":
+                # terminate a line cut short by an interrupted run
+                out.write("\n")
+
+        def write(record):
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+            counts["failed" if "error" in record else "succeeded"] += 1
+            window.release()
+
+        def checkpointed(index):
+            # every input gets its own run id in the checkpoint store
+            if not (workflow.checkpoint and workflow.workflow_id):
+                return {}
+            run_id = f"{workflow.workflow_id}:{index}"
+            run = workflow.checkpoint.get_run(run_id) if resume else None
+            return {"run_id": run_id, "resume": run is not None and run[2] != "success"}
+
+        def flush():
+            while pending and pending[0] in finished:
+                write(finished.pop(pending.popleft()))
+
+        async def run_one(index, prompt):
+            async with running:
+                try:
+                    result = await workflow.run(prompt, **checkpointed(index))
+                    record = {"index": index, "prompt": prompt, "result": result}
+                except Exception as err:
+                    record = {"index": index, "prompt": prompt, "error": str(err)}
+            if ordered:
+                finished[index] = record
+                flush()
+            else:
+                write(record)
+
+        try:
+            for index, prompt in read_inputs(inputs):
+                if index in done:
+                    counts["skipped"] += 1
+                    continue
+                await window.acquire()
+                if ordered:
+                    pending.append(index)
+                task = asyncio.create_task(run_one(index, prompt))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+    return counts
+
+
+async def run_pipeline(
+    workflow, inputs, output, queue_size=DEFAULT_PIPELINE_QUEUE_SIZE
+):
+    """
+    Runs a workflow over a stream of inputs in pipeline mode.
+
+    Every step works on its own input at the same time, see
+    `Workflow.run_pipeline`. Results are appended to the output file in input
+    order as soon as they are done, as JSON lines with `index`, `prompt` and
+    either `result` or `error`.
+
+    Args:
+        workflow (Workflow): The workflow to run, without conditions.
+        inputs (str): Path of the `.jsonl` or `.csv` input file, or `-` for
+            stdin.
+        output (str): Path of the JSONL output file, or `-` for stdout.
+        queue_size (int): Inputs waiting between two steps at most.
+    Returns:
+        dict: The number of `succeeded` and `failed` inputs.
+    """
+    counts = {"succeeded": 0, "failed": 0}
+    out = sys.stdout if output == "-" else open(output, "a")
+    try:
+        async for record in workflow.run_pipeline(
+            stream_inputs(inputs), queue_size=queue_size
+        ):
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+            counts["failed" if "error" in record else "succeeded"] += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return counts
@@ -0,0 +1,257 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+home_path = Path.home()
+if os.access(home_path, os.W_OK):
+    DEFAULT_CACHE_DB = home_path / ".maestro" / "cache.db"
+else:
+    DEFAULT_CACHE_DB = Path("./cache.db")
+
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_MISSING = object()
+
+
+def agent_fingerprint(agent):
+    """
+    Returns the parts of an agent definition that determine its output.
+
+    Args:
+        agent: The Agent instance.
+    Returns:
+        dict: The full spec the agent was built from, and the attributes a
+            workflow may set on the instance, such as its name and model.
+    """
+    return {
+        "spec": getattr(agent, "agent_spec", None),
+        "name": getattr(agent, "agent_name", None),
+        "framework": getattr(agent, "agent_framework", None),
+        "model": getattr(agent, "agent_model", None),
+        "url": getattr(agent, "agent_url", None),
+        "instructions": getattr(agent, "instructions", None),
+        "tools": getattr(agent, "agent_tools", None),
+        "code": getattr(agent, "agent_code", None),
+    }
+
+
+def cache_key(agent, args):
+    """
+    Computes the cache key of an agent call.
+
+    Args:
+        agent: The Agent instance.
+        args (tuple): The resolved input arguments of the call.
+    Returns:
+        str: Hex digest of the agent fingerprint and the arguments.
+    """
+    payload = json.dumps(
+        {"agent": agent_fingerprint(agent), "args": list(args)},
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """
+    In-memory LRU cache with per-entry expiry.
+
+    Values are copied on the way in and out, so callers never share a
+    cached object.
+
+    Attributes:
+        max_entries (int): Number of entries kept before the least recently
+            used one is evicted.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires is not None and expires <= time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return copy.deepcopy(value)
+
+    def set(self, key, value, expires=None):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    Persistent cache in a local SQLite database.
+
+    Values are pickled. Expired entries are removed on access and whenever
+    the cache grows past `max_bytes`, after which the least recently used
+    entries are evicted until it fits again.
+
+    Attributes:
+        path (Path): Location of the database.
+        max_bytes (int): Total size of the stored values before eviction.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path or os.getenv("MAESTRO_CACHE_DB", DEFAULT_CACHE_DB))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, "
+                "expires REAL, accessed REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+
+    def get_entry(self, key):
+        """Returns `(value, expires)` for a live entry, or None."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return pickle.loads(row[0]), row[1]
+
+    def set(self, key, value, expires=None):
+        data = pickle.dumps(value)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), expires, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        self._conn.execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,)
+        )
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed DESC"
+        ).fetchall()
+        kept = 0
+        stale = []
+        for key, size in rows:
+            kept += size
+            if kept > self.max_bytes:
+                stale.append((key,))
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class StepCache:
+    """
+    Two-tier cache for step results: an in-memory LRU in front of a
+    persistent store.
+
+    Attributes:
+        memory (MemoryCache): The in-memory tier.
+        store (SQLiteCache): The persistent tier, if any.
+    """
+
+    def __init__(self, memory=None, store=None):
+        self.memory = memory if memory is not None else MemoryCache()
+        self.store = store
+
+    def get(self, key, default=None):
+        """Returns the cached value for key, or default when missing or expired."""
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.store is None:
+            return default
+        entry = self.store.get_entry(key)
+        if entry is None:
+            return default
+        # promote so the next lookup does not touch the disk
+        self.memory.set(key, entry[0], entry[1])
+        return entry[0]
+
+    def set(self, key, value, ttl=None):
+        """
+        Stores a value.
+
+        Args:
+            key (str): The cache key.
+            value: The value, which must be picklable for the persistent tier.
+            ttl (float): Seconds until the entry expires, never when None.
+        """
+        expires = time.time() + ttl if ttl is not None else None
+        self.memory.set(key, value, expires)
+        if self.store is not None:
+            self.store.set(key, value, expires)
+
+    def clear(self):
+        self.memory.clear()
+        if self.store is not None:
+            self.store.clear()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Returns the process wide StepCache, persisted in `MAESTRO_CACHE_DB`."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = StepCache(store=SQLiteCache())
+        return _default_cache
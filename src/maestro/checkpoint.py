@@ -0,0 +1,169 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+from abc import ABC, abstractmethod
+import os
+import pickle
+import sqlite3
+import threading
+from datetime import datetime, UTC
+from pathlib import Path
+
+home_path = Path.home()
+if os.access(home_path, os.W_OK):
+    DEFAULT_CHECKPOINT_DB = home_path / ".maestro" / "checkpoints.db"
+else:
+    DEFAULT_CHECKPOINT_DB = Path("./checkpoints.db")
+
+
+class StepRecord:
+    """
+    A completed step of a checkpointed run.
+
+    Attributes:
+        step_index (int): Execution index of the step in the run.
+        step_name (str): The name of the step.
+        output: The output (`prompt`) of the step.
+        next_step (str): The step selected by the step's condition, if any.
+    """
+
+    def __init__(self, step_index, step_name, output, next_step=None):
+        self.step_index = step_index
+        self.step_name = step_name
+        self.output = output
+        self.next_step = next_step
+
+    def result(self):
+        """Returns the record in the shape returned by `Step.run`."""
+        result = {"prompt": self.output}
+        if self.next_step is not None:
+            result["next"] = self.next_step
+        return result
+
+
+class CheckpointStore(ABC):
+    """
+    Abstract store for the step outputs of workflow runs.
+    """
+
+    @abstractmethod
+    def start_run(self, workflow_id, workflow_name, prompt):
+        """Records the start of a run, keeping the prompt of an existing run."""
+
+    @abstractmethod
+    def get_run(self, workflow_id):
+        """Returns `(workflow_name, prompt, status)` of a run, or None."""
+
+    @abstractmethod
+    def finish_run(self, workflow_id, status):
+        """Records the final status of a run."""
+
+    @abstractmethod
+    def save_step(self, workflow_id, record):
+        """Persists a completed step."""
+
+    @abstractmethod
+    def load_steps(self, workflow_id):
+        """Returns the StepRecords of a run ordered by step index."""
+
+    @abstractmethod
+    def delete_run(self, workflow_id):
+        """Removes a run and its steps."""
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    CheckpointStore backed by a local SQLite database.
+
+    Outputs are pickled, so any value a step returns can be restored.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(
+            path or os.getenv("MAESTRO_CHECKPOINT_DB", DEFAULT_CHECKPOINT_DB)
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "workflow_id TEXT PRIMARY KEY, workflow_name TEXT, prompt BLOB, "
+                "status TEXT, updated_at TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS steps ("
+                "workflow_id TEXT, step_index INTEGER, step_name TEXT, "
+                "output BLOB, next_step TEXT, created_at TEXT, "
+                "PRIMARY KEY (workflow_id, step_index))"
+            )
+
+    def start_run(self, workflow_id, workflow_name, prompt):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, 'running', ?) "
+                "ON CONFLICT(workflow_id) DO UPDATE SET "
+                "status='running', updated_at=excluded.updated_at",
+                (
+                    workflow_id,
+                    workflow_name,
+                    pickle.dumps(prompt),
+                    datetime.now(UTC).isoformat(),
+                ),
+            )
+
+    def get_run(self, workflow_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT workflow_name, prompt, status FROM runs WHERE workflow_id = ?",
+                (workflow_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], pickle.loads(row[1]), row[2]
+
+    def finish_run(self, workflow_id, status):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE workflow_id = ?",
+                (status, datetime.now(UTC).isoformat(), workflow_id),
+            )
+
+    def save_step(self, workflow_id, record):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    workflow_id,
+                    record.step_index,
+                    record.step_name,
+                    pickle.dumps(record.output),
+                    record.next_step,
+                    datetime.now(UTC).isoformat(),
+                ),
+            )
+
+    def load_steps(self, workflow_id):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT step_index, step_name, output, next_step FROM steps "
+                "WHERE workflow_id = ? ORDER BY step_index",
+                (workflow_id,),
+            ).fetchall()
+        return [
+            StepRecord(index, name, pickle.loads(output), next_step)
+            for index, name, output, next_step in rows
+        ]
+
+    def delete_run(self, workflow_id):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM steps WHERE workflow_id = ?", (workflow_id,)
+            )
+            self._conn.execute("DELETE FROM runs WHERE workflow_id = ?", (workflow_id,))
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -20,7 +20,12 @@ from jsonschema.exceptions import ValidationError, SchemaError
 from importlib.resources import files
 
 from maestro.deploy import Deploy
-from maestro.workflow import Workflow, create_agents
+from maestro.workflow import DEFAULT_PIPELINE_QUEUE_SIZE, Workflow, create_agents
+from maestro.batch import DEFAULT_CONCURRENCY, read_inputs, run_batch, run_pipeline
+from maestro.checkpoint import SQLiteCheckpointStore
+from maestro.cron import CronScheduler
+from maestro.dag import parallel_agents
+from maestro.run_queue import RunQueue, run_workers
 from maestro.cli.common import Console, parse_yaml
 from maestro.file_logger import FileLogger
 from maestro.mcptool import create_mcptools
@@ -67,6 +72,14 @@ class CLI:
             return CleanCmd(self.args)
         elif self.args.get("create-cr") and self.args["create-cr"]:
             return CreateCrCmd(self.args)
+        elif self.args.get("schedule") and self.args["schedule"]:
+            return ScheduleCmd(self.args)
+        elif self.args.get("submit"):
+            return SubmitCmd(self.args)
+        elif self.args.get("worker"):
+            return WorkerCmd(self.args)
+        elif self.args.get("status"):
+            return StatusCmd(self.args)
         else:
             raise Exception("Invalid command")
 
@@ -141,6 +154,14 @@ class Command:
             return self.clean
         elif self.args["create-cr"]:
             return self.create_cr
+        elif self.args.get("schedule"):
+            return self.schedule
+        elif self.args.get("submit"):
+            return self.submit
+        elif self.args.get("worker"):
+            return self.worker
+        elif self.args.get("status"):
+            return self.status
         else:
             raise Exception("Invalid subcommand")
 
@@ -311,13 +332,75 @@ class RunCmd(Command):
     def prompt(self):
         return self.args.get("--prompt")
 
+    def checkpoint(self):
+        return self.args.get("--checkpoint")
+
+    def resume(self):
+        return self.args.get("--resume")
+
+    def batch(self):
+        return self.args.get("--batch")
+
+    def concurrency(self):
+        return int(self.args.get("--concurrency") or DEFAULT_CONCURRENCY)
+
+    def output(self):
+        return self.args.get("--output") or "results.jsonl"
+
+    def unordered(self):
+        return self.args.get("--unordered")
+
+    def pipeline(self):
+        return self.args.get("--pipeline")
+
+    def queue_size(self):
+        return int(self.args.get("--queue-size") or DEFAULT_PIPELINE_QUEUE_SIZE)
+
     def name(self):
         return "run"
 
+    def __run_batch(self, workflow):
+        counts = asyncio.run(
+            run_batch(
+                workflow,
+                self.batch(),
+                self.output(),
+                concurrency=self.concurrency(),
+                ordered=not self.unordered(),
+                resume=bool(self.resume()),
+            )
+        )
+        if not self.silent():
+            Console.ok(
+                f"Batch finished: {counts['succeeded']} succeeded, "
+                f"{counts['failed']} failed, {counts['skipped']} already done. "
+                f"Results in {self.output()}"
+            )
+        return 1 if counts["failed"] else 0
+
+    def __run_pipeline(self, workflow):
+        counts = asyncio.run(
+            run_pipeline(
+                workflow,
+                self.pipeline(),
+                self.output(),
+                queue_size=self.queue_size(),
+            )
+        )
+        if not self.silent():
+            Console.ok(
+                f"Pipeline finished: {counts['succeeded']} succeeded, "
+                f"{counts['failed']} failed. Results in {self.output()}"
+            )
+        return 1 if counts["failed"] else 0
+
     def run(self):
         """Run a workflow with specified agents and workflow files."""
         logger = FileLogger()
-        workflow_id = logger.generate_workflow_id()
+        workflow_id = self.resume() or logger.generate_workflow_id()
+        checkpoint = None
+        if self.checkpoint() or self.resume():
+            checkpoint = SQLiteCheckpointStore()
 
         workflow_yaml = parse_yaml(self.WORKFLOW_FILE())
 
@@ -347,9 +430,14 @@ class RunCmd(Command):
                 workflow=workflow_yaml[0],
                 workflow_id=workflow_id,
                 logger=logger,
+                checkpoint=checkpoint,
             )
             start_time = datetime.now(UTC)
-            result = asyncio.run(workflow.run())
+            if self.batch():
+                return self.__run_batch(workflow)
+            if self.pipeline():
+                return self.__run_pipeline(workflow)
+            result = asyncio.run(workflow.run(resume=bool(self.resume())))
             end_time = datetime.now(UTC)
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
 
@@ -400,11 +488,14 @@ class RunCmd(Command):
                 start_time=start_time,
                 end_time=end_time,
                 duration_ms=duration_ms,
+                usage=None if workflow.usage.empty else workflow.usage.to_dict(),
             )
 
         except Exception as e:
             self._check_verbose()
             Console.error(f"Unable to run workflow: {str(e)}")
+            if checkpoint:
+                Console.print(f"Resume with: maestro run ... --resume {workflow_id}")
             end_time = datetime.now(UTC)
             duration_ms = int((end_time - start_time).total_seconds() * 1000)
             logger.log_workflow_run(
@@ -423,6 +514,201 @@ class RunCmd(Command):
         return 0
 
 
+# Schedule command group
+#  maestro schedule AGENTS_FILE WORKFLOW_FILES... [options]
+class ScheduleCmd(Command):
+    """Command handler for hosting many event driven workflows in one process."""
+
+    def __init__(self, args):
+        self.args = args
+        super().__init__(self.args)
+
+    def AGENTS_FILE(self):
+        return self.args["AGENTS_FILE"]
+
+    def WORKFLOW_FILES(self):
+        return self.args["WORKFLOW_FILES"]
+
+    def name(self):
+        return "schedule"
+
+    def schedule(self):
+        """Run the given workflows concurrently until each of their events exits.
+
+        Returns:
+            int: Return code (0 for success, 1 for failure)
+        """
+        try:
+            agents_yaml = parse_yaml(self.AGENTS_FILE())
+            scheduler = CronScheduler()
+            for workflow_file in self.WORKFLOW_FILES():
+                for workflow_yaml in parse_yaml(workflow_file):
+                    workflow = Workflow(agent_defs=agents_yaml, workflow=workflow_yaml)
+                    scheduler.add(workflow_yaml["metadata"]["name"], workflow)
+            results = asyncio.run(scheduler.run())
+        except Exception as e:
+            self._check_verbose()
+            Console.error(f"Unable to schedule workflows: {str(e)}")
+            return 1
+
+        rc = 0
+        for name, result in results.items():
+            if isinstance(result, BaseException):
+                Console.error(f"Workflow {name} failed: {str(result)}")
+                rc = 1
+            elif not self.silent():
+                Console.ok(f"Workflow {name} finished")
+        return rc
+
+
+# Submit command group
+#  maestro submit AGENTS_FILE WORKFLOW_FILE [options]
+class SubmitCmd(Command):
+    """Command handler for queueing workflow runs for the workers."""
+
+    def __init__(self, args):
+        self.args = args
+        super().__init__(self.args)
+
+    def AGENTS_FILE(self):
+        return self.args["AGENTS_FILE"]
+
+    def WORKFLOW_FILE(self):
+        return self.args["WORKFLOW_FILE"]
+
+    def input(self):
+        return self.args.get("--input")
+
+    def batch(self):
+        return self.args.get("--batch")
+
+    def queue(self):
+        return self.args.get("--queue")
+
+    def name(self):
+        return "submit"
+
+    def submit(self):
+        """Queue one run, or one run per prompt of a batch file.
+
+        Returns:
+            int: Return code (0 for success, 1 for failure)
+        """
+        try:
+            agents = ""
+            if self.AGENTS_FILE() and self.AGENTS_FILE() != "None":
+                with open(self.AGENTS_FILE(), "r") as file:
+                    agents = file.read()
+            with open(self.WORKFLOW_FILE(), "r") as file:
+                workflow = file.read()
+            if self.batch():
+                prompts = [prompt for _, prompt in read_inputs(self.batch())]
+            else:
+                prompts = [self.input()]
+            queue = RunQueue(self.queue())
+            try:
+                run_ids = [queue.submit(agents, workflow, prompt) for prompt in prompts]
+            finally:
+                queue.close()
+        except Exception as e:
+            self._check_verbose()
+            Console.error(f"Unable to submit workflow: {str(e)}")
+            return 1
+        for run_id in run_ids:
+            Console.print(run_id)
+        return 0
+
+
+# Worker command group
+#  maestro worker [options]
+class WorkerCmd(Command):
+    """Command handler for running queued workflows on worker processes."""
+
+    def __init__(self, args):
+        self.args = args
+        super().__init__(self.args)
+
+    def queue(self):
+        return self.args.get("--queue")
+
+    def workers(self):
+        workers = self.args.get("--workers")
+        return int(workers) if workers else None
+
+    def concurrency(self):
+        return int(self.args.get("--concurrency") or DEFAULT_CONCURRENCY)
+
+    def drain(self):
+        return self.args.get("--drain")
+
+    def name(self):
+        return "worker"
+
+    def worker(self):
+        """Run queued workflows until interrupted, or until drained.
+
+        Returns:
+            int: Return code (0 for success, 1 for failure)
+        """
+        try:
+            failed = run_workers(
+                self.queue(),
+                processes=self.workers(),
+                concurrency=self.concurrency(),
+                drain=self.drain(),
+            )
+        except Exception as e:
+            self._check_verbose()
+            Console.error(f"Unable to run workers: {str(e)}")
+            return 1
+        if failed:
+            Console.error(f"{failed} worker processes failed")
+            return 1
+        return 0
+
+
+# Status command group
+#  maestro status [RUN_IDS...] [options]
+class StatusCmd(Command):
+    """Command handler for showing the state of queued workflow runs."""
+
+    def __init__(self, args):
+        self.args = args
+        super().__init__(self.args)
+
+    def RUN_IDS(self):
+        return self.args.get("RUN_IDS") or []
+
+    def queue(self):
+        return self.args.get("--queue")
+
+    def name(self):
+        return "status"
+
+    def status(self):
+        """Print the given runs as JSON lines, or the run counts by status.
+
+        Returns:
+            int: Return code (0 for success, 1 when a run is unknown)
+        """
+        queue = RunQueue(self.queue())
+        try:
+            if not self.RUN_IDS():
+                Console.print(json.dumps(queue.counts()))
+                return 0
+            rc = 0
+            for run_id in self.RUN_IDS():
+                run = queue.get(run_id)
+                if run is None:
+                    Console.error(f"Unknown run {run_id}")
+                    rc = 1
+                else:
+                    Console.print(json.dumps(run, default=str))
+            return rc
+        finally:
+            queue.close()
+
+
 # Deploy command group
 #  maestro deploy AGENTS_FILE WORKFLOW_FILE [options]
 class DeployCmd(Command):
@@ -738,11 +1024,14 @@ class CreateCrCmd(Command):
                                 if step.get("agent"):
                                     step["agent"] = sanitize_name(step["agent"])
                                 if step.get("parallel"):
-                                    agents = step["parallel"]
+                                    agents = parallel_agents(step)
                                     samitized_agents = []
                                     for agent in agents:
                                         samitized_agents.append(sanitize_name(agent))
-                                    step["parallel"] = samitized_agents
+                                    if isinstance(step["parallel"], dict):
+                                        step["parallel"]["agents"] = samitized_agents
+                                    else:
+                                        step["parallel"] = samitized_agents
                         if data["spec"]["template"].get("exception"):
                             exception = data["spec"]["template"]["exception"]
                             if exception.get("agent"):
@@ -17,6 +17,7 @@ from pydantic import BaseModel
 from maestro.workflow import create_agents, Workflow
 from maestro.agents.agent import restore_agent
 from maestro.cli.common import parse_yaml, Console
+from maestro.subworkflow import register_workflow
 
 from dotenv import load_dotenv
 
@@ -279,6 +280,17 @@ class FastAPIWorkflowServer:
                 Console.error(f"Error in chat endpoint: {str(e)}")
                 raise HTTPException(status_code=500, detail=str(e))
 
+        @self.app.post("/chat/stream")
+        async def chat_stream(request: WorkflowChatRequest):
+            """Chat with the workflow, streaming step events as server-sent events."""
+            if not self.workflow:
+                raise HTTPException(status_code=500, detail="No workflow loaded")
+            return StreamingResponse(
+                self._stream_events(request.prompt),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache"},
+            )
+
         @self.app.get("/health", response_model=WorkflowHealthResponse)
         async def health():
             """Health check endpoint."""
@@ -288,6 +300,24 @@ class FastAPIWorkflowServer:
                 timestamp=datetime.utcnow().isoformat() + "Z",
             )
 
+    async def _stream_events(self, prompt: str):
+        """Stream the events of a workflow run as server-sent events.
+
+        A client that disconnects closes the generator, which cancels the run.
+        """
+        events = self.workflow.run_stream(prompt)
+        try:
+            async for event in events:
+                yield (
+                    f"event: {event['type']}\n"
+                    f"data: {json.dumps(event, default=str)}\n\n"
+                )
+        except Exception as e:
+            # the workflow_error event has been sent already
+            Console.error(f"Error in chat stream endpoint: {str(e)}")
+        finally:
+            await events.aclose()
+
     def _load_workflow(self):
         """Load agents from the agents file."""
         try:
@@ -301,6 +331,8 @@ class FastAPIWorkflowServer:
 
     def run(self, host: str = "127.0.0.1", port: int = 8000):
         """Run the FastAPI server."""
+        # only the workflow served here is known, see register_workflow
+        register_workflow(f"http://{host}:{port}", self.workflow)
         Console.print(f"Starting Maestro workflow server on {host}:{port}")
         Console.print(f"API documentation available at: http://{host}:{port}/docs")
         Console.print(f"Health check available at: http://{host}:{port}/health")
@@ -11,6 +11,10 @@ Usage:
   maestro mermaid WORKFLOW_FILE [options]
   maestro run WORKFLOW_FILE [options]
   maestro run AGENTS_FILE WORKFLOW_FILE [options]
+  maestro schedule AGENTS_FILE WORKFLOW_FILES... [options]
+  maestro submit AGENTS_FILE WORKFLOW_FILE [options]
+  maestro worker [options]
+  maestro status [RUN_IDS...] [options]
   maestro serve AGENTS_FILE [options]
   maestro serve  AGENTS_FILE WORKFLOW_FILE [options]
   maestro validate YAML_FILE [options]
@@ -28,6 +32,18 @@ Options:
   --dry-run              Mocks agents and other parts of workflow execution.
   --prompt               Reads a user prompt and executes workflow with it
   --auto-prompt          Run prompt by default if specified
+  --checkpoint           Persist step outputs so a failed run can be resumed
+  --resume WORKFLOW_ID   Resume a checkpointed run after its last completed step
+  --batch FILE           Run the workflow once per prompt of a .jsonl or .csv file
+  --concurrency N        Number of batch prompts run at the same time [default: 4]
+  --output FILE          JSONL file the batch results are appended to [default: results.jsonl]
+  --unordered            Write batch results as they complete instead of in input order
+  --pipeline FILE        Stream the prompts of a .jsonl or .csv file, or stdin (-), through the steps
+  --queue-size N         Number of prompts waiting between two pipeline steps [default: 8]
+  --input PROMPT         Prompt of the submitted run, defaults to the template prompt
+  --queue FILE           Run queue database (default: ~/.maestro/runs.db)
+  --workers N            Number of worker processes (default: number of CPUs)
+  --drain                Stop the workers once the queue is empty
 
   --streamlit            Deploys locally as streamlit application (default deploy)
 
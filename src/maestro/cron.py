@@ -0,0 +1,135 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pycron
+
+# how far ahead to look for the next match of an expression
+MAX_LOOKAHEAD_DAYS = 366 * 5
+
+
+def next_fire_time(cron, after=None, inclusive=False):
+    """
+    Computes the next time a cron expression matches.
+
+    Days and hours that cannot match are skipped as a whole, so expressions
+    that fire rarely are resolved without testing every minute in between.
+
+    Args:
+        cron (str): The cron expression, e.g. `*/5 * * * *`.
+        after (datetime): The time to search from, defaults to now.
+        inclusive (bool): Whether the minute of `after` itself may match.
+    Returns:
+        datetime: The start of the next matching minute.
+    Raises:
+        ValueError: If the expression does not match within the lookahead.
+    """
+    fields = cron.split()
+    if len(fields) != 5:
+        raise ValueError(f"Invalid cron expression '{cron}'")
+    day_cron = " ".join(["*", "*", *fields[2:]])
+    hour_cron = " ".join(["*", fields[1], "*", "*", "*"])
+
+    current = (after or datetime.now()).replace(second=0, microsecond=0)
+    if not inclusive:
+        current += timedelta(minutes=1)
+    limit = current + timedelta(days=MAX_LOOKAHEAD_DAYS)
+    while current < limit:
+        if not pycron.is_now(day_cron, current):
+            current = current.replace(hour=0, minute=0) + timedelta(days=1)
+        elif not pycron.is_now(hour_cron, current):
+            current = current.replace(minute=0) + timedelta(hours=1)
+        elif pycron.is_now(cron, current):
+            return current
+        else:
+            current += timedelta(minutes=1)
+    raise ValueError(f"Cron expression '{cron}' never matches")
+
+
+async def sleep_until(when):
+    """Sleeps without blocking the event loop until the given local time."""
+    while True:
+        delay = (when - datetime.now()).total_seconds()
+        if delay <= 0:
+            return
+        # re-check after waking so clock adjustments do not cause early fires
+        await asyncio.sleep(delay)
+
+
+async def cron_ticks(cron, fire_now=True):
+    """
+    Yields the fire times of a cron expression, waiting until each one.
+
+    Every matching minute is yielded at most once. A tick that is missed
+    because the consumer was busy is skipped rather than fired late.
+
+    Args:
+        cron (str): The cron expression.
+        fire_now (bool): Whether the current minute counts as a tick.
+    """
+    inclusive = fire_now
+    while True:
+        when = next_fire_time(cron, inclusive=inclusive)
+        await sleep_until(when)
+        inclusive = False
+        yield when
+
+
+class CronScheduler:
+    """
+    Runs many event driven workflows concurrently in a single event loop.
+
+    Each workflow waits for its own cron ticks with `asyncio.sleep`, so one
+    process can host any number of cron workflows.
+
+    Attributes:
+        jobs (dict): The scheduled workflow runs, keyed by name.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self._tasks = {}
+
+    def add(self, name, workflow, prompt=""):
+        """
+        Adds a workflow to the scheduler.
+
+        Args:
+            name (str): Unique name of the job.
+            workflow (Workflow): The workflow to run.
+            prompt (str): The prompt to run with, defaults to the template prompt.
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job '{name}' is already scheduled")
+        self.jobs[name] = (workflow, prompt)
+
+    def remove(self, name):
+        """Removes a job, cancelling it when it is running."""
+        self.jobs.pop(name, None)
+        task = self._tasks.pop(name, None)
+        if task:
+            task.cancel()
+
+    async def run(self):
+        """
+        Runs all jobs until each of them exits.
+
+        Returns:
+            dict: The result or exception of each job, keyed by name.
+        """
+        self._tasks = {
+            name: asyncio.create_task(workflow.run(prompt))
+            for name, (workflow, prompt) in self.jobs.items()
+        }
+        try:
+            names = list(self._tasks)
+            results = await asyncio.gather(
+                *self._tasks.values(), return_exceptions=True
+            )
+            return dict(zip(names, results))
+        finally:
+            for task in self._tasks.values():
+                task.cancel()
+            self._tasks = {}
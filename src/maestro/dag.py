@@ -0,0 +1,125 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+
+def condition_targets(step):
+    """
+    Returns the step names a `condition` of the step can hand control to.
+
+    Args:
+        step (dict): The step definition.
+    Returns:
+        list: Target step names in the order they appear in the condition.
+    """
+    targets = []
+    for cond in step.get("condition") or []:
+        for key in ("then", "else", "do", "default"):
+            target = cond.get(key)
+            if target and target not in targets:
+                targets.append(target)
+    return targets
+
+
+def parallel_agents(step):
+    """
+    Returns the agent names of the `parallel` of a step.
+
+    `parallel` is either a list of agent names or an object with the names
+    under `agents` next to its options.
+    """
+    parallel = step.get("parallel") or []
+    if isinstance(parallel, dict):
+        return list(parallel.get("agents") or [])
+    return list(parallel)
+
+
+class StepGraph:
+    """
+    Dependency graph of the steps of a workflow template.
+
+    Attributes:
+        order (list): Step names in definition order.
+        data_deps (dict): Step name -> names of the steps whose results it reads
+            through `inputs`.
+        activators (dict): Step name -> names of the steps that can hand control
+            to it, either through a `condition` branch or by implicit ordering.
+        successor (dict): Step name -> the step that follows it by implicit
+            ordering, if any.
+        needs_activation (dict): Step name -> whether the step only runs when
+            one of its activators selects it.
+    """
+
+    def __init__(self, steps):
+        self.order = [step["name"] for step in steps]
+        names = set(self.order)
+        if len(names) != len(self.order):
+            raise ValueError("Step names must be unique")
+
+        self.data_deps = {}
+        self.activators = {name: [] for name in self.order}
+        self.successor = {}
+        self.needs_activation = {}
+
+        for idx, step in enumerate(steps):
+            name = step["name"]
+            deps = []
+            for inp in step.get("inputs") or []:
+                src = inp["from"]
+                if src in names and src not in deps:
+                    if src == name:
+                        raise ValueError(f"Step '{name}' cannot read its own result")
+                    deps.append(src)
+            self.data_deps[name] = deps
+
+            for target in condition_targets(step):
+                if target not in names:
+                    raise ValueError(
+                        f"Step '{name}' has a condition to unknown step '{target}'"
+                    )
+                self.activators[target].append(name)
+
+            if idx > 0 and not step.get("inputs"):
+                prev = steps[idx - 1]
+                if not prev.get("condition"):
+                    self.successor[prev["name"]] = name
+                    self.activators[name].append(prev["name"])
+
+        for idx, step in enumerate(steps):
+            name = step["name"]
+            self.needs_activation[name] = bool(self.activators[name]) or (
+                idx > 0 and not step.get("inputs")
+            )
+
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        pending = {
+            name: set(self.data_deps[name]) | set(self.activators[name])
+            for name in self.order
+        }
+        dependents = {name: [] for name in self.order}
+        for name, deps in pending.items():
+            for dep in deps:
+                dependents[dep].append(name)
+
+        ready = [name for name, deps in pending.items() if not deps]
+        resolved = 0
+        while ready:
+            name = ready.pop()
+            resolved += 1
+            for dependent in dependents[name]:
+                pending[dependent].discard(name)
+                if not pending[dependent]:
+                    ready.append(dependent)
+
+        if resolved != len(self.order):
+            cyclic = [name for name in self.order if pending[name]]
+            raise ValueError(f"Steps form a cycle: {', '.join(cyclic)}")
+
+    def roots(self):
+        """Returns the steps that can start as soon as the workflow starts."""
+        return [
+            name
+            for name in self.order
+            if not self.needs_activation[name] and not self.data_deps[name]
+        ]
@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import contextvars
+from datetime import datetime, UTC
+
+STEP_STARTED = "step_started"
+STEP_FINISHED = "step_finished"
+STEP_FAILED = "step_failed"
+TOKEN = "token"
+WORKFLOW_DONE = "workflow_done"
+WORKFLOW_ERROR = "workflow_error"
+
+# receives the events of the current run, set by Workflow.run_stream
+_sink = contextvars.ContextVar("maestro_event_sink", default=None)
+# name of the step running in the current task
+_current_step = contextvars.ContextVar("maestro_current_step", default=None)
+
+
+def set_sink(sink):
+    """
+    Sends the events emitted in the current context to `sink`.
+
+    Tasks created afterwards inherit the sink, so the events of every step of
+    a run reach it.
+
+    Args:
+        sink: Callable receiving each event dict.
+    Returns:
+        Token to pass to `reset_sink`.
+    """
+    return _sink.set(sink)
+
+
+def reset_sink(token):
+    _sink.reset(token)
+
+
+def set_current_step(step_name):
+    """Marks the step running in the current task, returns a reset token."""
+    return _current_step.set(step_name)
+
+
+def reset_current_step(token):
+    _current_step.reset(token)
+
+
+def current_step():
+    """Returns the name of the step running in the current task, if any."""
+    return _current_step.get()
+
+
+def make_event(event_type, **fields):
+    """Returns an event dict of the given type with a timestamp."""
+    event = {"type": event_type, "timestamp": datetime.now(UTC).isoformat()}
+    event.update(fields)
+    return event
+
+
+def emit(event_type, **fields):
+    """
+    Emits an event to the sink of the current context, if any.
+
+    Args:
+        event_type (str): One of the event type constants of this module.
+        fields: The payload of the event.
+    """
+    sink = _sink.get()
+    if sink is None:
+        return
+    sink(make_event(event_type, **fields))
+
+
+def emit_token(agent_name, delta):
+    """Emits an incremental piece of output produced by an agent."""
+    emit(TOKEN, step=current_step(), agent=agent_name, delta=delta)
@@ -1,8 +1,14 @@
 # maestro/file_logger.py
 
+import atexit
 import uuid
 import os
 import json
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, UTC
 from pathlib import Path
 
@@ -13,15 +19,185 @@ else:
     DEFAULT_LOG_DIR = Path("./logs")
 
 
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_MAX_OPEN = 64
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class JsonlWriter:
+    """
+    Appends JSON lines to log files from a background thread.
+
+    Records are queued by `write` and written in batches, once
+    `batch_size` records are waiting or `flush_interval` seconds after the
+    first of them, so callers never wait for the disk. The files of recent
+    runs are kept open between batches. When the queue is full, `write`
+    drops the record rather than block the event loop of the caller, and
+    counts it in `dropped`.
+
+    Args:
+        batch_size (int): Records written at most per batch.
+        flush_interval (float): Seconds a record waits at most before it is
+            written.
+        max_queue (int): Records waiting at most.
+        max_open (int): Files kept open at most.
+    """
+
+    def __init__(
+        self,
+        batch_size=DEFAULT_BATCH_SIZE,
+        flush_interval=DEFAULT_FLUSH_INTERVAL,
+        max_queue=DEFAULT_MAX_QUEUE,
+        max_open=DEFAULT_MAX_OPEN,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_open = max_open
+        self.dropped = 0
+        self._queue = queue.Queue(max_queue)
+        self._files = OrderedDict()
+        self._thread = threading.Thread(
+            target=self._run, name="maestro-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, path, data):
+        """Queues a record to be appended to `path` as a JSON line."""
+        try:
+            self._queue.put_nowait((path, data))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(
+                "Log queue full, dropped a record for %s (%d dropped so far)",
+                path,
+                self.dropped,
+            )
+
+    def flush(self):
+        """Waits until the records queued so far are written."""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Writes the queued records and stops the thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _file(self, path):
+        file = self._files.get(path)
+        if file is None:
+            if len(self._files) >= self.max_open:
+                self._files.popitem(last=False)[1].close()
+            file = self._files[path] = open(path, "a", encoding="utf-8")
+        else:
+            self._files.move_to_end(path)
+        return file
+
+    def _write_batch(self, batch):
+        for path, data in batch:
+            self._file(path).write(json.dumps(data) + "\n")
+        for file in self._files.values():
+            file.flush()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch = []
+            waiters = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    # a flush writes what is queued without waiting further
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception as err:
+                # keep the thread alive so later records and flushes go through
+                logger.error("Unable to write %d log records: %s", len(batch), err)
+            for waiter in waiters:
+                waiter.set()
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
+
+
+_writer = None
+_writer_pid = None
+_writer_lock = threading.Lock()
+
+
+def log_writer():
+    """Returns the JsonlWriter of the current process, starting it on first use."""
+    global _writer, _writer_pid
+    with _writer_lock:
+        # a forked child does not inherit the thread of its parent
+        if _writer is None or _writer_pid != os.getpid():
+            _writer = JsonlWriter()
+            _writer_pid = os.getpid()
+        return _writer
+
+
+def flush_logs():
+    """Waits until the buffered log records of this process are written."""
+    if _writer is not None and _writer_pid == os.getpid():
+        _writer.flush()
+
+
+@atexit.register
+def _close_writer():
+    if _writer is not None and _writer_pid == os.getpid():
+        _writer.close()
+
+
 class FileLogger:
-    def __init__(self, log_dir=None):
+    """
+    Writes the logs of workflow runs as JSON lines, one file per run.
+
+    Args:
+        log_dir (str): Directory of the log files, `~/.maestro/logs` by default.
+        buffered (bool): Hand records to the background JsonlWriter instead
+            of writing them before returning. Unbuffered writes first wait
+            for the buffered records, so a file stays in order.
+    """
+
+    def __init__(self, log_dir=None, buffered=False):
         self.log_dir = Path(log_dir) if log_dir else DEFAULT_LOG_DIR
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.buffered = buffered
 
     def generate_workflow_id(self):
         return uuid.uuid4().hex
 
+    def flush(self):
+        """Waits until the buffered records are written."""
+        flush_logs()
+
     def _write_json_line(self, log_path, data):
+        if self.buffered:
+            log_writer().write(log_path, data)
+            return
+        flush_logs()
         with open(log_path, "a", encoding="utf-8") as f:
             f.write(json.dumps(data) + "\n")
 
@@ -37,6 +213,7 @@ class FileLogger:
         start_time=None,
         end_time=None,
         duration_ms=None,
+        usage=None,
     ):
         log_path = self.log_dir / f"maestro_run_{workflow_id}.jsonl"
         data = {
@@ -53,6 +230,8 @@ class FileLogger:
             "end_time": end_time.isoformat() if end_time else None,
             "duration_ms": duration_ms,
         }
+        if usage:
+            data["usage"] = usage
         self._write_json_line(log_path, data)
 
     def log_workflow_run(
@@ -66,6 +245,7 @@ class FileLogger:
         start_time=None,
         end_time=None,
         duration_ms=None,
+        usage=None,
     ):
         log_path = self.log_dir / f"maestro_run_{workflow_id}.jsonl"
         data = {
@@ -81,4 +261,6 @@ class FileLogger:
             "end_time": end_time.isoformat() if end_time else None,
             "duration_ms": duration_ms,
         }
+        if usage:
+            data["usage"] = usage
         self._write_json_line(log_path, data)
@@ -1,8 +1,11 @@
 import time
 from datetime import datetime, UTC
+from maestro import events
 from maestro.file_logger import FileLogger
+from maestro.usage import collect_usage, run_usage
 
-logger = FileLogger()
+# agent responses are written by a background thread, off the event loop
+logger = FileLogger(buffered=True)
 
 
 def log_agent_run(workflow_id, agent_name, agent_model):
@@ -15,7 +18,8 @@ def log_agent_run(workflow_id, agent_name, agent_model):
             perf_start = time.perf_counter()
             start_time = datetime.now(UTC)
 
-            result = await run_func(*args, **kwargs)
+            with collect_usage() as usage:
+                result = await run_func(*args, **kwargs)
 
             end_time = datetime.now(UTC)
             perf_end = time.perf_counter()
@@ -35,7 +39,11 @@ def log_agent_run(workflow_id, agent_name, agent_model):
                 start_time=start_time,
                 end_time=end_time,
                 duration_ms=int((perf_end - perf_start) * 1000),
+                usage=None if usage.empty else usage.to_dict(),
             )
+            totals = run_usage()
+            if totals is not None:
+                totals.add(events.current_step(), agent_name, usage)
 
             return result
 
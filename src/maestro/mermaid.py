@@ -3,6 +3,8 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 IBM
 
+from maestro.dag import parallel_agents
+
 
 class Mermaid:
     # kind: sequenceDiagram or flowchart
@@ -130,10 +132,11 @@ class Mermaid:
 
     def __to_sequenceDiagram_parallel(self, agentL, parallelStep):
         sb = "par\n"
-        for i, agent in enumerate(parallelStep["parallel"]):
+        agents = parallel_agents(parallelStep)
+        for i, agent in enumerate(agents):
             agentR = self.__fix_agent_name(agent)
             sb += f"  {agentL}->>{agentR}: {parallelStep['name']}\n"
-            if i < len(parallelStep["parallel"]) - 1:
+            if i < len(agents) - 1:
                 sb += "and\n"
         sb += "end\n"
         return sb
@@ -0,0 +1,226 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+
+from maestro.dag import StepGraph, condition_targets, parallel_agents
+from maestro.utils import compile_expression
+
+
+class PlanStep:
+    """
+    A compiled step of a workflow plan.
+
+    Attributes:
+        index (int): Position of the step in its plan.
+        name (str): The name of the step.
+        definition (dict): Private copy of the step definition.
+        agent (str): Name of the agent for this step, if any.
+        parallel (tuple): Names of the agents to run in parallel, if any.
+        agents (tuple): Names of all the agents the step runs.
+        loop (dict): Loop configuration with a compiled `until`, if any.
+        condition (list): Conditional branches with compiled expressions, if any.
+        workflow_url (str): URL of the sub-workflow for this step, if any.
+        inputs (tuple): Pre-resolved `(kind, value)` pairs for `inputs:` where
+            kind is one of "prompt", "instructions", "step" or "literal".
+        successor (int): Index of the step that follows by list order, if any.
+    """
+
+    __slots__ = (
+        "index",
+        "name",
+        "definition",
+        "agent",
+        "parallel",
+        "agents",
+        "loop",
+        "condition",
+        "workflow_url",
+        "inputs",
+        "successor",
+    )
+
+    def __init__(self, index, step, names, workflows, successor):
+        self.index = index
+        self.name = step["name"]
+        self.definition = step
+        self.agent = step.get("agent")
+        self.parallel = tuple(parallel_agents(step))
+        self.successor = successor
+
+        self.loop = None
+        if step.get("loop"):
+            self.loop = dict(step["loop"])
+            if self.loop.get("until"):
+                self.loop["until"] = compile_expression(self.loop["until"])
+
+        self.agents = tuple(
+            dict.fromkeys(
+                name
+                for name in (
+                    self.agent,
+                    *self.parallel,
+                    self.loop.get("agent") if self.loop else None,
+                )
+                if name
+            )
+        )
+
+        self.condition = None
+        if step.get("condition"):
+            self.condition = []
+            for cond in step["condition"]:
+                cond = dict(cond)
+                for key in ("if", "case"):
+                    if cond.get(key):
+                        cond[key] = compile_expression(cond[key])
+                self.condition.append(cond)
+
+        self.workflow_url = None
+        if step.get("workflow"):
+            for workflow in workflows or []:
+                if workflow["name"] == step["workflow"]:
+                    self.workflow_url = workflow["url"]
+            if self.workflow_url is None:
+                raise RuntimeError("Workflow doesn't exist")
+
+        inputs = []
+        for inp in step.get("inputs") or []:
+            src = inp["from"]
+            if src == "prompt":
+                inputs.append(("prompt", None))
+            elif "instructions:" in src:
+                inputs.append(("instructions", src.split(":")[-1]))
+            elif src in names:
+                inputs.append(("step", src))
+            else:
+                inputs.append(("literal", src))
+        self.inputs = tuple(inputs)
+
+
+class StepPlan:
+    """
+    Indexed, compiled form of a list of step definitions.
+    """
+
+    def __init__(self, steps, workflows=None):
+        steps = copy.deepcopy(list(steps))
+        names = {step["name"] for step in steps}
+        self.steps = tuple(
+            PlanStep(
+                idx,
+                step,
+                names,
+                workflows,
+                idx + 1 if idx + 1 < len(steps) else None,
+            )
+            for idx, step in enumerate(steps)
+        )
+        self.index = {step.name: step.index for step in self.steps}
+        self._graph = None
+        self._next_agents = {}
+
+    def step(self, name):
+        """Returns the plan step with the given name."""
+        idx = self.index.get(name)
+        if idx is None:
+            raise ValueError(f"Unknown step '{name}'")
+        return self.steps[idx]
+
+    def next_agents(self, plan_step):
+        """
+        Returns the names of the agents of the steps that may run right after
+        the given step, either by a `condition` branch or by list order.
+        """
+        names = self._next_agents.get(plan_step.index)
+        if names is None:
+            targets = condition_targets(plan_step.definition)
+            if targets:
+                following = [self.step(name) for name in targets if name in self.index]
+            elif plan_step.successor is not None:
+                following = [self.steps[plan_step.successor]]
+            else:
+                following = []
+            names = self._next_agents[plan_step.index] = tuple(
+                dict.fromkeys(name for step in following for name in step.agents)
+            )
+        return names
+
+    @property
+    def graph(self):
+        """The dependency graph of the steps, built on first use."""
+        if self._graph is None:
+            self._graph = StepGraph([step.definition for step in self.steps])
+        return self._graph
+
+
+class WorkflowPlan:
+    """
+    Immutable execution plan compiled from a workflow definition.
+
+    The plan is compiled once per definition and reused by every run, so a run
+    does not need to re-read the raw YAML dictionaries.
+
+    Attributes:
+        strategy (str): How the steps are scheduled, `sequence` or `dag`.
+        main (StepPlan): The steps of the workflow template.
+        agent_names (tuple): Names of the agents referenced by `agent:` steps.
+        event (dict): Copy of the event definition, if any.
+        event_plan (StepPlan): The steps run by the event, if any.
+        event_start (str): Name of the first step run by the event.
+        event_exit: Compiled event exit expression, if any.
+    """
+
+    def __init__(self, workflow):
+        template = workflow["spec"]["template"]
+        strategy = workflow["spec"].get("strategy") or {}
+        self.strategy = strategy.get("type", "sequence")
+        self.main = StepPlan(template["steps"], template.get("workflows"))
+        self.agent_names = tuple(
+            dict.fromkeys(step.agent for step in self.main.steps if step.agent)
+        )
+        if self.strategy == "dag":
+            # build the graph now so dependency errors surface at load time
+            self.main.graph
+
+        self.event = None
+        self.event_plan = None
+        self.event_start = None
+        self.event_exit = None
+        event = template.get("event")
+        if event:
+            self.event = copy.deepcopy(event)
+            step_names = event.get("steps", [])
+            if step_names:
+                self.event_plan = StepPlan(
+                    [s for s in template["steps"] if s["name"] in step_names],
+                    template.get("workflows"),
+                )
+                self.event_start = step_names[0]
+            if event.get("exit"):
+                self.event_exit = compile_expression(event["exit"])
+
+    def pipeline_steps(self):
+        """
+        Returns the steps of the template in the order every input passes
+        through them in pipeline mode.
+
+        Only workflows whose steps always run in definition order can be
+        pipelined, so steps with a `condition`, and DAG steps reading the
+        result of a later step, are rejected.
+        """
+        for plan_step in self.main.steps:
+            if plan_step.condition:
+                raise ValueError(
+                    f"Step '{plan_step.name}' has a condition, pipeline mode "
+                    "needs steps that run in definition order"
+                )
+            if self.strategy == "dag":
+                for kind, value in plan_step.inputs:
+                    if kind == "step" and self.main.index[value] > plan_step.index:
+                        raise ValueError(
+                            f"Step '{plan_step.name}' reads the later step "
+                            f"'{value}', pipeline mode needs steps that run in "
+                            "definition order"
+                        )
+        return self.main.steps
@@ -0,0 +1,196 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import contextlib
+import functools
+import threading
+import time
+import weakref
+
+from maestro.utils import prompt_text
+
+
+def estimate_tokens(value):
+    """Returns a rough token count of a prompt or an output, 4 characters each."""
+    return len(prompt_text(value)) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per minute rate.
+
+    Callers reserve tokens up front and then wait until the bucket would
+    have held them, so waiters are served in the order they arrived. The
+    bucket state is guarded by a thread lock and waiting uses `asyncio.sleep`,
+    so a bucket can be shared by every event loop of the process.
+
+    Attributes:
+        per_minute (float): Tokens added per minute.
+        capacity (float): Tokens the bucket holds at most, which bounds bursts.
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        if per_minute <= 0:
+            raise ValueError("rate limits must be positive")
+        self.per_minute = per_minute
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self._rate = per_minute / 60.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def reserve(self, amount=1):
+        """Takes tokens from the bucket, returning the seconds to wait for them."""
+        with self._lock:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+            return 0 if self.tokens >= 0 else -self.tokens / self._rate
+
+    async def acquire(self, amount=1):
+        """Waits until `amount` tokens are available and takes them."""
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def charge(self, amount):
+        """Takes tokens used after the fact, delaying later callers."""
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+
+
+class RateLimiter:
+    """
+    Limits the calls to one endpoint, a base URL and model.
+
+    Attributes:
+        endpoint (tuple): The `(base_url, model)` key of the endpoint.
+        max_concurrency (int): Calls in flight at a time, if limited. The limit
+            applies per event loop.
+        requests (TokenBucket): Bucket of `requests_per_minute`, if any.
+        tokens (TokenBucket): Bucket of `tokens_per_minute`, if any. Tokens are
+            estimated from the length of prompts and outputs.
+    """
+
+    def __init__(
+        self,
+        endpoint,
+        max_concurrency=None,
+        requests_per_minute=None,
+        tokens_per_minute=None,
+    ):
+        self.endpoint = endpoint
+        self.max_concurrency = max_concurrency
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self):
+        if not self.max_concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(
+                    self.max_concurrency
+                )
+            return semaphore
+
+    @contextlib.asynccontextmanager
+    async def slot(self, prompt_tokens=1):
+        """Waits until a call with the given prompt size may start."""
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            if self.requests is not None:
+                await self.requests.acquire()
+            if self.tokens is not None:
+                await self.tokens.acquire(prompt_tokens)
+            yield self
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def record_output(self, output_tokens):
+        """Charges the tokens of a response to the token bucket."""
+        if self.tokens is not None:
+            self.tokens.charge(output_tokens)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def rate_limiter(endpoint, **settings):
+    """
+    Returns the process wide RateLimiter of an endpoint, creating it with the
+    given settings on first use.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(endpoint)
+        if limiter is None:
+            limiter = _limiters[endpoint] = RateLimiter(endpoint, **settings)
+        return limiter
+
+
+def agent_limit_key(agent):
+    """Returns the `(base_url, model)` key of the endpoint an agent calls."""
+    url = (
+        getattr(agent, "base_url", None)
+        or getattr(agent, "agent_url", None)
+        or getattr(agent, "agent_framework", None)
+    )
+    return (url, getattr(agent, "agent_model", None))
+
+
+def agent_rate_limiter(agent):
+    """
+    Returns the RateLimiter an agent's calls go through, if any.
+
+    An agent with `max_concurrency` or `rate_limit` registers the limits of
+    its endpoint. Agents without them still share the limiter when another
+    agent registered one for the same endpoint.
+    """
+    key = agent_limit_key(agent)
+    max_concurrency = getattr(agent, "agent_max_concurrency", None)
+    rate_limit = getattr(agent, "agent_rate_limit", None) or {}
+    if max_concurrency or rate_limit:
+        return rate_limiter(key, max_concurrency=max_concurrency, **rate_limit)
+    with _limiters_lock:
+        return _limiters.get(key)
+
+
+def limited(run_func, limiter=None):
+    """
+    Wraps an async agent `run` so every call goes through a rate limiter.
+
+    Args:
+        run_func: The async function to wrap.
+        limiter (RateLimiter): The limiter of the endpoint, if any.
+    Returns:
+        The wrapped async function.
+    """
+    if limiter is None:
+        return run_func
+
+    @functools.wraps(run_func)
+    async def wrapper(*args, **kwargs):
+        async with limiter.slot(estimate_tokens(list(args))):
+            result = await run_func(*args, **kwargs)
+        limiter.record_output(estimate_tokens(result))
+        return result
+
+    return wrapper
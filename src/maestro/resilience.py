@@ -0,0 +1,196 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import functools
+import random
+import threading
+import time
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class RetryPolicy:
+    """
+    Declarative retry policy with exponential backoff and jitter.
+
+    Attributes:
+        max_attempts (int): Total number of attempts, including the first.
+        backoff (float): Seconds to wait before the first retry.
+        multiplier (float): Factor applied to the wait after every retry.
+        max_backoff (float): Upper bound of the wait between attempts.
+        jitter (bool): Whether to randomize each wait between 0 and its value.
+        retry_on (tuple): Names of the exception classes that are retried. An
+            error is retried when any class in its hierarchy has one of these
+            names, so `Exception` retries everything.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff=1.0,
+        multiplier=2.0,
+        max_backoff=30.0,
+        jitter=True,
+        retry_on=("Exception",),
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_on = tuple(retry_on)
+
+    @classmethod
+    def from_dict(cls, spec):
+        """Creates a policy from the `retry` settings of an agent or step."""
+        return cls(**spec)
+
+    def is_retryable(self, err):
+        if isinstance(err, CircuitOpenError):
+            return False
+        names = {klass.__name__ for klass in type(err).__mro__}
+        return any(name in names for name in self.retry_on)
+
+    def delay(self, attempt):
+        """Returns the seconds to wait after the given failed attempt (1-based)."""
+        delay = min(self.backoff * self.multiplier ** (attempt - 1), self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an endpoint keeps failing.
+
+    The breaker opens after `failure_threshold` consecutive failures. While
+    open, calls raise CircuitOpenError without reaching the endpoint. After
+    `reset_timeout` seconds a single trial call is let through: success closes
+    the breaker again, failure re-opens it.
+
+    Attributes:
+        endpoint (str): The endpoint guarded by this breaker.
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds the breaker stays open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, endpoint, failure_threshold=5, reset_timeout=30.0):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self):
+        """Raises CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+        raise CircuitOpenError(f"Circuit breaker for '{self.endpoint}' is open")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def abandon(self):
+        """Releases the trial call of a half open breaker that was cancelled."""
+        with self._lock:
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker(endpoint, **settings):
+    """
+    Returns the process wide CircuitBreaker of an endpoint, creating it with
+    the given settings on first use.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = _breakers[endpoint] = CircuitBreaker(endpoint, **settings)
+        return breaker
+
+
+def agent_endpoint(agent):
+    """Returns the key of the endpoint an agent talks to."""
+    url = getattr(agent, "agent_url", None)
+    if url:
+        return url
+    framework = getattr(agent, "agent_framework", None)
+    model = getattr(agent, "agent_model", None)
+    return f"{framework}:{model}"
+
+
+def resilient(run_func, policy=None, breaker=None):
+    """
+    Wraps an async agent `run` with a retry policy and a circuit breaker.
+
+    Args:
+        run_func: The async function to wrap.
+        policy (RetryPolicy): How failed calls are retried, if at all.
+        breaker (CircuitBreaker): The breaker of the endpoint, if any.
+    Returns:
+        The wrapped async function.
+    """
+    if policy is None and breaker is None:
+        return run_func
+    attempts = policy.max_attempts if policy else 1
+
+    @functools.wraps(run_func)
+    async def wrapper(*args, **kwargs):
+        attempt = 1
+        while True:
+            if breaker:
+                breaker.before_call()
+            try:
+                result = await run_func(*args, **kwargs)
+            except asyncio.CancelledError:
+                if breaker:
+                    breaker.abandon()
+                raise
+            except Exception as err:
+                if breaker:
+                    breaker.record_failure()
+                if attempt >= attempts or not policy.is_retryable(err):
+                    raise
+                await asyncio.sleep(policy.delay(attempt))
+                attempt += 1
+            else:
+                if breaker:
+                    breaker.record_success()
+                return result
+
+    return wrapper
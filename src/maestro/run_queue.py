@@ -0,0 +1,348 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, UTC
+from pathlib import Path
+
+import psutil
+import yaml
+
+from maestro.file_logger import FileLogger, flush_logs
+from maestro.workflow import Workflow
+
+home_path = Path.home()
+if os.access(home_path, os.W_OK):
+    DEFAULT_QUEUE_DB = home_path / ".maestro" / "runs.db"
+else:
+    DEFAULT_QUEUE_DB = Path("./runs.db")
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def _now():
+    return datetime.now(UTC).isoformat()
+
+
+class QueuedRun:
+    """
+    A workflow run taken from the queue.
+
+    Attributes:
+        run_id (str): Key of the run, also the workflow_id of its logs.
+        agents (str): The agents YAML, empty when the workflow needs none.
+        workflow (str): The workflow YAML.
+        prompt (str): The prompt to run with, None for the template prompt.
+    """
+
+    def __init__(self, run_id, agents, workflow, prompt):
+        self.run_id = run_id
+        self.agents = agents
+        self.workflow = workflow
+        self.prompt = prompt
+
+
+class RunQueue:
+    """
+    Durable queue of workflow runs backed by a local SQLite database.
+
+    Runs carry the text of their agent and workflow definitions, so they
+    stay runnable when the files change after submission. Any number of
+    processes can share the database: `claim` hands every queued run to
+    exactly one worker.
+
+    Args:
+        path (str): The database file, defaults to `MAESTRO_QUEUE_DB` or
+            `~/.maestro/runs.db`.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.getenv("MAESTRO_QUEUE_DB", DEFAULT_QUEUE_DB))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # transactions are explicit, so claims can take the write lock up front
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, agents TEXT, workflow TEXT, prompt TEXT, "
+                "status TEXT, worker TEXT, result TEXT, error TEXT, "
+                "submitted_at TEXT, started_at TEXT, finished_at TEXT)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS runs_status ON runs (status, submitted_at)"
+            )
+
+    def submit(self, agents, workflow, prompt=None, run_id=None):
+        """
+        Enqueues a workflow run.
+
+        Args:
+            agents (str): The agents YAML, or None.
+            workflow (str): The workflow YAML.
+            prompt (str): The prompt, defaults to the template prompt.
+            run_id (str): Key of the run, a new one by default.
+        Returns:
+            str: The run_id.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, agents, workflow, prompt, status, "
+                "submitted_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, agents or "", workflow, json.dumps(prompt), QUEUED, _now()),
+            )
+        return run_id
+
+    def claim(self, worker):
+        """
+        Takes the oldest queued run and marks it running.
+
+        Args:
+            worker (str): Identifies the claiming worker, `host:pid`.
+        Returns:
+            QueuedRun: The run, or None when the queue is empty.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT run_id, agents, workflow, prompt FROM runs "
+                    "WHERE status = ? ORDER BY submitted_at, rowid LIMIT 1",
+                    (QUEUED,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE runs SET status = ?, worker = ?, started_at = ? "
+                        "WHERE run_id = ?",
+                        (RUNNING, worker, _now(), row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return QueuedRun(row[0], row[1], row[2], json.loads(row[3]))
+
+    def finish(self, run_id, result=None, error=None):
+        """Records the result of a run, or its error."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, result = ?, error = ?, finished_at = ? "
+                "WHERE run_id = ?",
+                (
+                    FAILED if error is not None else SUCCEEDED,
+                    json.dumps(result, default=str),
+                    error,
+                    _now(),
+                    run_id,
+                ),
+            )
+
+    def get(self, run_id):
+        """
+        Returns the state of a run as a dict with `run_id`, `status`,
+        `worker`, `result`, `error` and its timestamps, or None.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT run_id, status, worker, result, error, submitted_at, "
+                "started_at, finished_at FROM runs WHERE run_id = ?",
+                (run_id,),
+            )
+            row = cursor.fetchone()
+            names = [column[0] for column in cursor.description]
+        if row is None:
+            return None
+        run = dict(zip(names, row))
+        run["result"] = json.loads(run["result"]) if run["result"] else None
+        return run
+
+    def counts(self):
+        """Returns the number of runs by status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM runs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def requeue_orphaned(self):
+        """
+        Queues again the runs left running by workers of this host that are
+        gone, e.g. after a crash.
+
+        Returns:
+            int: The number of runs queued again.
+        """
+        host = socket.gethostname()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT run_id, worker FROM runs WHERE status = ?", (RUNNING,)
+            ).fetchall()
+            orphaned = []
+            for run_id, worker in rows:
+                worker_host, _, pid = (worker or "").rpartition(":")
+                if worker_host == host and not psutil.pid_exists(int(pid or 0)):
+                    orphaned.append((QUEUED, run_id))
+            self._conn.executemany(
+                "UPDATE runs SET status = ?, worker = NULL, started_at = NULL "
+                "WHERE run_id = ?",
+                orphaned,
+            )
+        return len(orphaned)
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Worker:
+    """
+    Runs the workflows of a RunQueue in the current process.
+
+    Runs share the event loop of the worker, and with it its agent pool, so
+    agents are built once per worker rather than once per run.
+
+    Args:
+        queue (RunQueue): The queue to take runs from.
+        concurrency (int): Runs executed at a time.
+        poll_interval (float): Seconds between polls of an empty queue.
+        drain (bool): Stop once the queue is empty instead of waiting for
+            more runs.
+    """
+
+    def __init__(
+        self, queue, concurrency=1, poll_interval=DEFAULT_POLL_INTERVAL, drain=False
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.drain = drain
+        self.name = worker_name()
+
+    async def execute(self, run):
+        """Runs one queued run and records its result."""
+        try:
+            agent_defs = [d for d in yaml.safe_load_all(run.agents) if d]
+            workflow_defs = [d for d in yaml.safe_load_all(run.workflow) if d]
+            workflow = Workflow(
+                agent_defs=agent_defs,
+                workflow=workflow_defs[0],
+                workflow_id=run.run_id,
+                logger=FileLogger(),
+            )
+            result = await workflow.run(run.prompt or "")
+        except Exception as err:
+            await asyncio.to_thread(self.queue.finish, run.run_id, error=str(err))
+        else:
+            await asyncio.to_thread(self.queue.finish, run.run_id, result=result)
+
+    async def run(self):
+        """
+        Takes and executes runs until stopped, or until the queue is empty
+        when draining.
+        """
+        running = set()
+        while True:
+            while len(running) < self.concurrency:
+                run = await asyncio.to_thread(self.queue.claim, self.name)
+                if run is None:
+                    break
+                task = asyncio.create_task(self.execute(run))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            if not running:
+                if self.drain:
+                    return
+                await asyncio.sleep(self.poll_interval)
+            else:
+                await asyncio.wait(
+                    running,
+                    timeout=self.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+
+def _worker_main(path, concurrency, poll_interval, drain):
+    queue = RunQueue(path)
+    try:
+        asyncio.run(Worker(queue, concurrency, poll_interval, drain).run())
+    finally:
+        queue.close()
+        # worker processes exit without running atexit handlers
+        flush_logs()
+
+
+def run_workers(
+    path=None,
+    processes=None,
+    concurrency=1,
+    poll_interval=DEFAULT_POLL_INTERVAL,
+    drain=False,
+):
+    """
+    Executes the runs of a RunQueue on a pool of worker processes.
+
+    Every process runs a Worker with its own event loop, so CPU bound work
+    such as parsing definitions and code agents is spread over the cores.
+    Runs left behind by crashed workers of this host are queued again first.
+
+    Args:
+        path (str): The queue database, see RunQueue.
+        processes (int): Worker processes, defaults to the number of CPUs.
+        concurrency (int): Runs executed at a time by every process.
+        poll_interval (float): Seconds between polls of an empty queue.
+        drain (bool): Stop once the queue is empty.
+    Returns:
+        int: The number of worker processes that failed.
+    """
+    queue = RunQueue(path)
+    try:
+        queue.requeue_orphaned()
+    finally:
+        queue.close()
+
+    # spawned workers do not inherit the threads and event loop of this process
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(
+            target=_worker_main,
+            args=(path, concurrency, poll_interval, drain),
+            name=f"maestro-worker-{index}",
+        )
+        for index in range(processes or os.cpu_count() or 1)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+    return sum(1 for worker in workers if worker.exitcode)
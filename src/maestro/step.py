@@ -2,19 +2,63 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import asyncio
-import requests
 import re
-import json
 from dotenv import load_dotenv
-from maestro.utils import eval_expression, convert_to_list
+from maestro.cache import cache_key
+from maestro.resilience import RetryPolicy, resilient
+from maestro.subworkflow import run_subworkflow
+from maestro.utils import as_list, eval_expression, prompt_text
 
 load_dotenv()
 
+_MISSING = object()
 
-def strip_think_tags(text: str) -> str:
-    if not isinstance(text, str):
-        return text
-    return re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL).strip()
+LOOP_ON_ERROR = ("fail", "skip", "retry")
+PARALLEL_MODES = ("all", "first", "quorum")
+PARALLEL_ON_ERROR = ("fail", "collect")
+
+
+def strip_think_tags(value):
+    """
+    Removes `<think>` spans from a text, or from the texts within a list or
+    dict result such as the output of a parallel step or a list loop.
+    """
+    if isinstance(value, list):
+        return [strip_think_tags(item) for item in value]
+    if isinstance(value, dict):
+        return {key: strip_think_tags(item) for key, item in value.items()}
+    if not isinstance(value, str):
+        return value
+    return re.sub(r"<think>.*?</think>", "", value, flags=re.DOTALL).strip()
+
+
+def min_timeout(*timeouts):
+    """Returns the smallest of the given timeouts, ignoring None."""
+    limits = [t for t in timeouts if t is not None]
+    return max(min(limits), 0) if limits else None
+
+
+async def call_agent(agent, *args, **kwargs):
+    """
+    Runs an agent, enforcing the `timeout` of its definition if it has one.
+
+    Values passed between steps are converted to prompt text here, unless
+    the agent works on native values.
+    """
+    if not getattr(agent, "accepts_values", False):
+        args = tuple(prompt_text(arg) for arg in args)
+    timeout = getattr(agent, "agent_timeout", None)
+    if timeout is None:
+        return await agent.run(*args, **kwargs)
+    try:
+        async with asyncio.timeout(timeout) as scope:
+            return await agent.run(*args, **kwargs)
+    except TimeoutError as err:
+        if not scope.expired():
+            raise
+        raise TimeoutError(
+            f"Agent '{agent.agent_name}' timed out after {timeout:g} seconds"
+        ) from err
 
 
 class Step:
@@ -27,23 +71,86 @@ class Step:
         step_input (dict): The input/template config for this step.
         step_condition (list): The conditional branches for this step.
         step_parallel (list): List of Agents to run in parallel.
+        parallel_mode (str): `all`, `first` or `quorum`, see `parallel`.
+        parallel_quorum (int): Successes needed in `quorum` mode.
+        parallel_concurrency (int): Agents run at a time, if limited.
+        parallel_on_error (str): `fail` or `collect`, see `parallel`.
         step_loop (dict): Loop configuration for this step.
+        step_cache (dict): Cache settings for this step, e.g. `{"ttl": 3600}`.
+        result_cache (StepCache): Where agent results are memoized when
+            `step_cache` is set.
+        step_timeout (float): Seconds the step may take, if limited.
+        step_retry (RetryPolicy): How failed agent calls of the step are retried.
+        loop_retry (RetryPolicy): How failed list items of the loop are retried,
+            when its `on_error` is `retry`.
     """
 
-    def __init__(self, step):
+    def __init__(self, step, result_cache=None):
         self.step_name = step["name"]
         self.step_agent = step.get("agent")
         self.step_workflow = step.get("workflow")
         self.step_input = step.get("input")
         self.step_condition = step.get("condition")
         self.step_parallel = step.get("parallel")
+        self.parallel_mode = "all"
+        self.parallel_quorum = None
+        self.parallel_concurrency = None
+        self.parallel_on_error = "fail"
+        if isinstance(self.step_parallel, dict):
+            self._parallel_options(self.step_parallel)
         self.step_loop = step.get("loop")
+        self.step_cache = step.get("cache")
+        self.result_cache = result_cache
+        self.step_timeout = step.get("timeout")
+        self.step_retry = (
+            RetryPolicy.from_dict(step["retry"]) if step.get("retry") else None
+        )
+        self.loop_retry = None
+        if self.step_loop:
+            on_error = self.step_loop.get("on_error", "fail")
+            if on_error not in LOOP_ON_ERROR:
+                raise ValueError(
+                    f"Step '{self.step_name}' has an unknown loop on_error '{on_error}'"
+                )
+            if on_error == "retry":
+                self.loop_retry = RetryPolicy.from_dict(
+                    self.step_loop.get("retry") or {}
+                )
+
+    def _parallel_options(self, options):
+        agents = list(options.get("agents") or [])
+        self.step_parallel = agents
+        self.parallel_mode = options.get("mode", "all")
+        self.parallel_concurrency = options.get("concurrency")
+        self.parallel_on_error = options.get("on_error", "fail")
+        if self.parallel_mode not in PARALLEL_MODES:
+            raise ValueError(
+                f"Step '{self.step_name}' has an unknown parallel mode "
+                f"'{self.parallel_mode}'"
+            )
+        if self.parallel_on_error not in PARALLEL_ON_ERROR:
+            raise ValueError(
+                f"Step '{self.step_name}' has an unknown parallel on_error "
+                f"'{self.parallel_on_error}'"
+            )
+        if self.parallel_mode == "quorum":
+            self.parallel_quorum = options.get("quorum")
+            if not isinstance(self.parallel_quorum, int) or not (
+                1 <= self.parallel_quorum <= len(agents)
+            ):
+                raise ValueError(
+                    f"Step '{self.step_name}' needs a quorum between 1 and "
+                    f"{len(agents)}"
+                )
 
-    async def run(self, *args, context=None, step_index=None):
+    async def run(self, *args, context=None, step_index=None, timeout=None):
         """
         Runs the step, passing along any number of positional arguments
         (from the workflow's `inputs:`), plus an optional `context=`.
 
+        `timeout` is the time remaining until the workflow deadline. The step
+        is cancelled with a TimeoutError when it or its own `timeout` expires.
+
         Returns always a dict with at least {"prompt": ...} so downstream logic stays the same.
         """
         if args and isinstance(args[-1], dict):
@@ -53,21 +160,34 @@ class Step:
                 context = maybe_kwargs.get("context")
                 step_index = maybe_kwargs.get("step_index")
 
+        limit = min_timeout(self.step_timeout, timeout)
+        if limit is None:
+            return await self._run(args, context, step_index, None)
+        try:
+            async with asyncio.timeout(limit) as scope:
+                return await self._run(args, context, step_index, limit)
+        except TimeoutError as err:
+            if not scope.expired():
+                raise
+            raise TimeoutError(
+                f"Step '{self.step_name}' timed out after {limit:g} seconds"
+            ) from err
+
+    async def _run(self, args, context, step_index, timeout):
         if self.step_agent:
-            if context is None:
-                res = await self.step_agent.run(*args, step_index=step_index)
-            else:
-                res = await self.step_agent.run(
-                    *args, context=context, step_index=step_index
-                )
+            res = await self.run_agent(*args, context=context, step_index=step_index)
         elif self.step_workflow:
             if context is None:
                 res = await self.run_workflow(
-                    self.step_workflow, *args, step_index=step_index
+                    self.step_workflow, *args, step_index=step_index, timeout=timeout
                 )
             else:
                 res = await self.run_workflow(
-                    self.step_workflow, *args, context=context, step_index=step_index
+                    self.step_workflow,
+                    *args,
+                    context=context,
+                    step_index=step_index,
+                    timeout=timeout,
                 )
         else:
             res = args[-1] if args else ""
@@ -96,13 +216,35 @@ class Step:
         output["prompt"] = strip_think_tags(output["prompt"])
         return output
 
-    async def run_workflow(self, url, *args, context=None, step_index=None):
-        response = requests.post(url + "/chat", json={"prompt": str(args)})
-        if response.status_code != 200:
-            raise ValueError(response.text)
-        response_dict = json.loads(response.text)
-        message = response_dict.get("response")
-        return {"prompt": message}
+    async def run_agent(self, *args, context=None, step_index=None):
+        """
+        Runs the step's agent, memoizing the result when caching is enabled.
+
+        The cache key covers the agent definition and the arguments, so
+        changing the model, instructions or tools invalidates the entry.
+        """
+        key = None
+        if self.step_cache is not None and self.result_cache is not None:
+            key = cache_key(self.step_agent, (args, context))
+            res = self.result_cache.get(key, _MISSING)
+            if res is not _MISSING:
+                return res
+
+        kwargs = {"step_index": step_index}
+        if context is not None:
+            kwargs["context"] = context
+        res = await resilient(call_agent, policy=self.step_retry)(
+            self.step_agent, *args, **kwargs
+        )
+
+        if key is not None:
+            self.result_cache.set(key, res, ttl=self.step_cache.get("ttl"))
+        return res
+
+    async def run_workflow(
+        self, url, *args, context=None, step_index=None, timeout=None
+    ):
+        return await run_subworkflow(url, *args, timeout=timeout)
 
     def evaluate_condition(self, prompt):
         if self.step_condition[0].get("if"):
@@ -138,41 +280,137 @@ class Step:
 
     async def parallel(self, prompt, step_index=None):
         """
-        This function runs multiple agents in parallel and returns the results as a string.
+        This function runs multiple agents in parallel and returns their results.
+
+        When the input is a list, each agent gets the item at its position,
+        otherwise every agent gets the same input.
+
+        In `all` mode every agent runs. A failure fails the step and cancels
+        the other agents, unless `on_error` is `collect`, which puts an
+        `{"error": ...}` entry in place of the result of every failed agent,
+        even when all of them failed.
+        In `first` mode the first successful result is returned, and in
+        `quorum` mode the first `quorum` successful results. The agents still
+        running are then cancelled. These modes only fail once too many agents
+        failed to succeed. At most `concurrency` agents run at a time.
 
         Args:
             prompt (str): The input prompt for the agents to run.
 
         Returns:
-            str: The results of running the agents in parallel as a string.
+            list: The results of the agents, or the single result in `first`
+                mode.
         """
-        if "[" in prompt:
-            args = convert_to_list(prompt)
-            tasks = [
-                asyncio.create_task(agent.run(args[idx], step_index=step_index))
-                for idx, agent in enumerate(self.step_parallel)
+        items = as_list(prompt)
+        if items is not None:
+            calls = [
+                (agent, items[idx]) for idx, agent in enumerate(self.step_parallel)
             ]
         else:
-            tasks = [
-                asyncio.create_task(agent.run(prompt, step_index=step_index))
-                for agent in self.step_parallel
-            ]
+            calls = [(agent, prompt) for agent in self.step_parallel]
+
+        needed = {
+            "all": len(calls),
+            "first": 1,
+            "quorum": self.parallel_quorum,
+        }[self.parallel_mode]
+        if self.parallel_mode == "all":
+            # collect records every failure, even when no agent succeeds
+            tolerated = 0 if self.parallel_on_error == "fail" else len(calls)
+        else:
+            tolerated = len(calls) - needed
+        semaphore = asyncio.Semaphore(self.parallel_concurrency or len(calls) or 1)
+
+        async def run_one(agent, arg):
+            async with semaphore:
+                return await call_agent(agent, arg, step_index=step_index)
+
+        tasks = [asyncio.create_task(run_one(agent, arg)) for agent, arg in calls]
+        results = {}
+        errors = {}
+        pending = set(tasks)
+        try:
+            while pending and len(results) < needed:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # keep the agent order within a batch of completions
+                for task in sorted(done, key=tasks.index):
+                    if task.exception() is not None:
+                        errors[task] = task.exception()
+                    else:
+                        results[task] = task.result()
+                if len(errors) > tolerated:
+                    raise next(iter(errors.values()))
+        finally:
+            # a failure, timeout or cancellation stops the siblings as well
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
-        results = await asyncio.gather(*tasks)
-        return str(results)
+        if self.parallel_mode == "first":
+            return next(iter(results.values()))
+        if self.parallel_mode == "quorum":
+            return [results[task] for task in tasks if task in results][:needed]
+        return [
+            results[task] if task in results else {"error": str(errors[task])}
+            for task in tasks
+        ]
+
+    async def loop_items(self, agent, items, step_index=None):
+        """
+        Runs the loop agent once per list item.
+
+        Up to `concurrency` items run at a time. A failed item fails the step
+        and cancels the other items, unless `on_error` is `skip`, which drops
+        it from the results, or `retry`, which retries it first.
+
+        Args:
+            agent: The loop agent.
+            items (list): The list items.
+        Returns:
+            list: The results, in input order unless `ordered` is false.
+        """
+        concurrency = self.step_loop.get("concurrency", 1)
+        ordered = self.step_loop.get("ordered", True)
+        skip = self.step_loop.get("on_error", "fail") == "skip"
+        run_item = resilient(call_agent, policy=self.loop_retry)
+        semaphore = asyncio.Semaphore(concurrency)
+        results = [_MISSING] * len(items) if ordered else []
+
+        async def run_one(idx, item):
+            async with semaphore:
+                try:
+                    result = await run_item(agent, item, step_index=step_index)
+                except Exception:
+                    if not skip:
+                        raise
+                    return
+            if ordered:
+                results[idx] = result
+            else:
+                results.append(result)
+
+        tasks = [
+            asyncio.create_task(run_one(idx, item)) for idx, item in enumerate(items)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [result for result in results if result is not _MISSING]
 
     async def loop(self, prompt, step_index=None):
         until = self.step_loop.get("until")
         agent = self.step_loop["agent"]
-        prompt = str(prompt)
-        if "[" in prompt:
-            args = convert_to_list(prompt)
-            results = []
-            for arg in args:
-                result = await agent.run(arg, step_index=step_index)
-                results.append(result)
-            return str(results)
+        items = as_list(prompt)
+        if items is not None:
+            return await self.loop_items(agent, items, step_index=step_index)
         while True:
-            prompt = await agent.run(prompt, step_index=step_index)
+            prompt = await call_agent(agent, prompt, step_index=step_index)
             if eval_expression(until, prompt):
                 return prompt
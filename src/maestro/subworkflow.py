@@ -0,0 +1,137 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import os
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+DEFAULT_HTTP_TIMEOUT = 300.0
+
+# workflows registered by this process, keyed by the URL they are served at
+_local_workflows = {}
+_local_lock = threading.Lock()
+# one client per event loop, since a client cannot be shared between loops
+_clients = weakref.WeakKeyDictionary()
+# the tasks closing the clients of the loops when they shut down
+_closers = weakref.WeakKeyDictionary()
+
+_LOOPBACK_HOSTS = {"localhost", "0.0.0.0", "127.0.0.1"}
+
+
+def _normalize(url):
+    return url.rstrip("/")
+
+
+def _registry_key(url):
+    # a server bound to any loopback address is reachable through all of them
+    parts = urlsplit(_normalize(url))
+    host = parts.hostname or ""
+    if host in _LOOPBACK_HOSTS:
+        host = "127.0.0.1"
+    return f"{parts.scheme}://{host}:{parts.port or ''}{parts.path}"
+
+
+def register_workflow(url, workflow):
+    """
+    Makes a loaded workflow reachable in-process under the URL it is served at.
+
+    Sub-workflow steps whose URL matches run it directly instead of going
+    through HTTP. Programs hosting several workflows in one process register
+    each of them; `maestro serve` registers only the workflow it serves.
+
+    Args:
+        url (str): The base URL of the workflow, e.g. `http://127.0.0.1:8000`.
+        workflow (Workflow): The loaded workflow.
+    """
+    with _local_lock:
+        _local_workflows[_registry_key(url)] = workflow
+
+
+def unregister_workflow(url):
+    with _local_lock:
+        _local_workflows.pop(_registry_key(url), None)
+
+
+def local_workflow(url):
+    """Returns the workflow this process serves at `url`, or None."""
+    with _local_lock:
+        return _local_workflows.get(_registry_key(url))
+
+
+def http_client():
+    """
+    Returns the shared HTTP client of the running event loop.
+
+    The client keeps connections alive between calls and is closed when the
+    event loop shuts down, e.g. at the end of `asyncio.run`. Its limits and default
+    timeout come from `MAESTRO_HTTP_MAX_CONNECTIONS`,
+    `MAESTRO_HTTP_MAX_KEEPALIVE` and `MAESTRO_HTTP_TIMEOUT`.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_connections=int(
+                os.getenv("MAESTRO_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+            ),
+            max_keepalive_connections=int(
+                os.getenv("MAESTRO_HTTP_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE)
+            ),
+        )
+        timeout = float(os.getenv("MAESTRO_HTTP_TIMEOUT", DEFAULT_HTTP_TIMEOUT))
+        client = _clients[loop] = httpx.AsyncClient(limits=limits, timeout=timeout)
+        closer = _closers.get(loop)
+        if closer is not None:
+            # the client it waits to close was closed already
+            closer.cancel()
+        _closers[loop] = loop.create_task(_close_on_shutdown(loop, client))
+    return client
+
+
+async def _close_on_shutdown(loop, client):
+    # asyncio.run cancels the tasks left pending once its main coroutine
+    # returns, so the client is closed before its event loop is
+    try:
+        await asyncio.Future()
+    finally:
+        await client.aclose()
+        # the task refers to the loop, drop it so the loop can be collected
+        if _clients.get(loop) is client:
+            del _clients[loop]
+        if _closers.get(loop) is asyncio.current_task():
+            del _closers[loop]
+
+
+async def run_subworkflow(url, *args, timeout=None):
+    """
+    Runs the workflow served at `url`.
+
+    A workflow loaded by this process runs in-process with the arguments as
+    they are and returns its result dict as the prompt. Any other URL is
+    called over HTTP with the shared client, as `POST {url}/chat`.
+
+    Args:
+        url (str): The base URL of the workflow.
+        args: The inputs of the step.
+        timeout (float): Seconds the sub-workflow may take, if limited.
+    Returns:
+        dict: The step output, `{"prompt": ...}`.
+    """
+    workflow = local_workflow(url)
+    if workflow is not None:
+        prompt = args[0] if len(args) == 1 else list(args)
+        return {"prompt": await workflow.run(prompt, timeout=timeout)}
+
+    kwargs = {} if timeout is None else {"timeout": timeout}
+    response = await http_client().post(
+        _normalize(url) + "/chat", json={"prompt": str(args)}, **kwargs
+    )
+    if response.status_code != 200:
+        raise ValueError(response.text)
+    return {"prompt": response.json().get("response")}
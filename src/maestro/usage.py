@@ -0,0 +1,201 @@
+#! /usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0
+
+import contextlib
+import contextvars
+import threading
+
+# usage of the agent call running in the current task, set by log_agent_run
+_call_usage = contextvars.ContextVar("maestro_call_usage", default=None)
+# usage of the workflow run of the current task, set by Workflow.run
+_run_usage = contextvars.ContextVar("maestro_run_usage", default=None)
+
+
+def _field(source, *names):
+    for name in names:
+        if isinstance(source, dict):
+            value = source.get(name)
+        else:
+            value = getattr(source, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """
+    Returns the estimated cost in USD of a call, or None for unknown models.
+
+    Prices come from the LiteLLM model cost map.
+    """
+    if not model:
+        return None
+    try:
+        import litellm
+
+        prompt_cost, completion_cost = litellm.cost_per_token(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+    except Exception:
+        return None
+    return prompt_cost + completion_cost
+
+
+class Usage:
+    """
+    Token usage and estimated cost of one or more model requests.
+
+    Attributes:
+        requests (int): Number of model requests.
+        prompt_tokens (int): Input tokens.
+        completion_tokens (int): Output tokens.
+        cached_tokens (int): Input tokens served from the provider's cache.
+        cost (float): Estimated cost in USD, None when no price is known.
+    """
+
+    def __init__(
+        self,
+        requests=0,
+        prompt_tokens=0,
+        completion_tokens=0,
+        cached_tokens=0,
+        cost=None,
+    ):
+        self.requests = requests
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cached_tokens = cached_tokens
+        self.cost = cost
+
+    @classmethod
+    def from_response(cls, usage):
+        """
+        Reads the usage reported by a model backend.
+
+        Accepts both the `prompt_tokens`/`completion_tokens` naming of
+        OpenAI compatible chat completions, LiteLLM and BeeAI, and the
+        `input_tokens`/`output_tokens` naming of the OpenAI Agents SDK and
+        the responses API, as objects or dicts.
+        """
+        details = _field(usage, "prompt_tokens_details", "input_tokens_details")
+        return cls(
+            requests=_field(usage, "requests") or 1,
+            prompt_tokens=_field(usage, "prompt_tokens", "input_tokens") or 0,
+            completion_tokens=_field(usage, "completion_tokens", "output_tokens") or 0,
+            cached_tokens=_field(details or {}, "cached_tokens") or 0,
+        )
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def empty(self):
+        return self.requests == 0
+
+    def add(self, other):
+        """Adds the usage of `other` to this one."""
+        self.requests += other.requests
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        if other.cost is not None:
+            self.cost = (self.cost or 0) + other.cost
+        return self
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": self.total_tokens,
+            "cost": self.cost,
+        }
+
+
+def record_usage(usage, model=None):
+    """
+    Records the usage a model backend reported for the current agent call.
+
+    Agents call this with the usage object of every response. Outside of a
+    call wrapped by the workflow, nothing is recorded.
+
+    Args:
+        usage: The usage object or dict of the response, or None.
+        model (str): The model the cost is estimated for.
+    """
+    current = _call_usage.get()
+    if current is None or usage is None:
+        return
+    if not isinstance(usage, Usage):
+        usage = Usage.from_response(usage)
+    if usage.cost is None:
+        usage.cost = estimate_cost(model, usage.prompt_tokens, usage.completion_tokens)
+    current.add(usage)
+
+
+@contextlib.contextmanager
+def collect_usage():
+    """Collects the usage recorded in the current context into a new Usage."""
+    usage = Usage()
+    token = _call_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _call_usage.reset(token)
+
+
+class RunUsage:
+    """
+    Usage of a workflow run, in total and per step and agent.
+
+    Attributes:
+        total (Usage): Usage of the whole run.
+        steps (dict): Step name -> Usage.
+        agents (dict): Agent name -> Usage.
+    """
+
+    def __init__(self):
+        self.total = Usage()
+        self.steps = {}
+        self.agents = {}
+        self._lock = threading.Lock()
+
+    @property
+    def empty(self):
+        return self.total.empty
+
+    def add(self, step_name, agent_name, usage):
+        """Adds the usage of one agent call made by a step."""
+        if usage.empty:
+            return
+        with self._lock:
+            self.total.add(usage)
+            if step_name is not None:
+                self.steps.setdefault(step_name, Usage()).add(usage)
+            self.agents.setdefault(agent_name, Usage()).add(usage)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "total": self.total.to_dict(),
+                "steps": {name: u.to_dict() for name, u in self.steps.items()},
+                "agents": {name: u.to_dict() for name, u in self.agents.items()},
+            }
+
+
+def set_run_usage(run_usage):
+    """Accounts the agent calls of the current context to `run_usage`."""
+    return _run_usage.set(run_usage)
+
+
+def reset_run_usage(token):
+    _run_usage.reset(token)
+
+
+def run_usage():
+    """Returns the RunUsage of the workflow run of the current context."""
+    return _run_usage.get()
@@ -1,19 +1,189 @@
 #! /usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0
 
+import ast
+import builtins
+import functools
+import json
+import re
+
+
+_SAFE_BUILTINS = {
+    name: getattr(builtins, name)
+    for name in (
+        "abs",
+        "all",
+        "any",
+        "bool",
+        "dict",
+        "enumerate",
+        "float",
+        "int",
+        "isinstance",
+        "len",
+        "list",
+        "max",
+        "min",
+        "range",
+        "round",
+        "set",
+        "sorted",
+        "str",
+        "sum",
+        "tuple",
+        "zip",
+    )
+}
+# str.format can reach attributes that the expression itself may not name
+_BLOCKED_ATTRIBUTES = {"format", "format_map"}
+# frame and traceback attributes of generators, coroutines and tracebacks
+_BLOCKED_ATTRIBUTE_PREFIXES = ("_", "gi_", "cr_", "ag_", "f_", "tb_")
+
+# expressions are made of these nodes only, so they cannot define functions,
+# open new scopes with comprehensions or bind names with `:=`
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.boolop,
+    ast.UnaryOp,
+    ast.unaryop,
+    ast.BinOp,
+    ast.operator,
+    ast.Compare,
+    ast.cmpop,
+    ast.IfExp,
+    ast.Call,
+    ast.keyword,
+    ast.Starred,
+    ast.Attribute,
+    ast.Subscript,
+    ast.Slice,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.List,
+    ast.Tuple,
+    ast.Set,
+    ast.Dict,
+)
+
+_JSONPATH_TOKEN = re.compile(
+    r"\.(\w+)|\.\*|\[\*\]|\[(-?\d+)\]|\['([^']*)'\]|\[\"([^\"]*)\"\]"
+)
+
+
+def match(pattern, value):
+    """Returns whether the regular expression `pattern` is found in `value`."""
+    return re.search(pattern, prompt_text(value)) is not None
+
+
+def jsonpath(value, path):
+    """
+    Returns the values at a JSONPath in a value.
+
+    Supports the `$`, `.key`, `['key']`, `[index]`, `[*]` and `.*` steps.
+    A string value is parsed as JSON first.
+
+    Args:
+        value: A dict, list or JSON text.
+        path (str): The path, e.g. `$.items[*].name`.
+    Returns:
+        list: The matching values, empty when nothing matches.
+    """
+    if isinstance(value, (str, bytes)):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    if not path.startswith("$"):
+        raise ValueError(f"JSONPath '{path}' must start with '$'")
+    current = [value]
+    position = 1
+    while position < len(path):
+        token = _JSONPATH_TOKEN.match(path, position)
+        if token is None:
+            raise ValueError(f"Unsupported JSONPath '{path}'")
+        position = token.end()
+        key, index, quoted, double_quoted = token.groups()
+        key = key or quoted or double_quoted
+        found = []
+        for node in current:
+            if key is not None:
+                if isinstance(node, dict) and key in node:
+                    found.append(node[key])
+            elif index is not None:
+                if isinstance(node, list) and -len(node) <= int(index) < len(node):
+                    found.append(node[int(index)])
+            elif isinstance(node, dict):
+                found.extend(node.values())
+            elif isinstance(node, list):
+                found.extend(node)
+        current = found
+    return current
+
+
+_HELPERS = {"match": match, "jsonpath": jsonpath}
+
+
+def _check_expression(expression, tree):
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            name = type(node).__name__
+        elif isinstance(node, ast.Attribute) and (
+            node.attr.startswith(_BLOCKED_ATTRIBUTE_PREFIXES)
+            or node.attr in _BLOCKED_ATTRIBUTES
+        ):
+            name = node.attr
+        elif isinstance(node, ast.Name) and node.id.startswith("_"):
+            name = node.id
+        else:
+            continue
+        raise ValueError(f"Expression '{expression}' may not use '{name}'")
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_expression(expression):
+    """
+    Compile an expression once so it can be evaluated many times.
+
+    Expressions are limited to literals, comparisons, boolean and arithmetic
+    operators, subscripts, calls and public attributes. Lambdas,
+    comprehensions, `:=` and private, dunder or frame attributes are
+    rejected, and names resolve to `input`, the helpers and a small set of
+    builtins only. Compiled code is cached, so the same source is only
+    parsed once per process.
+
+    Args:
+        expression (str): The expression to compile.
+    Returns:
+        The code object for the expression.
+    Raises:
+        ValueError: When the expression uses a construct or name that is not
+            allowed.
+    """
+    tree = ast.parse(expression.strip(), "<expression>", "eval")
+    _check_expression(expression, tree)
+    return compile(tree, "<expression>", "eval")
+
 
 def eval_expression(expression, prompt):
     """
     Evaluate an expression with a given prompt.
 
+    Besides `input`, the expression can use the safe builtins such as
+    `len`, `any` or `int`, and the helpers `match(pattern, value)` and
+    `jsonpath(value, path)`.
+
     Args:
-        expression (str): The expression to evaluate.
+        expression: The expression to evaluate, as a string or compiled code.
         prompt: The value bound to `input` when evaluating.
     Returns:
         The result of evaluating the expression.
     """
-    local = {"input": prompt}
-    return eval(expression, local)
+    if isinstance(expression, str):
+        expression = compile_expression(expression)
+    scope = {"__builtins__": _SAFE_BUILTINS, **_HELPERS, "input": prompt}
+    return eval(expression, scope)
 
 
 def convert_to_list(s):
@@ -21,3 +191,126 @@ def convert_to_list(s):
         raise ValueError("parallel or loop prompt is not a list string")
     result = s[1:-1].split(",")
     return result
+
+
+def as_list(value):
+    """
+    Returns the items of a list value passed between steps.
+
+    Lists and tuples are returned as a list. A string is parsed when it is a
+    list literal such as `["a", "b, c"]`, which keeps items containing
+    commas intact, or else the legacy `[a,b]` form split on commas. Any other
+    value is not a list.
+
+    Args:
+        value: The output of the previous step.
+    Returns:
+        list: The items, or None when the value is not a list.
+    """
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    if not text.startswith("[") or not text.endswith("]"):
+        return None
+    try:
+        items = ast.literal_eval(text)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return convert_to_list(text)
+    return items if isinstance(items, list) else convert_to_list(text)
+
+
+def prompt_text(value):
+    """
+    Converts a value passed between steps to the text of a prompt.
+
+    Strings are returned unchanged, bytes are decoded as UTF-8, and lists
+    and dicts are serialized as JSON.
+
+    Args:
+        value: The value to convert.
+    Returns:
+        str: The prompt text.
+    """
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode("utf-8", errors="replace")
+    if isinstance(value, (list, tuple, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+class ThinkTagFilter:
+    """
+    Removes `<think>...</think>` spans from streamed text as it arrives.
+
+    Feed every delta to `feed`, which returns the part that can be shown
+    right away, and call `flush` when the stream ends. A tag split across
+    deltas is held back until it is complete, and an unclosed think span
+    hides the rest of the stream. Whitespace before the first visible text is
+    dropped, like `strip_think_tags` does for the complete text.
+    """
+
+    OPEN = "<think>"
+    CLOSE = "</think>"
+
+    def __init__(self):
+        self.inside = False
+        self._pending = ""
+        self._strip = True
+
+    def feed(self, delta):
+        """
+        Consumes a delta of the stream.
+
+        Args:
+            delta (str): The next piece of streamed text.
+        Returns:
+            str: The visible text, possibly empty.
+        """
+        text = self._pending + delta
+        self._pending = ""
+        visible = []
+        while text:
+            tag = self.CLOSE if self.inside else self.OPEN
+            idx = text.find(tag)
+            if idx == -1:
+                keep = _partial_tag(text, tag)
+                if not self.inside:
+                    visible.append(text[: len(text) - keep])
+                self._pending = text[len(text) - keep :]
+                break
+            if not self.inside:
+                visible.append(text[:idx])
+            text = text[idx + len(tag) :]
+            self.inside = not self.inside
+        return self._visible(visible)
+
+    def flush(self):
+        """Returns the visible text still held back at the end of the stream."""
+        text, self._pending = self._pending, ""
+        if self.inside:
+            return ""
+        return self._visible([text])
+
+    def _visible(self, pieces):
+        out = []
+        for piece in pieces:
+            if self._strip:
+                piece = piece.lstrip()
+                if piece:
+                    self._strip = False
+            out.append(piece)
+        return "".join(out)
+
+
+def _partial_tag(text, tag):
+    """Returns the length of the longest end of `text` that starts `tag`."""
+    for size in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:size]):
+            return size
+    return 0
@@ -3,22 +3,34 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 IBM
 
+import asyncio
+import functools
 import os
 import time
-import pycron
 from dotenv import load_dotenv
 
+from maestro import events, usage
+from maestro.agent_pool import LazyAgents, agent_pool
+from maestro.cron import cron_ticks
+from maestro.dag import condition_targets
 from maestro.mermaid import Mermaid
-from maestro.step import Step
+from maestro.plan import WorkflowPlan
+from maestro.ratelimit import agent_rate_limiter, limited
+from maestro.resilience import RetryPolicy, agent_endpoint, circuit_breaker, resilient
+from maestro.cache import default_cache
+from maestro.checkpoint import StepRecord
+from maestro.step import Step, call_agent
 from maestro.utils import eval_expression
 
 from maestro.agents.agent_factory import AgentFramework, AgentFactory
-from maestro.agents.agent import save_agent, restore_agent
+from maestro.agents.agent import save_agents, restore_agent
 from maestro.agents.mock_agent import MockAgent
 from maestro.logging_hooks import log_agent_run  # <-- logging decorator
 
 load_dotenv()
 
+DEFAULT_PIPELINE_QUEUE_SIZE = 8
+
 
 def get_agent_class(framework: str, mode="local") -> type:
     if os.getenv("DRY_RUN"):
@@ -27,6 +39,7 @@ def get_agent_class(framework: str, mode="local") -> type:
 
 
 def create_agents(agent_defs):
+    agents = []
     for agent_def in agent_defs:
         agent_def["spec"]["framework"] = agent_def["spec"].get(
             "framework", AgentFramework.BEEAI
@@ -34,18 +47,108 @@ def create_agents(agent_defs):
         cls = get_agent_class(
             agent_def["spec"]["framework"], agent_def["spec"].get("mode")
         )
-        instance = cls(agent_def)
-        save_agent(instance, agent_def)
+        agents.append((cls(agent_def), agent_def))
+    save_agents(agents)
+
+
+def _with_framework(agent_def):
+    """Returns the agent definition with a default framework, leaving it unmodified."""
+    if "framework" in agent_def["spec"]:
+        return agent_def
+    return {
+        **agent_def,
+        "spec": {**agent_def["spec"], "framework": AgentFramework.BEEAI},
+    }
+
+
+class RunResult(dict):
+    """
+    The result of a workflow run: `final_prompt` and the output of every step,
+    keyed by step name.
+
+    Attributes:
+        usage (RunUsage): Token usage and cost of the run, kept apart from the
+            step outputs so no step name is reserved.
+    """
+
+    usage = None
+
+
+class RunContext:
+    """
+    Execution state of a single workflow run.
+
+    A Workflow keeps its definition and compiled plan read-only, and every run
+    works on its own context, so one Workflow can serve overlapping runs.
+
+    Attributes:
+        prompt (str): The initial prompt of the run.
+        agents (dict): Agent instances for this run, keyed by name.
+        steps (dict): Step objects bound to this run's agents, keyed by name.
+        checkpoint (CheckpointStore): Store for completed steps, if any.
+        run_id (str): Key of the run in the checkpoint store.
+        restored (list): StepRecords of a resumed run, in execution order.
+        deadline (float): Event loop time by which the run must finish, if any.
+        usage (RunUsage): Token usage and cost of the run's agent calls.
+    """
+
+    def __init__(
+        self,
+        prompt,
+        agents,
+        checkpoint=None,
+        run_id=None,
+        restored=None,
+        deadline=None,
+    ):
+        self.prompt = prompt
+        self.agents = agents
+        self.steps = {}
+        self.checkpoint = checkpoint
+        self.run_id = run_id
+        self.restored = restored or []
+        self.deadline = deadline
+        self.usage = usage.RunUsage()
+
+    def remaining(self):
+        """Returns the seconds left until the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - asyncio.get_running_loop().time(), 0)
+
+    def record(self, step_index, step_name, result):
+        """Persists a completed step when the run is checkpointed."""
+        if self.checkpoint:
+            self.checkpoint.save_step(
+                self.run_id,
+                StepRecord(
+                    step_index, step_name, result.get("prompt"), result.get("next")
+                ),
+            )
 
 
 class Workflow:
-    def __init__(self, agent_defs=None, workflow=None, workflow_id=None, logger=None):
+    def __init__(
+        self,
+        agent_defs=None,
+        workflow=None,
+        workflow_id=None,
+        logger=None,
+        checkpoint=None,
+        cache=None,
+        pool=None,
+    ):
         self.agents = {}
         self.steps = {}
         self.agent_defs = agent_defs or []
         self.workflow = workflow or {}
         self.workflow_id = workflow_id
         self.logger = logger
+        self.checkpoint = checkpoint
+        self.cache = cache
+        self.pool = pool
+        self.usage = None
+        self._plan = None
 
     def to_mermaid(self, kind="sequenceDiagram", orientation="TD") -> str:
         wf = self.workflow
@@ -53,81 +156,343 @@ class Workflow:
             wf = wf[0]
         return Mermaid(wf, kind, orientation).to_markdown()
 
-    async def run(self, prompt=""):
-        if prompt:
-            self.workflow["spec"]["template"]["prompt"] = prompt
-        self._create_or_restore_agents()
-
+    async def run(self, prompt="", resume=False, timeout=None, run_id=None):
+        """
+        Runs the workflow.
+
+        Each call works on its own RunContext and never modifies the workflow
+        definition, so concurrent calls on the same Workflow are safe.
+
+        When the workflow has a checkpoint store and a workflow_id, the output
+        of every completed step is persisted under the run_id. Concurrent runs
+        sharing a store must use distinct run_ids.
+
+        Args:
+            prompt (str): The prompt to run with, defaults to the template prompt.
+            resume (bool): Continue the checkpointed run of this run_id after
+                its last completed step instead of starting over.
+            timeout (float): Seconds the whole run may take, defaults to the
+                `timeout` of the workflow spec.
+            run_id (str): Key of the run in the checkpoint store, defaults to
+                the workflow_id.
+        Returns:
+            RunResult: The results of the steps plus `final_prompt`, with the
+                token usage of the run as its `usage`.
+        """
         template = self.workflow["spec"]["template"]
+        prompt = prompt or template.get("prompt", "")
+        run_id = run_id or self.workflow_id
+        checkpoint = self.checkpoint if run_id else None
+        restored = []
+        if resume:
+            if not checkpoint:
+                raise ValueError("Resuming requires a checkpoint store and workflow_id")
+            run = checkpoint.get_run(run_id)
+            if run is None:
+                raise ValueError(f"No checkpoint found for '{run_id}'")
+            prompt = run[1]
+            restored = checkpoint.load_steps(run_id)
+        elif checkpoint:
+            checkpoint.delete_run(run_id)
+        if checkpoint:
+            checkpoint.start_run(run_id, self.workflow["metadata"]["name"], prompt)
+
+        if timeout is None:
+            timeout = self.workflow["spec"].get("timeout")
+        deadline = None
+        if timeout is not None:
+            deadline = asyncio.get_running_loop().time() + timeout
+
+        context = RunContext(
+            prompt,
+            self._create_or_restore_agents(),
+            checkpoint=checkpoint,
+            run_id=run_id,
+            restored=restored,
+            deadline=deadline,
+        )
+        usage_token = usage.set_run_usage(context.usage)
         try:
-            if template.get("event"):
-                result = await self._condition()
-                return await self.process_event(result)
-            else:
-                return await self._condition()
+            result = RunResult(await self._execute(context, timeout))
+            result.usage = context.usage
+            if checkpoint:
+                checkpoint.finish_run(run_id, "success")
+            return result
         except Exception as err:
+            if checkpoint:
+                checkpoint.finish_run(run_id, "error")
             exc_def = template.get("exception")
             if exc_def:
                 agent_name = exc_def.get("agent")
-                handler = self.agents.get(agent_name)
+                handler = context.agents.get(agent_name)
                 if handler:
                     await handler.run(err, step_index=-1)
                     return None
             raise err
+        finally:
+            usage.reset_run_usage(usage_token)
+            await self._release_agents(context.agents)
+            # expose the most recent run for callers that inspect it afterwards
+            self.agents = context.agents.built()
+            self.steps = context.steps
+            self.usage = context.usage
+
+    async def run_stream(self, prompt="", resume=False, timeout=None):
+        """
+        Runs the workflow, yielding events as the steps progress.
+
+        Events are dicts with a `type` and a `timestamp`:
+        `step_started`, `token` (an incremental `delta` of agent output),
+        `step_finished` (with `output` and `duration_ms`), `step_failed`,
+        and finally `workflow_done` (with `result`) or `workflow_error`.
+
+        Closing the generator early cancels the run.
+
+        Args:
+            prompt (str): The prompt to run with, defaults to the template prompt.
+            resume (bool): See `run`.
+            timeout (float): See `run`.
+        """
+        queue = asyncio.Queue()
+        done = object()
+        token = events.set_sink(queue.put_nowait)
+        try:
+            # the task copies the current context, and with it the sink
+            task = asyncio.create_task(self.run(prompt, resume, timeout))
+        finally:
+            events.reset_sink(token)
+        task.add_done_callback(lambda _: queue.put_nowait(done))
+        start = time.perf_counter()
+        try:
+            while (event := await queue.get()) is not done:
+                yield event
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            if task.exception() is not None:
+                yield events.make_event(
+                    events.WORKFLOW_ERROR,
+                    error=str(task.exception()),
+                    duration_ms=duration_ms,
+                )
+                raise task.exception()
+            yield events.make_event(
+                events.WORKFLOW_DONE, result=task.result(), duration_ms=duration_ms
+            )
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def run_pipeline(self, prompts, queue_size=DEFAULT_PIPELINE_QUEUE_SIZE):
+        """
+        Runs the workflow over a stream of prompts, one stage per step.
+
+        Every step runs as its own task, connected to the next step by a
+        bounded queue, so step k works on one prompt while step k-1 already
+        works on the next. A full queue holds back the steps before it, and
+        in the end the reading of `prompts`. Only workflows without
+        conditions can run as a pipeline.
+
+        Args:
+            prompts: Iterable or async iterable of prompts, possibly unbounded.
+            queue_size (int): Prompts waiting between two steps at most.
+        Yields:
+            dict: For every prompt in input order, its `index`, the `prompt`
+                and either the `result` of the run or the `error` of the
+                step that failed.
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        plan = self.plan()
+        stages = plan.pipeline_steps()
+        context = RunContext(None, self._create_or_restore_agents())
+        missing = [name for name in plan.agent_names if name not in context.agents]
+        if missing:
+            raise ValueError(f"Could not find agent named '{missing[0]}'")
+        queues = [asyncio.Queue(queue_size) for _ in range(len(stages) + 1)]
+        done = object()
+
+        async def feed():
+            index = 0
+            try:
+                if hasattr(prompts, "__aiter__"):
+                    async for prompt in prompts:
+                        await queues[0].put({"index": index, "prompt": prompt})
+                        index += 1
+                else:
+                    for prompt in prompts:
+                        await queues[0].put({"index": index, "prompt": prompt})
+                        index += 1
+            except Exception:
+                # lets the stages finish the prompts read so far
+                await queues[0].put(done)
+                raise
+            await queues[0].put(done)
+
+        async def stage(step_index, plan_step, step, inbox, outbox):
+            while (item := await inbox.get()) is not done:
+                if "error" not in item:
+                    results = item.setdefault("steps", {})
+                    try:
+                        if plan_step.inputs:
+                            args = self._resolve_inputs(
+                                context, plan.main, plan_step, item["prompt"], results
+                            )
+                        else:
+                            args = [item.get("output", item["prompt"])]
+                        result = await self._run_step(context, step, args, step_index)
+                    except Exception as err:
+                        item["error"] = str(err)
+                    else:
+                        item["output"] = results[plan_step.name] = result.get("prompt")
+                await outbox.put(item)
+            await outbox.put(done)
+
+        tasks = []
+        try:
+            steps = [self._bind_step(context, plan_step) for plan_step in stages]
+            # the tasks copy the current context, and with it the usage accounting
+            usage_token = usage.set_run_usage(context.usage)
+            try:
+                tasks.append(asyncio.create_task(feed()))
+                for idx, plan_step in enumerate(stages):
+                    tasks.append(
+                        asyncio.create_task(
+                            stage(
+                                idx, plan_step, steps[idx], queues[idx], queues[idx + 1]
+                            )
+                        )
+                    )
+            finally:
+                usage.reset_run_usage(usage_token)
+            while (item := await queues[-1].get()) is not done:
+                record = {"index": item["index"], "prompt": item["prompt"]}
+                if "error" in item:
+                    record["error"] = item["error"]
+                else:
+                    record["result"] = {
+                        "final_prompt": item.get("output"),
+                        **item.get("steps", {}),
+                    }
+                yield record
+            # surfaces an error raised while reading the prompts
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._release_agents(context.agents)
+            self.agents = context.agents.built()
+            self.steps = context.steps
+            self.usage = context.usage
+
+    async def _execute(self, context, timeout):
+        try:
+            async with asyncio.timeout_at(context.deadline) as scope:
+                result = await self._run_steps(context)
+                if self.workflow["spec"]["template"].get("event"):
+                    result = await self.process_event(result, context)
+                return result
+        except TimeoutError as err:
+            if not scope.expired():
+                raise
+            raise TimeoutError(
+                f"Workflow '{self.workflow['metadata']['name']}' exceeded its "
+                f"{timeout:g} second deadline"
+            ) from err
+
+    def _agent_pool(self):
+        return self.pool if self.pool is not None else agent_pool()
 
     def _create_or_restore_agents(self):
+        """
+        Returns the agents of a run, created on first use.
+
+        Agents built from a definition come from the agent pool, so their
+        construction is paid once per definition rather than once per run.
+        """
+        pool = self._agent_pool()
+        factories = {}
         if self.agent_defs:
             for agent_def in self.agent_defs:
-                if isinstance(agent_def, str):
-                    instance, restored = restore_agent(agent_def)
-                    if restored:
-                        self.agents[agent_def] = instance
-                        continue
-                    else:
-                        agent_def = instance
-
-                agent_def["spec"]["framework"] = agent_def["spec"].get(
-                    "framework", AgentFramework.BEEAI
+                name = (
+                    agent_def
+                    if isinstance(agent_def, str)
+                    else agent_def["metadata"]["name"]
                 )
-                cls = get_agent_class(
-                    agent_def["spec"]["framework"], agent_def["spec"].get("mode")
+                factories[name] = functools.partial(
+                    self._checkout_defined_agent, pool, agent_def
                 )
-                agent_instance = cls(agent_def)
-
-                agent_name = agent_def["metadata"]["name"]
-                agent_model = agent_def["spec"].get("model", f"code:{agent_name}")
-                agent_instance.agent_name = agent_name
-                agent_instance.agent_model = agent_model
-                bound_method = agent_instance.run.__get__(agent_instance)
-                agent_instance.run = log_agent_run(
-                    self.workflow_id, agent_name, agent_model
-                )(bound_method)
-                self.agents[agent_name] = agent_instance
         else:
             for name in self.workflow["spec"]["template"]["agents"]:
-                instance, restored = restore_agent(name)
-                if restored:
-                    agent_instance = instance
-                else:
-                    agent_def = instance
-                    agent_def["spec"]["framework"] = agent_def["spec"].get(
-                        "framework", AgentFramework.BEEAI
-                    )
-                    cls = get_agent_class(
-                        agent_def["spec"]["framework"], agent_def["spec"].get("mode")
-                    )
-                    agent_instance = cls(agent_def)
+                factories[name] = functools.partial(
+                    self._checkout_template_agent, pool, name
+                )
+        return LazyAgents(factories)
 
-                agent_name = name
-                agent_model = f"code:{name}"
-                agent_instance.agent_name = agent_name
-                agent_instance.agent_model = agent_model
-                bound_method = agent_instance.run.__get__(agent_instance)
-                agent_instance.run = log_agent_run(
-                    self.workflow_id, agent_name, agent_model
-                )(bound_method)
+    def _checkout_defined_agent(self, pool, agent_def):
+        if isinstance(agent_def, str):
+            instance, restored = restore_agent(agent_def)
+            if restored:
+                return instance
+            agent_def = instance
 
-                self.agents[agent_name] = agent_instance
+        agent_def = _with_framework(agent_def)
+        cls = get_agent_class(
+            agent_def["spec"]["framework"], agent_def["spec"].get("mode")
+        )
+        agent_instance = pool.acquire(cls, agent_def)
+
+        agent_name = agent_def["metadata"]["name"]
+        agent_instance.agent_name = agent_name
+        agent_instance.agent_model = agent_def["spec"].get(
+            "model", f"code:{agent_name}"
+        )
+        self._wrap_run(agent_instance)
+        return agent_instance
+
+    def _checkout_template_agent(self, pool, name):
+        instance, restored = restore_agent(name)
+        if restored:
+            agent_instance = instance
+        else:
+            agent_def = _with_framework(instance)
+            cls = get_agent_class(
+                agent_def["spec"]["framework"], agent_def["spec"].get("mode")
+            )
+            agent_instance = pool.acquire(cls, agent_def)
+
+        agent_instance.agent_name = name
+        # the model of the spec still keys the rate limits and circuit breaker
+        # of the agent, the logs only label it
+        self._wrap_run(agent_instance, f"code:{name}")
+        return agent_instance
+
+    async def _release_agents(self, agents):
+        await agents.settle()
+        pool = self._agent_pool()
+        for agent in agents.built().values():
+            # drop the per run wrapper so the next run wraps the agent afresh
+            vars(agent).pop("run", None)
+            pool.release(agent)
+
+    def _wrap_run(self, agent, log_model=None):
+        # every attempt waits for the rate limits of its endpoint and is logged,
+        # retries and the circuit breaker wrap both
+        run = log_agent_run(
+            self.workflow_id, agent.agent_name, log_model or agent.agent_model
+        )(agent.run.__get__(agent))
+        run = limited(run, agent_rate_limiter(agent))
+        retry = getattr(agent, "agent_retry", None)
+        breaker = getattr(agent, "agent_circuit_breaker", None)
+        agent.run = resilient(
+            run,
+            policy=RetryPolicy.from_dict(retry) if retry else None,
+            breaker=(
+                circuit_breaker(agent_endpoint(agent), **breaker)
+                if breaker is not None
+                else None
+            ),
+        )
 
     def find_index(self, steps, name):
         for idx, step in enumerate(steps):
@@ -135,150 +500,283 @@ class Workflow:
                 return idx
         return None
 
-    async def _condition(self):
-        template = self.workflow["spec"]["template"]
-        initial_prompt = template["prompt"]
-        steps = template["steps"]
-        workflows = template.get("workflows")
-        step_defs = {step["name"]: step for step in steps}
-
-        for step in steps:
-            if step.get("agent"):
-                if isinstance(step["agent"], str):
-                    step_name = step["agent"]
-                    step["agent"] = self.agents.get(step_name)
-                    if step["agent"] is None:
-                        raise ValueError(f"Could not find agent named '{step_name}'")
-            if step.get("workflow"):
-                if isinstance(step["workflow"], str):
-                    found = False
-                    for workflow in workflows:
-                        if workflow["name"] == step["workflow"]:
-                            step["workflow"] = workflow["url"]
-                            found = True
-                if not found:
-                    raise RuntimeError("Workflow doesn't exist")
-            if step.get("parallel"):
-                step["parallel"] = [self.agents.get(name) for name in step["parallel"]]
-            if step.get("loop"):
-                loop_def = step["loop"]
-                loop_def["agent"] = self.agents.get(loop_def.get("agent"))
-            self.steps[step["name"]] = Step(step)
+    def plan(self):
+        """
+        Returns the execution plan of the workflow, compiling it on first use.
+
+        The plan is cached on the workflow and reused by every later run.
+        """
+        if self._plan is None:
+            self._plan = WorkflowPlan(self.workflow)
+        return self._plan
+
+    async def _run_steps(self, context):
+        plan = self.plan()
+        missing = [name for name in plan.agent_names if name not in context.agents]
+        if missing:
+            raise ValueError(f"Could not find agent named '{missing[0]}'")
+        if plan.strategy == "dag":
+            return await self._dag(context, plan.main, context.prompt, durable=True)
+        return await self._condition(context, plan.main, context.prompt, durable=True)
+
+    def _bind_step(self, context, plan_step):
+        agents = context.agents
+        step = dict(plan_step.definition)
+        if plan_step.agent:
+            step["agent"] = agents[plan_step.agent]
+        if plan_step.workflow_url:
+            step["workflow"] = plan_step.workflow_url
+        if plan_step.parallel:
+            parallel = [agents.get(name) for name in plan_step.parallel]
+            options = plan_step.definition["parallel"]
+            if isinstance(options, dict):
+                parallel = dict(options, agents=parallel)
+            step["parallel"] = parallel
+        if plan_step.loop:
+            step["loop"] = dict(
+                plan_step.loop, agent=agents.get(plan_step.loop.get("agent"))
+            )
+        if plan_step.condition:
+            step["condition"] = plan_step.condition
+        bound = Step(step, result_cache=self._result_cache(plan_step))
+        context.steps[plan_step.name] = bound
+        return bound
+
+    def _prewarm(self, context, step_plan, plan_step):
+        # create the agents of the steps that may follow while this one runs
+        if self.workflow["spec"].get("prewarm") and hasattr(context.agents, "prewarm"):
+            context.agents.prewarm(step_plan.next_agents(plan_step))
+
+    def _result_cache(self, plan_step):
+        if plan_step.definition.get("cache") is None:
+            return None
+        return self.cache if self.cache is not None else default_cache()
+
+    def _resolve_inputs(
+        self, context, step_plan, plan_step, initial_prompt, step_results
+    ):
+        args = []
+        for kind, value in plan_step.inputs:
+            if kind == "prompt":
+                args.append(initial_prompt)
+            elif kind == "instructions":
+                args.append(context.agents[step_plan.step(value).agent].agent_instr)
+            elif kind == "step" and value in step_results:
+                args.append(step_results[value])
+            else:
+                args.append(value)
+        return args
+
+    async def _run_step(self, context, step, args, step_index):
+        events.emit(events.STEP_STARTED, step=step.step_name, step_index=step_index)
+        start = time.perf_counter()
+        token = events.set_current_step(step.step_name)
+        try:
+            result = await step.run(
+                *args, step_index=step_index, timeout=context.remaining()
+            )
+        except Exception as err:
+            events.emit(
+                events.STEP_FAILED,
+                step=step.step_name,
+                step_index=step_index,
+                error=str(err),
+            )
+            raise
+        finally:
+            events.reset_current_step(token)
+        events.emit(
+            events.STEP_FINISHED,
+            step=step.step_name,
+            step_index=step_index,
+            output=result.get("prompt"),
+            next=result.get("next"),
+            duration_ms=int((time.perf_counter() - start) * 1000),
+        )
+        return result
 
+    def _next_step(self, step_plan, plan_step, result):
+        if "next" in result:
+            return step_plan.step(result["next"])
+        if plan_step.successor is None:
+            return None
+        return step_plan.steps[plan_step.successor]
+
+    async def _condition(self, context, step_plan, prompt, start=None, durable=False):
+        initial_prompt = prompt
+        plan_step = step_plan.step(start) if start else step_plan.steps[0]
+        bound = {}
         step_results = {}
-        current = steps[0]["name"]
-        prompt = initial_prompt
         step_index = 0
 
-        while True:
-            definition = step_defs[current]
-            if definition.get("inputs"):
-                args = []
-                for inp in definition["inputs"]:
-                    src = inp["from"]
-                    if src == "prompt":
-                        args.append(initial_prompt)
-                    elif "instructions:" in src:
-                        args.append(step_defs[src.split(":")[-1]]["agent"].agent_instr)
-                    elif src in step_results:
-                        args.append(step_results[src])
-                    else:
-                        args.append(src)
-                result = await self.steps[current].run(*args, step_index=step_index)
+        if durable:
+            for record in context.restored:
+                prompt = record.output
+                step_results[record.step_name] = prompt
+                step_index = record.step_index + 1
+                plan_step = self._next_step(
+                    step_plan, step_plan.step(record.step_name), record.result()
+                )
+
+        while plan_step is not None:
+            step = bound.get(plan_step.index)
+            if step is None:
+                step = bound[plan_step.index] = self._bind_step(context, plan_step)
+            self._prewarm(context, step_plan, plan_step)
+            if plan_step.inputs:
+                args = self._resolve_inputs(
+                    context, step_plan, plan_step, initial_prompt, step_results
+                )
             else:
-                result = await self.steps[current].run(prompt, step_index=step_index)
+                args = [prompt]
+            result = await self._run_step(context, step, args, step_index)
 
             prompt = result.get("prompt")
-            step_results[current] = prompt
+            step_results[plan_step.name] = prompt
+            if durable:
+                context.record(step_index, plan_step.name, result)
             step_index += 1
-
-            if "next" in result:
-                current = result["next"]
-            else:
-                last = steps[-1]["name"]
-                if current == last:
-                    break
-                idx = self.find_index(steps, current)
-                current = steps[idx + 1]["name"]
+            plan_step = self._next_step(step_plan, plan_step, result)
 
         return {"final_prompt": prompt, **step_results}
 
-    async def process_event(self, result):
-        ev = self.workflow["spec"]["template"]["event"]
-        cron = ev.get("cron")
-        agent_name = ev.get("agent")
-        step_names = ev.get("steps", [])
-        exit_expr = ev.get("exit")
+    async def _dag(self, context, step_plan, initial_prompt, durable=False):
+        graph = step_plan.graph
 
-        run_once = True
-        while True:
-            if pycron.is_now(cron):
-                if run_once:
-                    if agent_name:
-                        agent = self.agents.get(agent_name)
-                        if not agent:
-                            raise RuntimeError(
-                                f"Agent '{agent_name}' not found for event"
-                            )
-                        new_prompt = await agent.run(result["final_prompt"])
-                        result[agent_name] = new_prompt
-                        result["final_prompt"] = new_prompt
-                    if step_names:
-                        raw_steps = self.workflow["spec"]["template"]["steps"]
-                        sub_defs = [s for s in raw_steps if s["name"] in step_names]
-                        out = await self._condition_subflow(
-                            sub_defs, step_names[0], result["final_prompt"]
+        step_results = {}
+        activated = {}
+        declined = {name: set() for name in graph.order}
+        skipped = set()
+        started = set()
+        running = {}
+        step_index = 0
+
+        def should_skip(name):
+            if any(dep in skipped for dep in graph.data_deps[name]):
+                return True
+            if not graph.needs_activation[name] or name in activated:
+                return False
+            return all(
+                src in skipped or src in declined[name]
+                for src in graph.activators[name]
+            )
+
+        def complete(name, result):
+            output = result.get("prompt")
+            step_results[name] = output
+            if "next" in result:
+                target = step_plan.step(result["next"]).name
+                activated.setdefault(target, output)
+                definition = step_plan.step(name).definition
+                for other in condition_targets(definition):
+                    if other != target:
+                        declined[other].add(name)
+            elif name in graph.successor:
+                activated.setdefault(graph.successor[name], output)
+
+        if durable:
+            for record in context.restored:
+                started.add(record.step_name)
+                complete(record.step_name, record.result())
+                step_index = record.step_index + 1
+
+        try:
+            while True:
+                changed = True
+                while changed:
+                    changed = False
+                    for name in graph.order:
+                        if name in started or name in skipped:
+                            continue
+                        if should_skip(name):
+                            skipped.add(name)
+                            changed = True
+
+                for name in graph.order:
+                    if name in started or name in skipped:
+                        continue
+                    if any(dep not in step_results for dep in graph.data_deps[name]):
+                        continue
+                    if graph.needs_activation[name] and name not in activated:
+                        continue
+                    plan_step = step_plan.step(name)
+                    if plan_step.inputs:
+                        args = self._resolve_inputs(
+                            context, step_plan, plan_step, initial_prompt, step_results
                         )
-                        result.update(out)
-                    run_once = False
+                    else:
+                        args = [activated.get(name, initial_prompt)]
+                    bound = self._bind_step(context, plan_step)
+                    self._prewarm(context, step_plan, plan_step)
+                    task = asyncio.create_task(
+                        self._run_step(context, bound, args, step_index)
+                    )
+                    running[task] = (name, step_index)
+                    started.add(name)
+                    step_index += 1
 
-                if exit_expr and eval_expression(exit_expr, result):
+                if not running:
                     break
-            time.sleep(30)
 
-        return result
-
-    async def _condition_subflow(self, steps, start, prompt):
-        step_defs = {step["name"]: step for step in steps}
-        for step in steps:
-            if step.get("loop"):
-                loop_def = step["loop"]
-                loop_def["agent"] = self.agents.get(loop_def.get("agent"))
-            self.steps[step["name"]] = Step(step)
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                error = None
+                for task in done:
+                    name, index = running.pop(task)
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    result = task.result()
+                    complete(name, result)
+                    if durable:
+                        context.record(index, name, result)
+                if error is not None:
+                    raise error
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
 
-        step_results = {}
-        current = start
-        step_index = 0
+        prompt = initial_prompt
+        for name in graph.order:
+            if name in step_results:
+                prompt = step_results[name]
+        return {"final_prompt": prompt, **step_results}
 
-        while True:
-            definition = step_defs[current]
-            if definition.get("inputs"):
-                args = []
-                for inp in definition["inputs"]:
-                    src = inp["from"]
-                    if src == "prompt":
-                        args.append(prompt)
-                    elif src in step_results:
-                        args.append(step_results[src])
-                    else:
-                        args.append(src)
-                result = await self.steps[current].run(*args, step_index=step_index)
-            else:
-                result = await self.steps[current].run(prompt, step_index=step_index)
+    async def process_event(self, result, context=None):
+        if context is None:
+            context = RunContext(result.get("final_prompt"), self.agents)
+        plan = self.plan()
+        ev = plan.event
+        cron = ev.get("cron")
+        agent_name = ev.get("agent")
 
-            prompt = result.get("prompt")
-            step_results[current] = prompt
-            step_index += 1
+        run_once = True
+        async for _ in cron_ticks(cron):
+            if run_once:
+                if agent_name:
+                    agent = context.agents.get(agent_name)
+                    if not agent:
+                        raise RuntimeError(f"Agent '{agent_name}' not found for event")
+                    new_prompt = await call_agent(agent, result["final_prompt"])
+                    result[agent_name] = new_prompt
+                    result["final_prompt"] = new_prompt
+                if plan.event_plan:
+                    out = await self._condition(
+                        context,
+                        plan.event_plan,
+                        result["final_prompt"],
+                        plan.event_start,
+                    )
+                    result.update(out)
+                run_once = False
 
-            if "next" in result:
-                current = result["next"]
-            else:
-                if current == steps[-1]["name"]:
-                    break
-                idx = self.find_index(steps, current)
-                current = steps[idx + 1]["name"]
+            if plan.event_exit and eval_expression(plan.event_exit, result):
+                break
 
-        return {"final_prompt": prompt, **step_results}
+        return result
 
     def get_step(self, step_name):
         for s in self.workflow["spec"]["template"]["steps"]:
@@ -2,14 +2,20 @@
 # Copyright © 2025 IBM
 
 import os
+import time
 import dotenv
 import asyncio
+from types import SimpleNamespace
+
+import pytest
 
 
 from maestro.cli.common import parse_yaml
 
 from maestro.workflow import Workflow
-from maestro.agents.beeai_agent import BeeAILocalAgent
+from maestro.agents import beeai_agent
+from maestro.agents.beeai_agent import BeeAIAgent
+from maestro.step import call_agent
 
 dotenv.load_dotenv()
 
@@ -25,7 +31,11 @@ class BeeAIAgentMock:
 def test_agent_runs(monkeypatch) -> None:
     # setup mocks
     mock_beeai = BeeAIAgentMock()
-    monkeypatch.setattr(BeeAILocalAgent, "__new__", lambda *args, **kwargs: mock_beeai)
+    # patching BeeAILocalAgent.__new__ would leave the class unusable afterwards
+    monkeypatch.setattr(
+        "maestro.workflow.get_agent_class",
+        lambda *args, **kwargs: lambda agent: mock_beeai,
+    )
 
     agents_yaml = parse_yaml(os.path.join(os.path.dirname(__file__), "agents.yaml"))
     workflow_yaml = parse_yaml(os.path.join(os.path.dirname(__file__), "workflow.yaml"))
@@ -40,3 +50,49 @@ def test_agent_runs(monkeypatch) -> None:
     assert result["final_prompt"].startswith("OK:Welcome") or result[
         "final_prompt"
     ].startswith("Mock agent")
+
+
+class HungOpenAI:
+    # a BeeAI API whose runs never finish
+    def __init__(self, **kwargs):
+        self.beta = SimpleNamespace(
+            threads=SimpleNamespace(
+                create=lambda **kwargs: SimpleNamespace(id="thread"),
+                runs=SimpleNamespace(create_and_poll=self.create_and_poll),
+            )
+        )
+
+    def create_and_poll(self, **kwargs):
+        time.sleep(0.5)
+
+
+def test_remote_agent_timeout(monkeypatch) -> None:
+    response = SimpleNamespace(
+        json=lambda: {"data": [{"name": "beetest", "model": "llama3", "id": "a1"}]}
+    )
+    monkeypatch.setattr(beeai_agent.requests, "request", lambda *a, **k: response)
+    monkeypatch.setattr(beeai_agent, "OpenAI", HungOpenAI)
+    agent = BeeAIAgent(
+        {
+            "metadata": {"name": "beetest"},
+            "spec": {"framework": "beeai", "model": "llama3", "timeout": 0.1},
+        }
+    )
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def run():
+        task = asyncio.create_task(ticker())
+        try:
+            with pytest.raises(TimeoutError):
+                await call_agent(agent, "hello")
+        finally:
+            task.cancel()
+
+    asyncio.run(run())
+    # the event loop kept running while the agent was waiting on its run
+    assert len(ticks) >= 3
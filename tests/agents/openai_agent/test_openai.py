@@ -4,14 +4,18 @@
 # Copyright © 2025 IBM
 
 import os
+import copy
 import dotenv
 import asyncio
 
+import pytest
+
 
 from maestro.cli.common import parse_yaml
 
 from maestro.workflow import Workflow
-from maestro.agents.openai_agent import OpenAIAgent
+from maestro.agents import openai_agent
+from maestro.resilience import CircuitOpenError
 
 dotenv.load_dotenv()
 
@@ -27,7 +31,11 @@ class OpenAIAgentMock:
 def test_agent_runs(monkeypatch) -> None:
     # setup mocks
     mock_openai = OpenAIAgentMock()
-    monkeypatch.setattr(OpenAIAgent, "__new__", lambda *args, **kwargs: mock_openai)
+    # patching OpenAIAgent.__new__ would leave the class unusable afterwards
+    monkeypatch.setattr(
+        "maestro.workflow.get_agent_class",
+        lambda *args, **kwargs: lambda agent: mock_openai,
+    )
 
     agents_yaml = parse_yaml(os.path.join(os.path.dirname(__file__), "agents.yaml"))
     workflow_yaml = parse_yaml(os.path.join(os.path.dirname(__file__), "workflow.yaml"))
@@ -42,3 +50,33 @@ def test_agent_runs(monkeypatch) -> None:
     assert result["final_prompt"].startswith("OK:Welcome") or result[
         "final_prompt"
     ].startswith("Mock agent")
+
+
+def test_failures_reach_retry_and_breaker(monkeypatch) -> None:
+    calls = []
+
+    async def failing_run(agent, prompt):
+        calls.append(prompt)
+        raise ConnectionError("provider unavailable")
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(openai_agent.UnderlyingRunner, "run", failing_run)
+    agents_yaml = copy.deepcopy(
+        parse_yaml(os.path.join(os.path.dirname(__file__), "agents.yaml"))
+    )
+    agents_yaml[0]["spec"].update(
+        {
+            "url": "http://openai-breaker.test/v1",
+            "retry": {"max_attempts": 2, "backoff": 0},
+            "circuit_breaker": {"failure_threshold": 2, "reset_timeout": 60},
+        }
+    )
+    workflow_yaml = parse_yaml(os.path.join(os.path.dirname(__file__), "workflow.yaml"))
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(Workflow(agents_yaml, workflow_yaml[0]).run())
+    # the failed call was retried instead of returned as the answer
+    assert len(calls) == 2
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(Workflow(agents_yaml, workflow_yaml[0]).run())
+    assert len(calls) == 2
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import json
+import os
+import pickle
+import tempfile
+import threading
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+from maestro.agents.agent import remove_agent, restore_agent, save_agents
+from maestro.agents.mock_agent import MockAgent
+from maestro.agents.registry import AgentRegistry, agent_registry
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+class TestAgentRegistry(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "agents.db")
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_versions(self):
+        registry = AgentRegistry(self.path)
+        registry.put_many(
+            [("a", "pickle", b"1", "hash-a"), ("b", "definition", "{}", "hash-b")]
+        )
+        assert registry.names() == ["a", "b"]
+        assert registry.version("a") == 1
+        # an unchanged definition keeps its version
+        registry.put("a", "pickle", b"2", "hash-a")
+        assert registry.version("a") == 1
+        assert registry.get("a").data == b"2"
+        registry.put("a", "pickle", b"3", "hash-a2")
+        record = registry.get("a")
+        assert (record.version, record.definition_hash) == (2, "hash-a2")
+        assert registry.delete("b")
+        assert not registry.delete("b")
+        assert registry.get("b") is None
+        assert registry.version("b") is None
+        registry.close()
+
+    def test_migrates_pickled_db(self):
+        with open(self.path, "wb") as file:
+            pickle.dump({"a": b"pickled", "b": json.dumps({"spec": {}})}, file)
+        registry = AgentRegistry(self.path)
+        assert registry.get("a").kind == "pickle"
+        assert registry.get("b").kind == "definition"
+        assert os.path.exists(self.path + ".pickle")
+        registry.close()
+        # the migrated database opens as it is
+        registry = AgentRegistry(self.path)
+        assert registry.names() == ["a", "b"]
+        registry.close()
+
+    def test_concurrent_readers(self):
+        registry = AgentRegistry(self.path)
+        registry.put_many((f"agent{i}", "pickle", b"x", None) for i in range(50))
+        found = []
+
+        def read():
+            reader = AgentRegistry(self.path)
+            found.append(sum(reader.get(f"agent{i}") is not None for i in range(50)))
+            reader.close()
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        registry.put_many((f"agent{i}", "pickle", b"y", None) for i in range(50))
+        for thread in threads:
+            thread.join()
+        assert found == [50] * 4
+        registry.close()
+
+    def test_save_and_restore(self):
+        with mock.patch.dict(os.environ, {"MAESTRO_AGENT_DB": self.path}):
+            save_agents(
+                (MockAgent(agent_def), agent_def) for agent_def in self.agents_yaml
+            )
+            agent, restored = restore_agent("critic")
+            assert restored
+            assert agent.agent_name == "critic"
+            assert agent_registry().version("critic") == 1
+            remove_agent("critic")
+            with self.assertRaises(KeyError):
+                restore_agent("critic")
+            with self.assertRaises(KeyError):
+                remove_agent("critic")
+
+    def test_restore_cache(self):
+        with mock.patch.dict(os.environ, {"MAESTRO_AGENT_DB": self.path}):
+            agent_def = self.agents_yaml[0]
+            save_agents([(MockAgent(agent_def), agent_def)])
+            with mock.patch(
+                "maestro.agents.agent.pickle.loads", wraps=pickle.loads
+            ) as loads:
+                first, _ = restore_agent("research")
+                second, _ = restore_agent("research")
+                assert loads.call_count == 1
+                # every caller gets its own copy to set attributes on
+                assert first is not second
+                first.agent_name = "renamed"
+                assert restore_agent("research")[0].agent_name == "research"
+
+                # saving the agent again invalidates the cached instance
+                changed = dict(agent_def, spec=dict(agent_def["spec"], model="new"))
+                save_agents([(MockAgent(changed), changed)])
+                assert restore_agent("research")[0].agent_model == "new"
+                assert loads.call_count == 2
+
+    def test_restore_cache_concurrent_runs(self):
+        with mock.patch.dict(os.environ, {"MAESTRO_AGENT_DB": self.path}):
+            agent_def = self.agents_yaml[0]
+            save_agents([(MockAgent(agent_def), agent_def)])
+            restore_agent("research")
+            barrier = threading.Barrier(2)
+            tools = {}
+
+            def run(name):
+                agent, _ = restore_agent("research")
+                barrier.wait()
+                agent.agent_tools.append(name)
+                barrier.wait()
+                tools[name] = agent.agent_tools
+
+            threads = [
+                threading.Thread(target=run, args=(name,)) for name in ("a", "b")
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert tools == {"a": ["a"], "b": ["b"]}
+            assert restore_agent("research")[0].agent_tools == []
+
+    def test_restore_cached_definition(self):
+        registry = AgentRegistry(self.path)
+        registry.put("plain", "definition", json.dumps({"spec": {"model": "m"}}))
+        registry.close()
+        with mock.patch.dict(os.environ, {"MAESTRO_AGENT_DB": self.path}):
+            definition, restored = restore_agent("plain")
+            assert not restored
+            definition["spec"]["model"] = "changed"
+            assert restore_agent("plain")[0] == {"spec": {"model": "m"}}
+
+
+if __name__ == "__main__":
+    unittest.main()
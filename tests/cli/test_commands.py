@@ -3,7 +3,9 @@
 # SPDX-License-Identifier: Apache-2.0
 # Copyright © 2025 IBM
 
+import json
 import os
+import tempfile
 import unittest
 from unittest import TestCase, mock
 from importlib.resources import files
@@ -170,6 +172,38 @@ class RunCommandTest(TestCommand):
         except Exception as e:
             self.fail(f"Exception running command: {str(e)}")
 
+    def test_run_batch__dry_run(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inputs = os.path.join(tmpdir, "inputs.jsonl")
+            output = os.path.join(tmpdir, "results.jsonl")
+            with open(inputs, "w") as file:
+                file.write('"first prompt"\n{"prompt": "second prompt"}\n')
+            self.args["--batch"] = inputs
+            self.args["--output"] = output
+            self.args["--concurrency"] = "2"
+            self.assertTrue(self.command.execute() == 0)
+            with open(output) as file:
+                records = [json.loads(line) for line in file]
+            self.assertEqual(
+                [r["prompt"] for r in records], ["first prompt", "second prompt"]
+            )
+
+    def test_run_pipeline__dry_run(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            inputs = os.path.join(tmpdir, "inputs.jsonl")
+            output = os.path.join(tmpdir, "results.jsonl")
+            with open(inputs, "w") as file:
+                file.write('"first prompt"\n{"prompt": "second prompt"}\n')
+            self.args["--pipeline"] = inputs
+            self.args["--output"] = output
+            self.args["--queue-size"] = "1"
+            self.assertTrue(self.command.execute() == 0)
+            with open(output) as file:
+                records = [json.loads(line) for line in file]
+            self.assertEqual(
+                [r["prompt"] for r in records], ["first prompt", "second prompt"]
+            )
+
 
 # `create` commmand tests
 class CreateCommandTest(TestCommand):
@@ -387,5 +421,57 @@ class MetaAgentsCommandTest(TestCommand):
             self.fail(f"Exception running command: {str(e)}")
 
 
+# `submit` and `status` commmand tests
+class SubmitCommandTest(TestCommand):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.args = {
+            "--dry-run": True,
+            "--help": False,
+            "--verbose": False,
+            "--silent": False,
+            "--version": False,
+            "--input": "a topic",
+            "--batch": None,
+            "--queue": os.path.join(self.tmpdir.name, "runs.db"),
+            "AGENTS_FILE": self.get_fixture("yamls/agents/simple_agent.yaml"),
+            "WORKFLOW_FILE": self.get_fixture("yamls/workflows/simple_workflow.yaml"),
+            "RUN_IDS": [],
+            "deploy": False,
+            "run": False,
+            "create": False,
+            "mermaid": False,
+            "validate": False,
+            "meta-agents": False,
+            "serve": False,
+            "clean": False,
+            "create-cr": False,
+            "schedule": False,
+            "submit": True,
+            "worker": False,
+            "status": False,
+        }
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_submit_and_status(self):
+        command = CLI(self.args).command()
+        self.assertTrue(command.name() == "submit")
+        with mock.patch("maestro.cli.common.Console.print") as printed:
+            self.assertTrue(command.execute() == 0)
+        run_id = printed.call_args.args[0]
+
+        self.args.update({"submit": False, "status": True, "RUN_IDS": [run_id]})
+        command = CLI(self.args).command()
+        self.assertTrue(command.name() == "status")
+        with mock.patch("maestro.cli.common.Console.print") as printed:
+            self.assertTrue(command.execute() == 0)
+        self.assertEqual(json.loads(printed.call_args.args[0])["status"], "queued")
+
+        self.args["RUN_IDS"] = ["unknown"]
+        self.assertTrue(CLI(self.args).command().execute() == 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import copy
+import os
+from types import SimpleNamespace
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from beeai_framework.backend import UserMessage
+from beeai_framework.memory import UnconstrainedMemory
+
+from maestro.agent_pool import AgentPool, agent_pool
+from maestro.agents.beeai_agent import BeeAILocalAgent
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+def counting_init(built):
+    original = MockAgent.__init__
+
+    def init(self, agent):
+        built.append(agent["metadata"]["name"])
+        original(self, agent)
+
+    return init
+
+
+class RememberingAgent:
+    # keeps the messages of every run in its memory, like ToolCallingAgent
+    def __init__(self):
+        self.memory = UnconstrainedMemory()
+
+    def run(self, prompt, **kwargs):
+        async def run():
+            await self.memory.add(UserMessage(prompt))
+            history = " | ".join(message.text for message in self.memory.messages)
+            return SimpleNamespace(result=SimpleNamespace(text=history))
+
+        return SimpleNamespace(observe=lambda observer: run())
+
+
+# agent pool tests
+class TestAgentPool(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/checkpoint_workflow.yaml"
+            )
+        )[0]
+
+    def test_agents_built_once_across_runs(self):
+        built = []
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml)
+
+        async def run_twice():
+            first = await workflow.run()
+            second = await workflow.run()
+            return first, second
+
+        with mock.patch.object(MockAgent, "__init__", counting_init(built)):
+            first, second = asyncio.run(run_twice())
+        self.assertEqual(first, second)
+        self.assertEqual(sorted(built), ["critic", "research", "summary"])
+
+    def test_concurrent_runs_use_distinct_instances(self):
+        pool = AgentPool()
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml, pool=pool)
+        seen = {}
+        original_run = MockAgent.run
+
+        async def run(self, *args, **kwargs):
+            seen.setdefault(self.agent_name, set()).add(id(self))
+            await asyncio.sleep(0.01)
+            return await original_run(self, *args, **kwargs)
+
+        async def run_both():
+            return await asyncio.gather(workflow.run(), workflow.run())
+
+        with mock.patch.object(MockAgent, "run", run):
+            asyncio.run(run_both())
+        self.assertEqual(len(seen["research"]), 2)
+        # both instances were returned and stay warm for later runs
+        self.assertEqual(len(pool), 2 * 3)
+
+    def test_changed_definition_evicts(self):
+        pool = AgentPool()
+        first = pool.acquire(MockAgent, self.agents_yaml[0])
+        pool.release(first)
+        self.assertIs(pool.acquire(MockAgent, self.agents_yaml[0]), first)
+        pool.release(first)
+
+        changed = copy.deepcopy(self.agents_yaml[0])
+        changed["spec"]["instructions"] = 'input = "changed"'
+        second = pool.acquire(MockAgent, changed)
+        self.assertIsNot(second, first)
+        self.assertEqual(len(pool), 0)
+        pool.release(second)
+        self.assertIs(pool.acquire(MockAgent, changed), second)
+
+    def prewarm_workflow(self, prewarm):
+        workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/prewarm_workflow.yaml"
+            )
+        )[0]
+        workflow_yaml["spec"]["prewarm"] = prewarm
+        return Workflow(self.agents_yaml, workflow_yaml, pool=AgentPool())
+
+    def test_agents_created_on_first_use(self):
+        workflow = self.prewarm_workflow(False)
+        result = asyncio.run(workflow.run())
+        self.assertEqual(result["final_prompt"], "cold activities")
+        # the agents of the branch that was not taken are never created
+        self.assertEqual(sorted(workflow.agents), ["cold", "research"])
+
+    def test_prewarm_next_agents(self):
+        built = []
+        workflow = self.prewarm_workflow(True)
+        with mock.patch.object(MockAgent, "__init__", counting_init(built)):
+            result = asyncio.run(workflow.run())
+        self.assertEqual(result["final_prompt"], "cold activities")
+        # both branches of the condition were created ahead of time, once
+        self.assertEqual(sorted(workflow.agents), ["cold", "hot", "research"])
+        self.assertEqual(sorted(built), ["cold", "hot", "research"])
+
+    def test_released_agents_are_reset(self):
+        pool = AgentPool()
+        agent_def = {
+            "metadata": {"name": "chat"},
+            "spec": {"framework": "beeai", "model": "llama3"},
+        }
+
+        async def create_agent(self):
+            self.agent = RememberingAgent()
+
+        async def run(prompt):
+            agent = pool.acquire(BeeAILocalAgent, agent_def)
+            try:
+                return agent, await agent.run(prompt)
+            finally:
+                pool.release(agent)
+
+        with mock.patch.object(BeeAILocalAgent, "_create_agent", create_agent):
+            first, answer = asyncio.run(run("first request"))
+            self.assertEqual(answer, "first request")
+            second, answer = asyncio.run(run("second request"))
+        self.assertIs(second, first)
+        # the conversation of the first request does not leak into the second
+        self.assertEqual(answer, "second request")
+
+    def test_pool_size(self):
+        pool = AgentPool(size=0)
+        agent = pool.acquire(MockAgent, self.agents_yaml[0])
+        pool.release(agent)
+        self.assertEqual(len(pool), 0)
+
+    def test_pool_per_loop(self):
+        async def pool():
+            return agent_pool(), agent_pool()
+
+        first, second = asyncio.run(pool())
+        self.assertIs(first, second)
+        self.assertIsNot(asyncio.run(pool())[0], first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import json
+import os
+import tempfile
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.batch import read_inputs, run_batch
+from maestro.checkpoint import SQLiteCheckpointStore
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+def read_output(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+# batch mode tests
+class TestBatch(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.inputs = os.path.join(self.tmpdir.name, "inputs.jsonl")
+        self.output = os.path.join(self.tmpdir.name, "results.jsonl")
+        with open(self.inputs, "w") as file:
+            for idx in range(6):
+                file.write(json.dumps({"prompt": f"p{idx}"}) + "\n")
+        self.workflow = Workflow(
+            parse_yaml(
+                os.path.join(
+                    os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml"
+                )
+            ),
+            parse_yaml(
+                os.path.join(
+                    os.path.dirname(__file__),
+                    "../yamls/workflows/checkpoint_workflow.yaml",
+                )
+            )[0],
+        )
+        self.active = 0
+        self.peak = 0
+
+        async def slow_run(agent, *args):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            # earlier prompts take longer, so they complete out of order
+            prompt = args[-1]
+            if agent.agent_name == "research":
+                await asyncio.sleep(0.05 * (6 - int(prompt[-1])))
+                if prompt == "p3":
+                    self.active -= 1
+                    raise RuntimeError("bad prompt")
+            self.active -= 1
+            return f"{agent.agent_name} of {prompt}"
+
+        self.slow_run = slow_run
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_batch(self, **kwargs):
+        with mock.patch.object(MockAgent, "run", self.slow_run):
+            return asyncio.run(
+                run_batch(self.workflow, self.inputs, self.output, **kwargs)
+            )
+
+    def test_ordered(self):
+        counts = self.run_batch(concurrency=3)
+        assert counts == {"succeeded": 5, "failed": 1, "skipped": 0}
+        records = read_output(self.output)
+        assert [r["index"] for r in records] == list(range(6))
+        assert (
+            records[0]["result"]["final_prompt"]
+            == "summary of critic of research of p0"
+        )
+        assert records[3]["error"] == "bad prompt"
+        assert self.peak == 3
+
+    def test_unordered(self):
+        released = [asyncio.Event() for _ in range(6)]
+
+        async def gated_run(agent, *args):
+            prompt = args[-1]
+            if agent.agent_name == "research":
+                await released[int(prompt[-1])].wait()
+                if prompt == "p3":
+                    raise RuntimeError("bad prompt")
+            return f"{agent.agent_name} of {prompt}"
+
+        async def release_in_reverse():
+            # every run is let go once the one released before it is written,
+            # an ordered batch would hold it back and time out here
+            async with asyncio.timeout(5):
+                for count, index in enumerate(reversed(range(6)), start=1):
+                    released[index].set()
+                    while len(read_output(self.output)) < count:
+                        await asyncio.sleep(0.001)
+
+        async def run():
+            await asyncio.gather(
+                run_batch(
+                    self.workflow,
+                    self.inputs,
+                    self.output,
+                    concurrency=6,
+                    ordered=False,
+                ),
+                release_in_reverse(),
+            )
+
+        with mock.patch.object(MockAgent, "run", gated_run):
+            asyncio.run(run())
+        records = read_output(self.output)
+        assert [r["index"] for r in records] == [5, 4, 3, 2, 1, 0]
+        assert records[2]["error"] == "bad prompt"
+
+    def test_resume(self):
+        with open(self.output, "w") as file:
+            file.write(json.dumps({"index": 0, "prompt": "p0", "result": {}}) + "\n")
+            file.write(json.dumps({"index": 2, "prompt": "p2", "result": {}}) + "\n")
+            file.write('{"index": 4, "pro')
+        counts = self.run_batch(concurrency=2)
+        assert counts == {"succeeded": 3, "failed": 1, "skipped": 2}
+        with open(self.output) as file:
+            lines = file.read().splitlines()
+        assert lines[2] == '{"index": 4, "pro'
+        indices = [json.loads(line)["index"] for line in lines[3:]]
+        assert indices == [1, 3, 4, 5]
+
+    def test_checkpoint_per_input(self):
+        store = SQLiteCheckpointStore(os.path.join(self.tmpdir.name, "checkpoints.db"))
+        self.addCleanup(store.close)
+        self.workflow.workflow_id = "batch-1"
+        self.workflow.checkpoint = store
+        counts = self.run_batch(concurrency=3)
+        assert counts == {"succeeded": 5, "failed": 1, "skipped": 0}
+        assert store.get_run("batch-1") is None
+        for idx in range(6):
+            run = store.get_run(f"batch-1:{idx}")
+            assert run[1] == f"p{idx}"
+            assert run[2] == ("error" if idx == 3 else "success")
+        os.remove(self.output)
+        counts = self.run_batch(concurrency=3, resume=True)
+        assert counts == {"succeeded": 5, "failed": 1, "skipped": 0}
+        records = read_output(self.output)
+        assert (
+            records[0]["result"]["final_prompt"]
+            == "summary of critic of research of p0"
+        )
+
+    def test_csv_inputs(self):
+        path = os.path.join(self.tmpdir.name, "inputs.csv")
+        with open(path, "w") as file:
+            file.write('id,prompt\n1,"first, prompt"\n2,second\n')
+        assert list(read_inputs(path)) == [(0, "first, prompt"), (1, "second")]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import copy
+import os
+import tempfile
+import time
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.cache import MemoryCache, SQLiteCache, StepCache
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+# cache tier tests
+class TestCacheTiers(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_memory_lru(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        cache.set("d", 4, expires=time.time() - 1)
+        assert cache.get("d", "missing") == "missing"
+
+    def test_memory_returns_copies(self):
+        cache = MemoryCache()
+        value = {"items": [1]}
+        cache.set("a", value)
+        value["items"].append(2)
+        first = cache.get("a")
+        first["items"].append(3)
+        assert cache.get("a") == {"items": [1]}
+
+    def test_sqlite_persists(self):
+        store = SQLiteCache(self.path)
+        store.set("a", {"prompt": "one"})
+        store.set("b", "two", expires=time.time() - 1)
+        store.close()
+        store = SQLiteCache(self.path)
+        assert store.get_entry("a") == ({"prompt": "one"}, None)
+        assert store.get_entry("b") is None
+        store.close()
+
+    def test_sqlite_size_eviction(self):
+        store = SQLiteCache(self.path, max_bytes=250)
+        for key in "abc":
+            store.set(key, "x" * 100)
+            time.sleep(0.01)
+        assert store.get_entry("a") is None
+        assert store.get_entry("c") is not None
+        store.close()
+
+    def test_step_cache_ttl(self):
+        cache = StepCache(store=SQLiteCache(self.path))
+        cache.set("a", "one", ttl=60)
+        cache.set("b", "two", ttl=-1)
+        cache.memory.clear()
+        assert cache.get("a") == "one"
+        assert len(cache.memory) == 1
+        assert cache.get("b") is None
+        cache.store.close()
+
+
+# cached step tests
+class TestCachedSteps(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/cache_workflow.yaml"
+            )
+        )
+        self.calls = []
+
+        calls = self.calls
+
+        async def counted_run(agent, *args):
+            calls.append(agent.agent_name)
+            return f"{agent.agent_name} of {args[-1]}"
+
+        self.counted_run = counted_run
+
+    def test_cache_hit(self):
+        cache = StepCache()
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml[0], cache=cache)
+        with mock.patch.object(MockAgent, "run", self.counted_run):
+            first = asyncio.run(workflow.run())
+            second = asyncio.run(workflow.run())
+            asyncio.run(workflow.run("other topic"))
+        assert first == second
+        assert second["final_prompt"] == "critic of research of topic"
+        assert self.calls.count("research") == 2
+        assert self.calls.count("critic") == 3
+
+    def test_definition_changes_key(self):
+        cache = StepCache()
+        agents_yaml = copy.deepcopy(self.agents_yaml)
+        agents_yaml[0]["spec"]["instructions"] = 'input = f"more research on {input}"'
+        with mock.patch.object(MockAgent, "run", self.counted_run):
+            asyncio.run(
+                Workflow(self.agents_yaml, self.workflow_yaml[0], cache=cache).run()
+            )
+            asyncio.run(Workflow(agents_yaml, self.workflow_yaml[0], cache=cache).run())
+        assert self.calls.count("research") == 2
+
+    def test_spec_changes_key(self):
+        cache = StepCache()
+        agents_yaml = copy.deepcopy(self.agents_yaml)
+        agents_yaml[0]["spec"]["description"] = "a more careful researcher"
+        with mock.patch.object(MockAgent, "run", self.counted_run):
+            asyncio.run(
+                Workflow(self.agents_yaml, self.workflow_yaml[0], cache=cache).run()
+            )
+            asyncio.run(Workflow(agents_yaml, self.workflow_yaml[0], cache=cache).run())
+        assert self.calls.count("research") == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
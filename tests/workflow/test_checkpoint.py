@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import os
+import tempfile
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.checkpoint import SQLiteCheckpointStore, StepRecord
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+def flaky_run(calls, failing_agent):
+    async def run(self, *args):
+        calls.append(self.agent_name)
+        if self.agent_name == failing_agent and calls.count(failing_agent) == 1:
+            raise RuntimeError("agent failed")
+        return f"{self.agent_name} of {args[-1]}"
+
+    return run
+
+
+# checkpoint and resume tests
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = SQLiteCheckpointStore(
+            os.path.join(self.tmpdir.name, "checkpoints.db")
+        )
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+
+    def tearDown(self):
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def workflow(self, file_name):
+        workflow_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/workflows", file_name)
+        )
+        return Workflow(
+            self.agents_yaml,
+            workflow_yaml[0],
+            workflow_id="run-1",
+            checkpoint=self.store,
+        )
+
+    def test_store(self):
+        self.store.start_run("run-1", "test", {"topic": "rain"})
+        self.store.save_step("run-1", StepRecord(0, "a", ["one"], "b"))
+        self.store.save_step("run-1", StepRecord(1, "b", "two"))
+        self.store.finish_run("run-1", "error")
+        assert self.store.get_run("run-1") == ("test", {"topic": "rain"}, "error")
+        records = self.store.load_steps("run-1")
+        assert [r.step_name for r in records] == ["a", "b"]
+        assert records[0].result() == {"prompt": ["one"], "next": "b"}
+        assert records[1].result() == {"prompt": "two"}
+        self.store.delete_run("run-1")
+        assert self.store.get_run("run-1") is None
+        assert self.store.load_steps("run-1") == []
+
+    def test_resume_sequence(self):
+        workflow = self.workflow("checkpoint_workflow.yaml")
+        calls = []
+        with mock.patch.object(MockAgent, "run", flaky_run(calls, "summary")):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(workflow.run())
+            assert self.store.get_run("run-1")[2] == "error"
+            result = asyncio.run(workflow.run(resume=True))
+        assert calls == ["research", "critic", "summary", "summary"]
+        assert result["final_prompt"] == "summary of critic of research of topic"
+        assert result["research"] == "research of topic"
+        assert self.store.get_run("run-1")[2] == "success"
+
+    def test_resume_dag(self):
+        workflow = self.workflow("dag_workflow.yaml")
+        calls = []
+        with mock.patch.object(MockAgent, "run", flaky_run(calls, "summary")):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(workflow.run())
+            result = asyncio.run(workflow.run(resume=True))
+        assert calls.count("research") == 1
+        assert calls.count("critic") == 3
+        assert result["final_prompt"] == "summary of critic of topic"
+
+    def test_concurrent_runs(self):
+        workflow = self.workflow("checkpoint_workflow.yaml")
+        calls = []
+        failed = []
+
+        async def agent_run(agent, *args):
+            calls.append(agent.agent_name)
+            # the first summary of the first prompt fails
+            if agent.agent_name == "summary" and args[-1].endswith("first"):
+                if not failed:
+                    failed.append(args[-1])
+                    raise RuntimeError("agent failed")
+            return f"{agent.agent_name} of {args[-1]}"
+
+        async def run():
+            return await asyncio.gather(
+                workflow.run("first", run_id="run-1:0"),
+                workflow.run("second", run_id="run-1:1"),
+                return_exceptions=True,
+            )
+
+        with mock.patch.object(MockAgent, "run", agent_run):
+            first, second = asyncio.run(run())
+            assert isinstance(first, RuntimeError)
+            assert second["final_prompt"] == "summary of critic of research of second"
+            assert self.store.get_run("run-1:0") == (
+                "checkpoint workflow",
+                "first",
+                "error",
+            )
+            assert self.store.get_run("run-1:1")[2] == "success"
+            assert self.store.get_run("run-1") is None
+            assert [r.step_name for r in self.store.load_steps("run-1:0")] == [
+                "research",
+                "critic",
+            ]
+            result = asyncio.run(workflow.run(resume=True, run_id="run-1:0"))
+        assert result["final_prompt"] == "summary of critic of research of first"
+        assert calls.count("research") == 2
+
+    def test_resume_without_checkpoint(self):
+        workflow = self.workflow("checkpoint_workflow.yaml")
+        with self.assertRaises(ValueError):
+            asyncio.run(workflow.run(resume=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,7 +6,9 @@
 import os
 import yaml
 import unittest
-from unittest import TestCase
+from datetime import datetime, timedelta
+from unittest import TestCase, mock
+from maestro.cron import CronScheduler, next_fire_time
 from maestro.workflow import Workflow
 
 import asyncio
@@ -43,6 +45,104 @@ class TestCron(TestCase):
         print(f"==={response}===")
         assert "This is a test input" in response.get("final_prompt")
 
+    def test_does_not_block_loop(self):
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                await asyncio.sleep(0.02)
+                ticks.append(datetime.now())
+
+        async def run_both():
+            ticker_task = asyncio.create_task(ticker())
+            response = await self.workflow.run()
+            # the ticker only finishes early when the cron wait yields the loop
+            finished = ticker_task.done()
+            await ticker_task
+            return response, finished
+
+        def fire_soon(cron, after=None, inclusive=False):
+            return datetime.now() + timedelta(seconds=0.2)
+
+        with (
+            mock.patch.dict(os.environ, {"DRY_RUN": "1"}),
+            mock.patch("maestro.cron.next_fire_time", fire_soon),
+        ):
+            response, finished = asyncio.run(run_both())
+        assert finished
+        assert len(ticks) == 3
+        assert "This is a test input" in response.get("final_prompt")
+
+    def test_scheduler(self):
+        scheduler = CronScheduler()
+        scheduler.add("first", self.workflow)
+        scheduler.add(
+            "second",
+            Workflow(self.agents_yaml, self.workflow_yaml[0]),
+            "This is a test input, again",
+        )
+        with self.assertRaises(ValueError):
+            scheduler.add("first", self.workflow)
+        with mock.patch.dict(os.environ, {"DRY_RUN": "1"}):
+            results = asyncio.run(scheduler.run())
+        assert "This is a test input" in results["first"]["final_prompt"]
+        assert "This is a test input, again" in results["second"]["final_prompt"]
+
+    def test_scheduler_remove(self):
+        scheduler = CronScheduler()
+        for name in ("first", "second", "third"):
+            scheduler.add(name, Workflow(self.agents_yaml, self.workflow_yaml[0]))
+        scheduler.remove("third")
+        scheduler.remove("missing")
+
+        async def run_and_remove():
+            run = asyncio.create_task(scheduler.run())
+            await asyncio.sleep(0.05)
+            scheduler.remove("first")
+            scheduler.remove("second")
+            return await asyncio.wait_for(run, 5)
+
+        def fire_later(cron, after=None, inclusive=False):
+            return datetime.now() + timedelta(hours=1)
+
+        with (
+            mock.patch.dict(os.environ, {"DRY_RUN": "1"}),
+            mock.patch("maestro.cron.next_fire_time", fire_later),
+        ):
+            results = asyncio.run(run_and_remove())
+        assert list(results) == ["first", "second"]
+        assert all(isinstance(r, asyncio.CancelledError) for r in results.values())
+        assert scheduler.jobs == {}
+
+
+# cron expression tests
+class TestNextFireTime(TestCase):
+    def test_every_minute(self):
+        now = datetime(2025, 3, 3, 14, 9, 30)
+        assert next_fire_time("* * * * *", now) == datetime(2025, 3, 3, 14, 10)
+        assert next_fire_time("* * * * *", now, inclusive=True) == datetime(
+            2025, 3, 3, 14, 9
+        )
+
+    def test_weekly(self):
+        # 2025-03-03 is a Monday
+        now = datetime(2025, 3, 3, 14, 10, 5)
+        assert next_fire_time("10 14 * * 1", now, inclusive=True) == now.replace(
+            second=0
+        )
+        assert next_fire_time("10 14 * * 1", now) == datetime(2025, 3, 10, 14, 10)
+
+    def test_steps(self):
+        now = datetime(2025, 12, 31, 23, 58)
+        assert next_fire_time("*/15 * * * *", now) == datetime(2026, 1, 1, 0, 0)
+        assert next_fire_time("0 9 1 6 *", now) == datetime(2026, 6, 1, 9, 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            next_fire_time("* * *")
+        with self.assertRaises(ValueError):
+            next_fire_time("0 0 30 2 *")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import os
+import time
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.dag import StepGraph
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+async def slow_run(self, *args):
+    await asyncio.sleep(0.3)
+    return f"{self.agent_name} of {args[-1]}"
+
+
+# `dag` strategy tests
+class TestDag(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/dag_workflow.yaml"
+            )
+        )
+        try:
+            self.workflow = Workflow(self.agents_yaml, self.workflow_yaml[0])
+        except Exception as excep:
+            raise RuntimeError("Unable to create agents") from excep
+
+    def tearDown(self):
+        self.workflow = None
+
+    def test_dag(self):
+        response = asyncio.run(self.workflow.run())
+        assert response["critic1"] == "critic of research on topic"
+        assert response["critic2"] == "critic of research on topic"
+        assert response["critic3"] == "critic of topic"
+        assert response["final_prompt"] == "summary of critic of topic"
+
+    def test_dag_overlaps_independent_steps(self):
+        with mock.patch.object(MockAgent, "run", slow_run):
+            start = time.perf_counter()
+            response = asyncio.run(self.workflow.run())
+            elapsed = time.perf_counter() - start
+        assert response["final_prompt"] == "summary of critic of topic"
+        # research + (critic1, critic2) + summary; critic3 overlaps research
+        assert elapsed < 1.2
+
+
+class TestDagCondition(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__),
+                "../yamls/workflows/dag_condition_workflow.yaml",
+            )
+        )
+
+    def test_condition_then(self):
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml[0])
+        response = asyncio.run(workflow.run())
+        assert "cold" not in response
+        assert response["hot"] == "hot activities"
+        assert response["final_prompt"] == "summary of hot activities"
+
+    def test_condition_else(self):
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml[0])
+        response = asyncio.run(workflow.run("colder"))
+        assert "hot" not in response
+        assert response["cold"] == "cold activities"
+        assert response["final_prompt"] == "summary of cold activities"
+
+
+class TestStepGraph(TestCase):
+    def test_cycle(self):
+        steps = [
+            {"name": "a", "inputs": [{"from": "b"}]},
+            {"name": "b", "inputs": [{"from": "a"}]},
+        ]
+        with self.assertRaises(ValueError):
+            StepGraph(steps)
+
+    def test_unknown_condition_target(self):
+        steps = [{"name": "a", "condition": [{"default": "missing"}]}]
+        with self.assertRaises(ValueError):
+            StepGraph(steps)
+
+    def test_dependencies(self):
+        steps = [
+            {"name": "a"},
+            {"name": "b", "inputs": [{"from": "a"}]},
+            {"name": "c", "inputs": [{"from": "prompt"}]},
+            {"name": "d"},
+        ]
+        graph = StepGraph(steps)
+        assert graph.roots() == ["a", "c"]
+        assert graph.data_deps["b"] == ["a"]
+        assert graph.activators["d"] == ["c"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import os
+import yaml
+import unittest
+from unittest import TestCase
+
+from maestro.plan import WorkflowPlan
+from maestro.utils import compile_expression, eval_expression, jsonpath
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+# condition, until and exit expression tests
+class TestExpression(TestCase):
+    def test_compiled_once(self):
+        assert compile_expression("len(input) > 3") is compile_expression(
+            "len(input) > 3"
+        )
+        workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__),
+                "../yamls/workflows/dag_condition_workflow.yaml",
+            )
+        )[0]
+        plan = WorkflowPlan(workflow_yaml)
+        code = plan.main.step("research").condition[0]["if"]
+        assert code is compile_expression("(input.find('hotter') != -1)")
+
+    def test_evaluate(self):
+        assert eval_expression("(input.find('hot') != -1)", "too hot")
+        assert eval_expression('"test" in input', {"test": 1})
+        assert eval_expression("len(input) == 2 and max(input) == 3", [1, 3])
+
+    def test_helpers(self):
+        assert eval_expression(r"match(r'\d{3}', input)", "code 123")
+        assert not eval_expression(r"match(r'\d{3}', input)", "code 12")
+        assert eval_expression(
+            "jsonpath(input, '$.status') == ['done']", '{"status": "done"}'
+        )
+
+    def test_jsonpath(self):
+        value = {"items": [{"name": "a", "tags": ["x"]}, {"name": "b"}]}
+        assert jsonpath(value, "$.items[*].name") == ["a", "b"]
+        assert jsonpath(value, "$.items[-1]['name']") == ["b"]
+        assert jsonpath(value, "$.items[0].tags[0]") == ["x"]
+        assert jsonpath(value, "$.missing.name") == []
+        assert jsonpath("not json", "$.a") == []
+        with self.assertRaises(ValueError):
+            jsonpath(value, "items")
+
+    def test_restricted(self):
+        for expression in (
+            "input.__class__",
+            "__import__('os')",
+            "'{0.__class__}'.format(input)",
+            "input._private",
+            "(lambda: 1)()",
+            "[x for x in input]",
+            "(y := input)",
+            "input.gi_frame",
+            # reaches os through the frame of a generator expression
+            "[g := ([b.vars(b)['__import__']('os').getcwd() for b in "
+            "[g.gi_frame.f_back.f_back.f_globals['builtins']]] for x in [1]), "
+            "list(g)][1]",
+        ):
+            with self.assertRaises(ValueError):
+                compile_expression(expression)
+        with self.assertRaises(ValueError):
+            eval_expression(
+                "[g := ([b.vars(b)['__import__']('os').getcwd() for b in "
+                "[g.gi_frame.f_back.f_back.f_globals['builtins']]] for x in [1]), "
+                "list(g)][1]",
+                "x",
+            )
+        with self.assertRaises(NameError):
+            eval_expression("open('/etc/passwd')", "")
+        assert (
+            eval_expression("input.get('a', [0])[-1] + 1 if input else 0", {"a": [1]})
+            == 2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import json
+import threading
 from pathlib import Path
-from maestro.file_logger import FileLogger
+from unittest import mock
+from maestro.file_logger import FileLogger, JsonlWriter
 
 
 def _find_log_file_by_workflow_id(directory: Path, workflow_id: str):
@@ -108,3 +110,67 @@ def test_log_agent_response(tmp_path):
     assert log["response"] == "4"
     assert log["tool_used"] == "calculator"
     assert log["duration_ms"] == 123
+
+
+def test_buffered_log(tmp_path):
+    logger = FileLogger(log_dir=tmp_path, buffered=True)
+    workflow_id = logger.generate_workflow_id()
+
+    for step_index in range(300):
+        logger.log_agent_response(
+            workflow_id=workflow_id,
+            step_index=step_index,
+            agent_name="example_agent",
+            model="test-model",
+            input_text="What is 2 + 2?",
+            response_text="4",
+        )
+    # an unbuffered write waits for the buffered records, keeping the file in order
+    FileLogger(log_dir=tmp_path).log_workflow_run(
+        workflow_id=workflow_id,
+        workflow_name="buffered_workflow",
+        prompt="math test",
+        output="4",
+        models_used=["test-model"],
+        status="success",
+    )
+
+    logs = _read_json_lines(_find_log_file_by_workflow_id(tmp_path, workflow_id))
+    assert [log.get("step_index") for log in logs[:-1]] == list(range(300))
+    assert logs[-1]["log_type"] == "workflow_summary"
+
+
+def test_log_writer_flush_and_close(tmp_path):
+    writer = JsonlWriter(batch_size=10, flush_interval=60)
+    path = tmp_path / "run.jsonl"
+    writer.write(path, {"n": 1})
+    writer.flush()
+    assert _read_json_lines(path) == [{"n": 1}]
+    writer.write(path, {"n": 2})
+    writer.close()
+    assert _read_json_lines(path) == [{"n": 1}, {"n": 2}]
+
+
+def test_log_writer_drops_when_full(tmp_path):
+    writer = JsonlWriter(batch_size=1, max_queue=1)
+    writing = threading.Event()
+    release = threading.Event()
+    write_batch = writer._write_batch
+
+    def blocked_write(batch):
+        writing.set()
+        release.wait()
+        write_batch(batch)
+
+    writer._write_batch = blocked_write
+    path = tmp_path / "run.jsonl"
+    writer.write(path, {"n": 1})
+    assert writing.wait(5)
+    writer.write(path, {"n": 2})
+    with mock.patch("maestro.file_logger.logger") as logger:
+        writer.write(path, {"n": 3})
+    assert writer.dropped == 1
+    logger.warning.assert_called_once()
+    release.set()
+    writer.close()
+    assert _read_json_lines(path) == [{"n": 1}, {"n": 2}]
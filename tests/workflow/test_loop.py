@@ -6,8 +6,9 @@
 import os
 import yaml
 import unittest
-from unittest import TestCase
+from unittest import TestCase, mock
 from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
 
 import asyncio
 
@@ -67,7 +68,99 @@ class TestLoopList(TestCase):
 
     def test_loop(self):
         response = asyncio.run(self.workflow.run())
-        assert "['This', 'is', 'a', 'test', 'for', 'loop']" in response["final_prompt"]
+        assert response["final_prompt"] == ["This", "is", "a", "test", "for", "loop"]
+
+
+def list_run(active, delays, failing=()):
+    async def run(self, *args, **kwargs):
+        if self.agent_name == "research":
+            return "[a,b,c,d,e,f]"
+        item = args[0]
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        try:
+            await asyncio.sleep(delays.get(item, 0.01))
+            if item in failing:
+                failing.remove(item)
+                raise RuntimeError(f"failed on {item}")
+        finally:
+            active["now"] -= 1
+        return f"summary of {item}"
+
+    return run
+
+
+class TestLoopConcurrency(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__),
+                "../yamls/workflows/loop_concurrency_workflow.yaml",
+            )
+        )[0]
+
+    def run_loop(self, failing=(), **loop):
+        self.workflow_yaml["spec"]["template"]["steps"][1]["loop"].update(loop)
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml)
+        active = {"now": 0, "max": 0}
+        # the first item finishes last
+        delays = {"a": 0.05}
+        with mock.patch.object(MockAgent, "run", list_run(active, delays, failing)):
+            response = asyncio.run(workflow.run())
+        return response["final_prompt"], active["max"]
+
+    def test_concurrent_ordered(self):
+        result, peak = self.run_loop()
+        assert peak == 3
+        assert result == [f"summary of {item}" for item in "abcdef"]
+
+    def test_unordered(self):
+        result, _ = self.run_loop(ordered=False)
+        assert result[0] == "summary of b"
+        assert result[-1] == "summary of a"
+
+    def test_sequential_by_default(self):
+        result, peak = self.run_loop(concurrency=1)
+        assert peak == 1
+        assert result == [f"summary of {item}" for item in "abcdef"]
+
+    def test_fail_fast(self):
+        with self.assertRaisesRegex(RuntimeError, "failed on c"):
+            self.run_loop(failing=["c"])
+
+    def test_skip(self):
+        result, _ = self.run_loop(failing=["c"], on_error="skip")
+        assert result == [f"summary of {item}" for item in "abdef"]
+
+    def test_retry(self):
+        result, _ = self.run_loop(
+            failing=["c"], on_error="retry", retry={"max_attempts": 2, "backoff": 0}
+        )
+        assert result == [f"summary of {item}" for item in "abcdef"]
+
+    def test_native_items(self):
+        seen = []
+
+        async def run(self, *args, **kwargs):
+            if self.agent_name == "research":
+                return ["one, two", {"three": 3}]
+            seen.append(args[0])
+            return args[0]
+
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml)
+        with mock.patch.object(MockAgent, "run", run):
+            response = asyncio.run(workflow.run())
+        # items keep their commas, and agents get them as prompt text
+        assert seen == ["one, two", '{"three": 3}']
+        assert response["final_prompt"] == ["one, two", '{"three": 3}']
+        assert response["list"] == ["one, two", {"three": 3}]
+
+    def test_unknown_on_error(self):
+        with self.assertRaises(ValueError):
+            self.run_loop(on_error="ignore")
 
 
 if __name__ == "__main__":
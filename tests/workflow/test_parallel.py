@@ -6,8 +6,9 @@
 import os
 import yaml
 import unittest
-from unittest import TestCase
+from unittest import TestCase, mock
 from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
 
 import asyncio
 
@@ -41,7 +42,8 @@ class TestParallel(TestCase):
 
     def test_parallel(self):
         response = asyncio.run(self.workflow.run())
-        assert "['test2', 'test3', 'test4']" in response["final_prompt"]
+        assert response["parallel"] == ["test2", "test3", "test4"]
+        assert response["final_prompt"] == '["test2", "test3", "test4"]'
 
 
 class TestParallelList(TestCase):
@@ -67,7 +69,123 @@ class TestParallelList(TestCase):
 
     def test_parallel(self):
         response = asyncio.run(self.workflow.run())
-        assert "['aa', 'bb', 'cc']" in response["final_prompt"]
+        assert response["parallel"] == ["aa", "bb", "cc"]
+        assert response["final_prompt"] == '["aa", "bb", "cc"]'
+
+
+def timed_run(calls, delays, failing=()):
+    async def run(self, *args, **kwargs):
+        calls.append(self.agent_name)
+        await asyncio.sleep(delays[self.agent_name])
+        if self.agent_name in failing:
+            raise RuntimeError(f"{self.agent_name} failed")
+        calls.append(f"{self.agent_name} done")
+        return f"{self.agent_name} of {args[0]}"
+
+    return run
+
+
+class TestParallelModes(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__),
+                "../yamls/workflows/parallel_modes_workflow.yaml",
+            )
+        )[0]
+        self.delays = {"research": 0.05, "critic": 0.01, "summary": 0.1}
+
+    def run_parallel(self, failing=(), **options):
+        self.workflow_yaml["spec"]["template"]["steps"][0]["parallel"].update(options)
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml)
+        calls = []
+        with mock.patch.object(
+            MockAgent, "run", timed_run(calls, self.delays, failing)
+        ):
+            response = asyncio.run(workflow.run())
+        return response["final_prompt"], calls
+
+    def test_all(self):
+        result, _ = self.run_parallel()
+        assert result == ["research of topic", "critic of topic", "summary of topic"]
+
+    def test_all_fail_fast(self):
+        with self.assertRaisesRegex(RuntimeError, "critic failed"):
+            self.run_parallel(failing=["critic"])
+
+    def test_all_collect(self):
+        result, _ = self.run_parallel(failing=["critic"], on_error="collect")
+        assert result == [
+            "research of topic",
+            {"error": "critic failed"},
+            "summary of topic",
+        ]
+
+    def test_all_collect_every_failure(self):
+        result, _ = self.run_parallel(
+            failing=["research", "critic", "summary"], on_error="collect"
+        )
+        assert result == [
+            {"error": "research failed"},
+            {"error": "critic failed"},
+            {"error": "summary failed"},
+        ]
+
+    def test_collect_single_agent(self):
+        result, _ = self.run_parallel(
+            failing=["critic"], agents=["critic"], on_error="collect"
+        )
+        assert result == [{"error": "critic failed"}]
+
+    def test_first(self):
+        result, calls = self.run_parallel(mode="first")
+        assert result == "critic of topic"
+        # the slower agents were cancelled
+        assert "summary done" not in calls
+
+    def test_first_skips_failures(self):
+        result, _ = self.run_parallel(mode="first", failing=["critic"])
+        assert result == "research of topic"
+
+    def test_first_all_failed(self):
+        with self.assertRaises(RuntimeError):
+            self.run_parallel(mode="first", failing=["research", "critic", "summary"])
+
+    def test_quorum(self):
+        result, calls = self.run_parallel(mode="quorum", quorum=2)
+        assert result == ["research of topic", "critic of topic"]
+        assert "summary done" not in calls
+
+    def test_quorum_unreachable(self):
+        with self.assertRaisesRegex(RuntimeError, "failed"):
+            self.run_parallel(mode="quorum", quorum=2, failing=["critic", "summary"])
+
+    def test_concurrency(self):
+        _, calls = self.run_parallel(concurrency=1)
+        assert calls == [
+            "research",
+            "research done",
+            "critic",
+            "critic done",
+            "summary",
+            "summary done",
+        ]
+
+    def test_think_tags_stripped(self):
+        async def thinking_run(self, *args, **kwargs):
+            return f"<think>secret</think>{self.agent_name}"
+
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml)
+        with mock.patch.object(MockAgent, "run", thinking_run):
+            response = asyncio.run(workflow.run())
+        assert response["final_prompt"] == ["research", "critic", "summary"]
+
+    def test_invalid_quorum(self):
+        with self.assertRaises(ValueError):
+            self.run_parallel(mode="quorum", quorum=4)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import contextlib
+import itertools
+import os
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+def tracking_run(active, fail=None):
+    async def run(self, *args, **kwargs):
+        if args[0] == fail:
+            raise RuntimeError(f"{self.agent_name} failed")
+        active["now"].add(self.agent_name)
+        active["max"] = max(active["max"], len(active["now"]))
+        await asyncio.sleep(0.02)
+        active["now"].discard(self.agent_name)
+        return f"{self.agent_name} of {args[0]}"
+
+    return run
+
+
+async def collect(workflow, prompts, **kwargs):
+    return [record async for record in workflow.run_pipeline(prompts, **kwargs)]
+
+
+# pipeline mode tests
+class TestPipeline(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/pipeline_workflow.yaml"
+            )
+        )[0]
+        self.workflow = Workflow(self.agents_yaml, self.workflow_yaml)
+
+    def test_pipeline(self):
+        records = asyncio.run(collect(self.workflow, ["a", "b", "c"]))
+        assert [r["index"] for r in records] == [0, 1, 2]
+        assert records[1] == {
+            "index": 1,
+            "prompt": "b",
+            "result": {
+                "final_prompt": "summary of research on b",
+                "classify": "research on b",
+                "extract": "critic of research on b",
+                "summarize": "summary of research on b",
+            },
+        }
+
+    def test_steps_overlap(self):
+        # every step works on its own prompt at the same time
+        active = {"now": set(), "max": 0}
+        with mock.patch.object(MockAgent, "run", tracking_run(active)):
+            records = asyncio.run(collect(self.workflow, [str(i) for i in range(6)]))
+        assert len(records) == 6
+        assert active["max"] == 3
+
+    def test_failed_prompt(self):
+        active = {"now": set(), "max": 0}
+        with mock.patch.object(MockAgent, "run", tracking_run(active, fail="bad")):
+            records = asyncio.run(collect(self.workflow, ["a", "bad", "c"]))
+        assert [r["prompt"] for r in records] == ["a", "bad", "c"]
+        assert records[1]["error"] == "research failed"
+        assert "result" not in records[1]
+        assert records[2]["result"]["final_prompt"] == "summary of research of c"
+
+    def test_backpressure(self):
+        read = []
+
+        async def prompts():
+            # an unbounded stream
+            for idx in itertools.count():
+                read.append(idx)
+                yield f"p{idx}"
+
+        async def first():
+            records = self.workflow.run_pipeline(prompts(), queue_size=1)
+            async with contextlib.aclosing(records):
+                record = await anext(records)
+                await asyncio.sleep(0.1)
+            return record
+
+        assert asyncio.run(first())["index"] == 0
+        # the full queues stop the reading of the stream
+        assert len(read) < 12
+
+    def test_conditions_rejected(self):
+        workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__),
+                "../yamls/workflows/dag_condition_workflow.yaml",
+            )
+        )[0]
+        workflow = Workflow(self.agents_yaml, workflow_yaml)
+        with self.assertRaises(ValueError):
+            asyncio.run(collect(workflow, ["a"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
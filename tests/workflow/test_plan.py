@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import os
+import yaml
+import unittest
+from unittest import TestCase
+
+import asyncio
+
+from maestro.plan import WorkflowPlan
+from maestro.workflow import Workflow
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+# compiled plan tests
+class TestPlan(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__),
+                "../yamls/workflows/dag_condition_workflow.yaml",
+            )
+        )
+
+    def test_compile(self):
+        plan = WorkflowPlan(self.workflow_yaml[0])
+        assert plan.strategy == "dag"
+        assert plan.agent_names == ("research", "cold", "hot", "summary")
+        assert plan.main.step("hot").index == 2
+        assert plan.main.step("hot").successor == 3
+        assert plan.main.steps[-1].successor is None
+        assert not isinstance(plan.main.step("research").condition[0]["if"], str)
+        with self.assertRaises(ValueError):
+            plan.main.step("missing")
+
+    def test_inputs(self):
+        steps = [
+            {"name": "a"},
+            {
+                "name": "b",
+                "inputs": [
+                    {"from": "prompt"},
+                    {"from": "instructions:a"},
+                    {"from": "a"},
+                    {"from": "literal text"},
+                ],
+            },
+        ]
+        workflow = {"spec": {"template": {"steps": steps}}}
+        plan = WorkflowPlan(workflow)
+        assert plan.main.step("b").inputs == (
+            ("prompt", None),
+            ("instructions", "a"),
+            ("step", "a"),
+            ("literal", "literal text"),
+        )
+
+    def test_next_agents(self):
+        plan = WorkflowPlan(self.workflow_yaml[0])
+        research = plan.main.step("research")
+        assert set(plan.main.next_agents(research)) == {"cold", "hot"}
+        assert plan.main.next_agents(plan.main.step("hot")) == ("summary",)
+        assert plan.main.next_agents(plan.main.steps[-1]) == ()
+
+    def test_plan_reused(self):
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml[0])
+        asyncio.run(workflow.run())
+        plan = workflow.plan()
+        response = asyncio.run(workflow.run("colder"))
+        assert workflow.plan() is plan
+        assert response["final_prompt"] == "summary of cold activities"
+        assert self.workflow_yaml[0]["spec"]["template"]["steps"][0]["agent"] == (
+            "research"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import copy
+import os
+import tempfile
+import time
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.ratelimit import RateLimiter, TokenBucket, agent_limit_key
+from maestro.workflow import Workflow, create_agents
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+def tracking_run(active):
+    async def run(self, *args, **kwargs):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return f"{self.agent_name} of {args[0]}"
+
+    return run
+
+
+# rate limit and concurrency limit tests
+class TestRateLimit(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__),
+                "../yamls/workflows/parallel_modes_workflow.yaml",
+            )
+        )[0]
+
+    def agents(self, model, **spec):
+        agents_yaml = copy.deepcopy(self.agents_yaml)
+        for agent in agents_yaml:
+            agent["spec"]["model"] = model
+        agents_yaml[0]["spec"].update(spec)
+        return agents_yaml
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(60, capacity=2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        # one token per second once the burst is used up
+        assert 0.9 < bucket.reserve() <= 1
+        bucket.charge(10)
+        assert bucket.reserve() > 10
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_requests_per_minute(self):
+        limiter = RateLimiter(("url", "model"), requests_per_minute=600)
+        limiter.requests = TokenBucket(600, capacity=1)
+
+        async def calls():
+            start = time.perf_counter()
+            for _ in range(3):
+                async with limiter.slot():
+                    pass
+            return time.perf_counter() - start
+
+        # 10 requests per second after the first
+        assert 0.15 < asyncio.run(calls()) < 1
+
+    def test_max_concurrency_shared_by_endpoint(self):
+        # only one agent sets the limit, the others calling the same model share it
+        agents_yaml = self.agents("limited-model", max_concurrency=1)
+        workflow = Workflow(agents_yaml, self.workflow_yaml)
+        active = {"now": 0, "max": 0}
+        with mock.patch.object(MockAgent, "run", tracking_run(active)):
+            result = asyncio.run(workflow.run())
+        assert active["max"] == 1
+        assert result["final_prompt"] == [
+            "research of topic",
+            "critic of topic",
+            "summary of topic",
+        ]
+
+    def test_saved_agents_share_endpoint(self):
+        # `maestro run WORKFLOW_FILE` restores the agents saved by `maestro create`
+        with (
+            tempfile.TemporaryDirectory() as tmpdir,
+            mock.patch.dict(
+                os.environ, {"MAESTRO_AGENT_DB": os.path.join(tmpdir, "agents.db")}
+            ),
+        ):
+            create_agents(self.agents("saved-model", max_concurrency=1))
+            workflow = Workflow(workflow=self.workflow_yaml)
+            active = {"now": 0, "max": 0}
+            with mock.patch.object(MockAgent, "run", tracking_run(active)):
+                asyncio.run(workflow.run())
+        assert active["max"] == 1
+
+    def test_unlimited(self):
+        workflow = Workflow(self.agents("unlimited-model"), self.workflow_yaml)
+        active = {"now": 0, "max": 0}
+        with mock.patch.object(MockAgent, "run", tracking_run(active)):
+            asyncio.run(workflow.run())
+        assert active["max"] == 3
+
+    def test_limit_key(self):
+        agent = MockAgent(self.agents("some-model")[0])
+        assert agent_limit_key(agent) == ("mock", "some-model")
+        agent.agent_url = "http://localhost:11434"
+        assert agent_limit_key(agent) == ("http://localhost:11434", "some-model")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import copy
+import os
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+async def slow_run(self, *args):
+    await asyncio.sleep(0.1)
+    return f"{self.agent_name} of {args[-1]}"
+
+
+# concurrent `run` tests
+class TestReentrant(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__),
+                "../yamls/workflows/dag_condition_workflow.yaml",
+            )
+        )
+        self.workflow = Workflow(self.agents_yaml, self.workflow_yaml[0])
+
+    def tearDown(self):
+        self.workflow = None
+
+    def test_overlapping_runs(self):
+        definition = copy.deepcopy(self.workflow_yaml[0])
+
+        async def run_all():
+            return await asyncio.gather(
+                self.workflow.run("hotter"),
+                self.workflow.run("colder"),
+                self.workflow.run("hotter today"),
+            )
+
+        with mock.patch.object(MockAgent, "run", slow_run):
+            hot, cold, hot_today = asyncio.run(run_all())
+
+        assert hot["final_prompt"] == "summary of hot of research of hotter"
+        assert cold["final_prompt"] == "summary of cold of research of colder"
+        assert hot_today["research"] == "research of hotter today"
+        assert self.workflow.workflow == definition
+
+
+if __name__ == "__main__":
+    unittest.main()
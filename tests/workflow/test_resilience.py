@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import copy
+import os
+import time
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+# retry policy and circuit breaker tests
+class TestPolicies(TestCase):
+    def test_retry_policy(self):
+        policy = RetryPolicy(backoff=1, multiplier=2, max_backoff=3, jitter=False)
+        assert [policy.delay(n) for n in (1, 2, 3)] == [1, 2, 3]
+        assert 0 <= RetryPolicy(backoff=1).delay(1) <= 1
+        policy = RetryPolicy(retry_on=["ConnectionError"])
+        assert policy.is_retryable(ConnectionRefusedError())
+        assert not policy.is_retryable(ValueError())
+        assert not RetryPolicy().is_retryable(CircuitOpenError())
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker("endpoint", failure_threshold=2, reset_timeout=0.1)
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        time.sleep(0.1)
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        time.sleep(0.1)
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+# resilient agent run tests
+class TestResilientRuns(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/checkpoint_workflow.yaml"
+            )
+        )
+        self.calls = []
+        self.failures = {"critic": 2}
+
+        calls, failures = self.calls, self.failures
+
+        async def flaky_run(agent, *args):
+            calls.append(agent.agent_name)
+            if failures.get(agent.agent_name, 0) > 0:
+                failures[agent.agent_name] -= 1
+                raise ConnectionError("provider unavailable")
+            return f"{agent.agent_name} of {args[-1]}"
+
+        self.flaky_run = flaky_run
+
+    def agents(self, **spec):
+        agents_yaml = copy.deepcopy(self.agents_yaml)
+        for agent in agents_yaml:
+            if agent["metadata"]["name"] == "critic":
+                agent["spec"].update(spec)
+        return agents_yaml
+
+    def run_workflow(self, agents_yaml, workflow_yaml=None):
+        workflow = Workflow(agents_yaml, workflow_yaml or self.workflow_yaml[0])
+        with mock.patch.object(MockAgent, "run", self.flaky_run):
+            return asyncio.run(workflow.run())
+
+    def test_agent_retry(self):
+        agents_yaml = self.agents(retry={"max_attempts": 3, "backoff": 0})
+        response = self.run_workflow(agents_yaml)
+        assert response["final_prompt"] == "summary of critic of research of topic"
+        assert self.calls.count("critic") == 3
+
+    def test_not_retryable(self):
+        agents_yaml = self.agents(
+            retry={"max_attempts": 3, "backoff": 0, "retry_on": ["TimeoutError"]}
+        )
+        with self.assertRaises(ConnectionError):
+            self.run_workflow(agents_yaml)
+        assert self.calls.count("critic") == 1
+
+    def test_step_retry(self):
+        workflow_yaml = copy.deepcopy(self.workflow_yaml[0])
+        workflow_yaml["spec"]["template"]["steps"][1]["retry"] = {
+            "max_attempts": 2,
+            "backoff": 0,
+        }
+        with self.assertRaises(ConnectionError):
+            self.run_workflow(self.agents_yaml, workflow_yaml)
+        assert self.calls.count("critic") == 2
+
+    def test_circuit_breaker(self):
+        self.failures["critic"] = 10
+        agents_yaml = self.agents(
+            url="http://breaker.test",
+            circuit_breaker={"failure_threshold": 2, "reset_timeout": 60},
+        )
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.run_workflow(agents_yaml)
+        with self.assertRaises(CircuitOpenError):
+            self.run_workflow(agents_yaml)
+        assert self.calls.count("critic") == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
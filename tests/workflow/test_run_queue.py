@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import TestCase
+
+import asyncio
+
+from maestro.run_queue import RunQueue, Worker
+
+
+def read_file(path):
+    with open(os.path.join(os.path.dirname(__file__), path), "r") as file:
+        return file.read()
+
+
+# durable run queue and worker tests
+class TestRunQueue(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "runs.db")
+        self.queue = RunQueue(self.path)
+        self.agents = read_file("../yamls/agents/dag_agents.yaml")
+        self.workflow = read_file("../yamls/workflows/dag_workflow.yaml")
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmpdir.cleanup()
+
+    def test_submit_claim_finish(self):
+        first = self.queue.submit(self.agents, self.workflow, "first")
+        second = self.queue.submit(self.agents, self.workflow)
+        assert self.queue.counts() == {"queued": 2}
+
+        run = self.queue.claim("host:1")
+        assert (run.run_id, run.prompt) == (first, "first")
+        assert self.queue.get(first)["status"] == "running"
+        assert self.queue.get(first)["worker"] == "host:1"
+        self.queue.finish(first, result={"final_prompt": "done"})
+        assert self.queue.get(first)["result"] == {"final_prompt": "done"}
+
+        run = self.queue.claim("host:1")
+        assert (run.run_id, run.prompt) == (second, None)
+        self.queue.finish(second, error="boom")
+        assert self.queue.get(second)["error"] == "boom"
+        assert self.queue.claim("host:1") is None
+        assert self.queue.counts() == {"succeeded": 1, "failed": 1}
+        assert self.queue.get("unknown") is None
+
+    def test_claims_are_exclusive(self):
+        for idx in range(40):
+            self.queue.submit(self.agents, self.workflow, f"p{idx}")
+        claimed = []
+
+        def claim_all(worker):
+            # every thread uses its own connection, like a worker process
+            queue = RunQueue(self.path)
+            while (run := queue.claim(worker)) is not None:
+                claimed.append(run.run_id)
+            queue.close()
+
+        threads = [
+            threading.Thread(target=claim_all, args=(f"host:{idx}",))
+            for idx in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(claimed) == 40
+        assert len(set(claimed)) == 40
+
+    def test_requeue_orphaned(self):
+        host = socket.gethostname()
+        gone = self.queue.submit(self.agents, self.workflow)
+        alive = self.queue.submit(self.agents, self.workflow)
+        elsewhere = self.queue.submit(self.agents, self.workflow)
+        self.queue.claim(f"{host}:999999999")
+        self.queue.claim(f"{host}:{os.getpid()}")
+        self.queue.claim("other-host:999999999")
+        assert self.queue.requeue_orphaned() == 1
+        assert self.queue.get(gone)["status"] == "queued"
+        assert self.queue.get(alive)["status"] == "running"
+        assert self.queue.get(elsewhere)["status"] == "running"
+
+    def test_worker(self):
+        ok = [
+            self.queue.submit(self.agents, self.workflow, f"topic {idx}")
+            for idx in range(3)
+        ]
+        broken = self.queue.submit(self.agents, "spec: {}")
+        worker = Worker(self.queue, concurrency=2, poll_interval=0.01, drain=True)
+        asyncio.run(worker.run())
+        for idx, run_id in enumerate(ok):
+            run = self.queue.get(run_id)
+            assert run["status"] == "succeeded"
+            assert run["result"]["research"] == f"research on topic {idx}"
+        assert self.queue.get(broken)["status"] == "failed"
+        assert self.queue.get(broken)["error"]
+
+
+if __name__ == "__main__":
+    unittest.main()
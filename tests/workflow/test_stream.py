@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import json
+from contextlib import aclosing
+import os
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+from fastapi.testclient import TestClient
+
+from maestro import events
+from maestro.cli.fastapi_serve import FastAPIWorkflowServer
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+AGENTS_FILE = os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+WORKFLOW_FILE = os.path.join(
+    os.path.dirname(__file__), "../yamls/workflows/checkpoint_workflow.yaml"
+)
+
+
+async def streaming_run(self, *args):
+    for word in ("partial", "output"):
+        await asyncio.sleep(0.01)
+        events.emit_token(self.agent_name, word)
+    return f"{self.agent_name} of {args[-1]}"
+
+
+async def collect(stream, limit=None):
+    collected = []
+    async with aclosing(stream):
+        async for event in stream:
+            collected.append(event)
+            if limit and len(collected) == limit:
+                break
+    return collected
+
+
+# `run_stream` tests
+class TestRunStream(TestCase):
+    def setUp(self):
+        self.workflow = Workflow(parse_yaml(AGENTS_FILE), parse_yaml(WORKFLOW_FILE)[0])
+
+    def test_events(self):
+        with mock.patch.object(MockAgent, "run", streaming_run):
+            collected = asyncio.run(collect(self.workflow.run_stream()))
+        types = [event["type"] for event in collected]
+        assert types == (
+            ["step_started", "token", "token", "step_finished"] * 3 + ["workflow_done"]
+        )
+        assert collected[1]["step"] == "research"
+        assert collected[1]["delta"] == "partial"
+        assert collected[3]["output"] == "research of topic"
+        assert collected[3]["duration_ms"] >= 0
+        assert collected[-1]["result"]["final_prompt"] == (
+            "summary of critic of research of topic"
+        )
+
+    def test_error(self):
+        async def failing_run(agent, *args):
+            raise RuntimeError("agent failed")
+
+        async def run():
+            collected = []
+            with self.assertRaises(RuntimeError):
+                async for event in self.workflow.run_stream():
+                    collected.append(event)
+            return collected
+
+        with mock.patch.object(MockAgent, "run", failing_run):
+            collected = asyncio.run(run())
+        assert [event["type"] for event in collected] == [
+            "step_started",
+            "step_failed",
+            "workflow_error",
+        ]
+
+    def test_stop_early(self):
+        finished = []
+
+        async def slow_run(agent, *args):
+            await asyncio.sleep(0.1)
+            finished.append(agent.agent_name)
+            return f"{agent.agent_name} of {args[-1]}"
+
+        async def run():
+            collected = await collect(self.workflow.run_stream(), limit=2)
+            await asyncio.sleep(0.3)
+            return collected
+
+        with mock.patch.object(MockAgent, "run", slow_run):
+            collected = asyncio.run(run())
+        assert collected[-1]["type"] == "step_finished"
+        assert finished == ["research"]
+
+    def test_sse_endpoint(self):
+        server = FastAPIWorkflowServer(AGENTS_FILE, WORKFLOW_FILE)
+        with mock.patch.object(MockAgent, "run", streaming_run):
+            with TestClient(server.app) as client:
+                response = client.post("/chat/stream", json={"prompt": "rain"})
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = [m for m in response.text.split("\n\n") if m]
+        assert messages[0].startswith("event: step_started\ndata: ")
+        done = json.loads(messages[-1].split("data: ", 1)[1])
+        assert done["type"] == "workflow_done"
+        assert done["result"]["final_prompt"] == "summary of critic of research of rain"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import copy
+import os
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+import httpx
+
+from maestro import subworkflow
+from maestro.subworkflow import (
+    http_client,
+    register_workflow,
+    run_subworkflow,
+    unregister_workflow,
+)
+from maestro.workflow import Workflow
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+SUB_URL = "http://127.0.0.1:8011"
+
+
+# sub-workflow step tests
+class TestSubworkflow(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.sub_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/checkpoint_workflow.yaml"
+            )
+        )[0]
+        parent = copy.deepcopy(self.sub_yaml)
+        parent["metadata"]["name"] = "parent workflow"
+        parent["spec"]["template"]["workflows"] = [{"name": "sub", "url": SUB_URL}]
+        parent["spec"]["template"]["steps"] = [
+            {"name": "research", "agent": "research"},
+            {"name": "delegate", "workflow": "sub"},
+        ]
+        self.parent_yaml = parent
+
+    def tearDown(self):
+        unregister_workflow(SUB_URL)
+
+    def test_local_workflow_runs_in_process(self):
+        sub = Workflow(self.agents_yaml, self.sub_yaml)
+        register_workflow("http://localhost:8011/", sub)
+        seen = []
+        original_run = sub.run
+
+        async def run(prompt, **kwargs):
+            seen.append(prompt)
+            return await original_run(prompt, **kwargs)
+
+        with (
+            mock.patch.object(sub, "run", run),
+            mock.patch.object(httpx.AsyncClient, "post") as post,
+        ):
+            result = asyncio.run(Workflow(self.agents_yaml, self.parent_yaml).run())
+        post.assert_not_called()
+        # the sub-workflow receives the output of the previous step as is
+        self.assertEqual(len(seen), 1)
+        self.assertIsInstance(seen[0], str)
+        self.assertIsInstance(result["final_prompt"], dict)
+        self.assertIn("final_prompt", result["final_prompt"])
+
+    def test_remote_workflow_uses_http(self):
+        def handler(request):
+            self.assertEqual(str(request.url), SUB_URL + "/chat")
+            return httpx.Response(200, json={"response": "remote answer"})
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            subworkflow._clients[loop] = httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)
+            )
+            try:
+                return await run_subworkflow(SUB_URL, "question")
+            finally:
+                await subworkflow._clients.pop(loop).aclose()
+
+        self.assertEqual(asyncio.run(run()), {"prompt": "remote answer"})
+
+    def test_remote_workflow_error(self):
+        async def run():
+            loop = asyncio.get_running_loop()
+            subworkflow._clients[loop] = httpx.AsyncClient(
+                transport=httpx.MockTransport(
+                    lambda request: httpx.Response(500, text="boom")
+                )
+            )
+            try:
+                await run_subworkflow(SUB_URL, "question")
+            finally:
+                await subworkflow._clients.pop(loop).aclose()
+
+        with self.assertRaisesRegex(ValueError, "boom"):
+            asyncio.run(run())
+
+    def test_client_shared_per_loop(self):
+        async def clients():
+            first, second = http_client(), http_client()
+            await first.aclose()
+            return first, second
+
+        first, second = asyncio.run(clients())
+        self.assertIs(first, second)
+        self.assertIsNot(asyncio.run(clients())[0], first)
+
+    def test_client_closed_with_loop(self):
+        async def client():
+            return http_client()
+
+        client = asyncio.run(client())
+        self.assertTrue(client.is_closed)
+        self.assertNotIn(client, list(subworkflow._clients.values()))
+        self.assertEqual(len(subworkflow._closers), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import unittest
+from unittest import TestCase
+
+from maestro.step import strip_think_tags
+from maestro.utils import ThinkTagFilter
+
+
+def stream(text, size):
+    think_filter = ThinkTagFilter()
+    pieces = [
+        think_filter.feed(text[idx : idx + size]) for idx in range(0, len(text), size)
+    ]
+    pieces.append(think_filter.flush())
+    return pieces
+
+
+# incremental think tag filtering tests
+class TestThinkTagFilter(TestCase):
+    texts = [
+        "<think>plan the answer</think>\n\nHello <b>world</b>",
+        "before <think>a < b</think> between <think>more</think> after",
+        "no tags, but a < sign and <thin",
+        "  <think>one</think>  <think>two</think>\n done",
+    ]
+
+    def test_matches_strip_think_tags(self):
+        for text in self.texts:
+            for size in range(1, 10):
+                visible = "".join(stream(text, size))
+                assert visible.rstrip() == strip_think_tags(text), (text, size)
+
+    def test_visible_text_is_not_delayed(self):
+        pieces = stream("<think>hidden</think>Hi there", 3)
+        # once the tag closed, every delta is shown as it arrives
+        assert pieces[-4:] == ["Hi ", "the", "re", ""]
+
+    def test_partial_tag_held_back(self):
+        think_filter = ThinkTagFilter()
+        assert think_filter.feed("answer <th") == "answer "
+        assert think_filter.feed("ink>secret") == ""
+        assert think_filter.inside
+        assert think_filter.feed("</thi") == ""
+        assert think_filter.feed("nk> shown") == " shown"
+
+    def test_unclosed_think(self):
+        think_filter = ThinkTagFilter()
+        assert think_filter.feed("ok <think>never") == "ok "
+        assert think_filter.feed(" closed") == ""
+        assert think_filter.flush() == ""
+
+    def test_flush_releases_incomplete_tag(self):
+        think_filter = ThinkTagFilter()
+        assert think_filter.feed("a <thi") == "a "
+        assert think_filter.flush() == "<thi"
+
+
+if __name__ == "__main__":
+    unittest.main()
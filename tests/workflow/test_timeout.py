@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import copy
+import os
+import time
+import yaml
+import unittest
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+# `timeout` tests
+class TestTimeout(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/timeout_workflow.yaml"
+            )
+        )
+        self.delays = {"research": 0.05, "hot": 0.05, "cold": 0.05}
+        self.finished = []
+
+        delays, finished = self.delays, self.finished
+
+        async def slow_run(agent, *args):
+            await asyncio.sleep(delays[agent.agent_name])
+            finished.append(agent.agent_name)
+            return f"{agent.agent_name} of {args[-1]}"
+
+        self.slow_run = slow_run
+
+    def run_workflow(self, workflow, **kwargs):
+        async def run_and_settle():
+            try:
+                return await workflow.run(**kwargs)
+            finally:
+                # give cancelled siblings the chance to finish if they leaked
+                await asyncio.sleep(0.3)
+
+        with mock.patch.object(MockAgent, "run", self.slow_run):
+            return asyncio.run(run_and_settle())
+
+    def test_within_limits(self):
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml[0])
+        response = self.run_workflow(workflow, timeout=5)
+        assert response["final_prompt"] == [
+            "hot of research of topic",
+            "cold of research of topic",
+        ]
+
+    def test_step_timeout(self):
+        self.delays["research"] = 2
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml[0])
+        start = time.perf_counter()
+        with self.assertRaisesRegex(TimeoutError, "Step 'research'"):
+            self.run_workflow(workflow)
+        assert time.perf_counter() - start < 1.6
+
+    def test_workflow_deadline(self):
+        self.delays["research"] = 0.5
+        definition = copy.deepcopy(self.workflow_yaml[0])
+        definition["spec"]["timeout"] = 0.2
+        workflow = Workflow(self.agents_yaml, definition)
+        with self.assertRaisesRegex(TimeoutError, "timeout workflow"):
+            self.run_workflow(workflow)
+        assert self.finished == []
+
+    def test_agent_timeout_cancels_siblings(self):
+        self.delays.update(hot=1, cold=0.2)
+        agents_yaml = copy.deepcopy(self.agents_yaml)
+        for agent in agents_yaml:
+            if agent["metadata"]["name"] == "hot":
+                agent["spec"]["timeout"] = 0.1
+        workflow = Workflow(agents_yaml, self.workflow_yaml[0])
+        with self.assertRaisesRegex(TimeoutError, "Agent 'hot'"):
+            self.run_workflow(workflow)
+        assert self.finished == ["research"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# SPDX-License-Identifier: Apache-2.0
+# Copyright © 2025 IBM
+
+import os
+import yaml
+import unittest
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+import asyncio
+
+from maestro.usage import Usage, collect_usage, estimate_cost, record_usage
+from maestro.workflow import Workflow
+from maestro.agents.mock_agent import MockAgent
+
+
+def parse_yaml(file_path):
+    with open(file_path, "r") as file:
+        yaml_data = list(yaml.safe_load_all(file))
+    return yaml_data
+
+
+async def reporting_run(self, *args, **kwargs):
+    # reports a usage like a chat completions backend would
+    record_usage(
+        {
+            "prompt_tokens": 10,
+            "completion_tokens": 5,
+            "prompt_tokens_details": {"cached_tokens": 2},
+        },
+        "gpt-4o",
+    )
+    return f"{self.agent_name} of {args[0]}"
+
+
+# token usage and cost accounting tests
+class TestUsage(TestCase):
+    def setUp(self):
+        self.agents_yaml = parse_yaml(
+            os.path.join(os.path.dirname(__file__), "../yamls/agents/dag_agents.yaml")
+        )
+        self.workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/dag_workflow.yaml"
+            )
+        )[0]
+
+    def test_from_response(self):
+        # OpenAI Agents SDK naming
+        usage = Usage.from_response(
+            SimpleNamespace(
+                requests=2,
+                input_tokens=100,
+                output_tokens=20,
+                input_tokens_details=SimpleNamespace(cached_tokens=40),
+            )
+        )
+        assert (usage.requests, usage.prompt_tokens, usage.completion_tokens) == (
+            2,
+            100,
+            20,
+        )
+        assert usage.cached_tokens == 40
+        assert usage.total_tokens == 120
+        # chat completions naming, without details
+        usage = Usage.from_response({"prompt_tokens": 7, "completion_tokens": 3})
+        assert usage.to_dict() == {
+            "requests": 1,
+            "prompt_tokens": 7,
+            "completion_tokens": 3,
+            "cached_tokens": 0,
+            "total_tokens": 10,
+            "cost": None,
+        }
+
+    def test_record_outside_call(self):
+        # nothing collects the usage, so it is dropped
+        record_usage({"prompt_tokens": 1, "completion_tokens": 1})
+        with collect_usage() as usage:
+            record_usage(None)
+            record_usage({"prompt_tokens": 1, "completion_tokens": 2}, "no-such-model")
+            record_usage({"prompt_tokens": 3, "completion_tokens": 4}, "no-such-model")
+        assert usage.requests == 2
+        assert usage.total_tokens == 10
+        assert usage.cost is None
+
+    def test_estimate_cost(self):
+        assert estimate_cost(None, 10, 10) is None
+        assert estimate_cost("no-such-model", 10, 10) is None
+        with mock.patch("litellm.cost_per_token", return_value=(0.25, 0.5)):
+            assert estimate_cost("some-model", 10, 10) == 0.75
+
+    def test_workflow_usage(self):
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml)
+        with (
+            mock.patch.object(MockAgent, "run", reporting_run),
+            mock.patch("litellm.cost_per_token", return_value=(0.002, 0.001)),
+        ):
+            result = asyncio.run(workflow.run())
+        usage = result.usage.to_dict()
+        assert usage["total"]["requests"] == 5
+        assert usage["total"]["prompt_tokens"] == 50
+        assert usage["total"]["completion_tokens"] == 25
+        assert usage["total"]["cached_tokens"] == 10
+        assert abs(usage["total"]["cost"] - 0.015) < 1e-9
+        assert set(usage["steps"]) == {
+            "research",
+            "critic1",
+            "critic2",
+            "critic3",
+            "summary",
+        }
+        assert usage["steps"]["critic1"]["total_tokens"] == 15
+        assert usage["agents"]["critic"]["requests"] == 3
+        assert workflow.usage.total.requests == 5
+
+    def test_no_usage_reported(self):
+        workflow = Workflow(self.agents_yaml, self.workflow_yaml)
+        result = asyncio.run(workflow.run())
+        assert "usage" not in result
+        assert result.usage.empty
+        assert workflow.usage.empty
+
+    def test_step_named_usage(self):
+        workflow_yaml = parse_yaml(
+            os.path.join(
+                os.path.dirname(__file__), "../yamls/workflows/checkpoint_workflow.yaml"
+            )
+        )[0]
+        workflow_yaml["spec"]["template"]["steps"][-1]["name"] = "usage"
+        workflow = Workflow(self.agents_yaml, workflow_yaml)
+        with mock.patch.object(MockAgent, "run", reporting_run):
+            result = asyncio.run(workflow.run())
+        # the usage of the run does not replace the output of the step
+        assert result["usage"] == "summary of critic of research of topic"
+        assert result.usage.total.requests == 3
+
+
+if __name__ == "__main__":
+    unittest.main()